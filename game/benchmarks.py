@@ -0,0 +1,459 @@
+"""
+Mesures de performance.
+
+Lancer avec:
+    python -m game.benchmarks           # Mémoire et accès aux attributs des entités
+    python -m game.benchmarks horde     # Plus grande horde tenant 60 FPS (simulation + rendu)
+    python -m game.benchmarks bullets   # Plus grand nombre de bulles ennemies tenant 60 FPS
+    python -m game.benchmarks levels    # Coût de simulation selon la taille du niveau (tronçons)
+    python -m game.benchmarks transitions  # Changements de niveau: construits sur place ou préparés
+"""
+
+import argparse
+import dataclasses
+import gc
+import math
+import os
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+import numpy as np
+import pygame
+from .bot import Bot
+from .config import Config
+from .engine import GameEngine, GameState
+from .entities import Ball, Obstacle, AIBall, HeartPickup, Missile
+from .levelgen import LevelPool, next_base
+from .particles import Particle
+from .physics import Vector2
+
+# Entités mesurées et arguments de construction
+MEMORY_CASES = [
+    (Particle, dict(x=1.0, y=2.0, vx=0.5, vy=-0.5, lifetime=30, max_lifetime=30, size=3.0, color=(255, 255, 255))),
+    (Missile, dict(x=1.0, y=2.0)),
+    (AIBall, dict(x=1.0, y=2.0)),
+    (Ball, dict(x=1.0, y=2.0)),
+    (HeartPickup, dict(x=1.0, y=2.0)),
+    (Obstacle, dict(x=1.0, y=2.0, width=100.0, height=20.0)),
+    (Vector2, dict(x=1.0, y=2.0)),
+]
+
+# Anciennes propriétés recalculées à chaque accès (avant leur mise en cache)
+_LEGACY_PROPERTIES = {
+    'half_w': lambda self: self.hitbox_width / 2,
+    'half_h': lambda self: self.hitbox_height / 2,
+    'mass': lambda self: (self.hitbox_width / 2) * (self.hitbox_height / 2),
+    'visual_radius': lambda self: max(self.hitbox_width, self.hitbox_height) / 2,
+}
+
+
+def dict_twin(cls: type) -> type:
+    """
+    Recrée une classe dataclass avec __dict__ (disposition d'origine).
+
+    Les champs dérivés mis en cache redeviennent des propriétés recalculées.
+    """
+    fields = []
+    namespace = {}
+    for f in dataclasses.fields(cls):
+        if not f.init:
+            namespace[f.name] = property(_LEGACY_PROPERTIES[f.name])
+            continue
+        fields.append((f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory)))
+    return dataclasses.make_dataclass(cls.__name__ + 'Dict', fields, namespace=namespace)
+
+
+def bytes_per_instance(cls: type, kwargs: dict, count: int = 10000) -> float:
+    """Mémoire allouée par instance (objet et éventuel __dict__)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [cls(**kwargs) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    list_size = sys.getsizeof(objects)
+    del objects
+    return (after - before - list_size) / count
+
+
+def attribute_reads_per_second(cls: type, kwargs: dict, count: int = 10000, repeat: int = 5) -> float:
+    """Débit de lecture des attributs usuels (position, puis dimensions dérivées)."""
+    objects = [cls(**kwargs) for _ in range(count)]
+    names = ['x', 'y'] + list(_LEGACY_PROPERTIES)
+    names = [name for name in names if hasattr(objects[0], name)][:4]
+    getters = [f'for o in objects: o.{name}' for name in names]
+
+    best = min(
+        sum(timeit.timeit(code, globals={'objects': objects}, number=1) for code in getters)
+        for _ in range(repeat)
+    )
+    return count * len(names) / best
+
+
+def run_memory_benchmark(count: int = 10000) -> list[tuple[str, float, float, float, float]]:
+    """
+    Compare la disposition slottée aux classes d'origine (avec __dict__).
+
+    Returns:
+        Liste de (nom, octets avant, octets après, lectures/s avant, lectures/s après)
+    """
+    results = []
+    for cls, kwargs in MEMORY_CASES:
+        twin = dict_twin(cls)
+        results.append((
+            cls.__name__,
+            bytes_per_instance(twin, kwargs, count),
+            bytes_per_instance(cls, kwargs, count),
+            attribute_reads_per_second(twin, kwargs, count),
+            attribute_reads_per_second(cls, kwargs, count),
+        ))
+    return results
+
+
+def horde_frame_times(engine, count: int, frames: int = 240, warmup: int = 60,
+                      seed: int = 0) -> tuple[list[float], float]:
+    """
+    Joue une horde de `count` ennemis avec un bot et chronomètre chaque frame.
+
+    Une frame comprend la simulation (tick) et le rendu complet (particules
+    et sons compris). Le plafond de la horde est fixé à `count` et les ennemis
+    tués sont remplacés entre deux frames, hors chronométrage ; le joueur
+    récupère ses vies à chaque frame pour que la mesure ne s'arrête pas.
+
+    Returns:
+        (durées des frames mesurées en ms, nombre moyen d'ennemis)
+    """
+    config = engine.config
+    config.HORDE_START_ENEMIES = count
+    config.HORDE_MAX_ENEMIES = count
+    config.HORDE_RAMP_STEP = 0
+    engine.horde = True
+    bot = Bot(engine, seed=seed)
+    engine.seed(seed)
+    engine._start_game()
+
+    times = []
+    enemies = 0
+    for frame in range(warmup + frames):
+        pygame.event.pump()  # Fenêtre réactive, hors chronométrage
+        while len(engine.ai_balls) < count:
+            engine._spawn_enemy()
+        start = time.perf_counter()
+        engine.tick((bot.decide(),))
+        engine.render()
+        elapsed = (time.perf_counter() - start) * 1000
+        for ball in engine.players:
+            ball.lives = ball.max_lives
+        if engine.state != GameState.PLAYING:
+            engine._start_game()
+        if frame >= warmup:
+            times.append(elapsed)
+            enemies += len(engine.ai_balls)
+    return times, enemies / frames
+
+
+def run_horde_benchmark(start: int = 50, step: int = 50, limit: int = 1000, frames: int = 240,
+                        budget_ms: float = None, seed: int = 0) -> tuple[list[tuple[int, float, float, float]], int]:
+    """
+    Augmente la taille de la horde jusqu'à dépasser le budget de frame.
+
+    Une taille est tenue si le 95e centile des durées de frame reste sous
+    `budget_ms` (Config.HORDE_FRAME_BUDGET_MS par défaut, 16.6 ms).
+
+    Returns:
+        (liste de (ennemis demandés, ennemis moyens, moyenne ms, p95 ms),
+         plus grande taille tenue, 0 si aucune)
+    """
+    config = Config()
+    budget_ms = config.HORDE_FRAME_BUDGET_MS if budget_ms is None else budget_ms
+    engine = GameEngine(config)
+    engine.init()
+
+    results = []
+    best = 0
+    for count in range(start, limit + 1, step):
+        times, enemies = horde_frame_times(engine, count, frames, seed=seed)
+        times.sort()
+        p95 = times[int(len(times) * 0.95) - 1]
+        results.append((count, enemies, sum(times) / len(times), p95))
+        if p95 > budget_ms:
+            break
+        best = count
+    return results, best
+
+
+def bullet_frame_times(engine, count: int, frames: int = 240, warmup: int = 60, seed: int = 0) -> list[float]:
+    """
+    Joue une partie avec `count` bulles ennemies en vol et chronomètre chaque frame (tick et rendu).
+
+    Les bulles détruites sont remplacées entre deux frames, hors
+    chronométrage, par des couronnes tirées depuis des points aléatoires de
+    l'arène ; le joueur récupère ses vies à chaque frame.
+
+    Returns:
+        Durées des frames mesurées en ms
+    """
+    config = engine.config
+    rng = random.Random(seed)
+    ring = 2 * math.pi / 32 * np.arange(32)
+    bot = Bot(engine, seed=seed)
+    engine.seed(seed)
+    engine._start_game()
+
+    times = []
+    for frame in range(warmup + frames):
+        pygame.event.pump()
+        while len(engine.enemy_bullets) < count:
+            engine.enemy_bullets.spawn(
+                rng.uniform(config.WALL_THICKNESS, config.LEVEL_WIDTH - config.WALL_THICKNESS),
+                rng.uniform(config.WALL_THICKNESS, config.LEVEL_HEIGHT - config.WALL_THICKNESS),
+                3 * np.cos(ring), 3 * np.sin(ring)
+            )
+        start = time.perf_counter()
+        engine.tick((bot.decide(),))
+        engine.render()
+        elapsed = (time.perf_counter() - start) * 1000
+        for ball in engine.players:
+            ball.lives = ball.max_lives
+        if engine.state != GameState.PLAYING:
+            engine._start_game()
+        if frame >= warmup:
+            times.append(elapsed)
+    return times
+
+
+def run_bullet_benchmark(start: int = 500, step: int = 500, limit: int = 20000, frames: int = 240,
+                         budget_ms: float = None, seed: int = 0) -> tuple[list[tuple[int, float, float]], int]:
+    """
+    Augmente le nombre de bulles ennemies jusqu'à dépasser le budget de frame (p95, comme la horde).
+
+    Returns:
+        (liste de (bulles, moyenne ms, p95 ms), plus grand nombre tenu, 0 si aucun)
+    """
+    config = Config()
+    budget_ms = config.HORDE_FRAME_BUDGET_MS if budget_ms is None else budget_ms
+    engine = GameEngine(config)
+    engine.init()
+
+    results = []
+    best = 0
+    for count in range(start, limit + 1, step):
+        times = sorted(bullet_frame_times(engine, count, frames, seed=seed))
+        p95 = times[int(len(times) * 0.95) - 1]
+        results.append((count, sum(times) / len(times), p95))
+        if p95 > budget_ms:
+            break
+        best = count
+    return results, best
+
+
+def level_frame_times(size: int, frames: int = 1200, jump_every: int = 300, seed: int = 0) -> tuple[list[float], dict]:
+    """
+    Fait jouer un bot sur un niveau de `size` x `size` écrans et chronomètre chaque tick (sans rendu).
+
+    Toutes les `jump_every` frames, les joueurs sont déplacés à un endroit
+    aléatoire du niveau, hors chronométrage : les tronçons se chargent, se
+    génèrent et se compactent comme lors d'une longue exploration.
+
+    Returns:
+        (durées des ticks en ms, compteurs des tronçons et du monde à la fin)
+    """
+    config = Config()
+    config.LEVEL_WIDTH = config.PLAY_AREA_WIDTH * size
+    config.LEVEL_HEIGHT = config.PLAY_AREA_HEIGHT * size
+    engine = GameEngine(config, headless=True)
+    engine.init()
+    rng = random.Random(seed)
+    bot = Bot(engine, seed=seed)
+    engine.seed(seed)
+    engine._start_game()
+
+    times = []
+    for frame in range(1, frames + 1):
+        if frame % jump_every == 0:
+            x = rng.uniform(config.WALL_THICKNESS + 100, config.LEVEL_WIDTH - config.WALL_THICKNESS - 100)
+            y = rng.uniform(config.WALL_THICKNESS + 100, config.LEVEL_HEIGHT - 200)
+            for ball in engine.players:
+                ball.x, ball.y, ball.vx, ball.vy = x, y, 0.0, 0.0
+        start = time.perf_counter()
+        engine.tick((bot.decide(),))
+        times.append((time.perf_counter() - start) * 1000)
+        for ball in engine.players:
+            ball.lives = ball.max_lives
+        if engine.state != GameState.PLAYING:
+            engine._start_game()
+
+    stats = engine.chunks.stats()
+    stats['obstacles'] = len(engine.obstacles)
+    stats['ai_balls'] = len(engine.ai_balls)
+    return times, stats
+
+
+def run_level_benchmark(sizes=(1, 3, 10, 30), frames: int = 1200,
+                        seed: int = 0) -> list[tuple[int, float, float, dict]]:
+    """
+    Coût de simulation par taille de niveau : il doit rester à peu près constant.
+
+    Returns:
+        Liste de (côté en écrans, moyenne ms, p95 ms, compteurs)
+    """
+    results = []
+    for size in sizes:
+        times, stats = level_frame_times(size, frames, seed=seed)
+        times.sort()
+        results.append((size, sum(times) / len(times), times[int(len(times) * 0.95) - 1], stats))
+    return results
+
+
+def level_transition_times(size: int, levels: int = 20, prepared: bool = True, seed: int = 0) -> list[float]:
+    """
+    Chronomètre `levels` changements de niveau sur des niveaux de `size` x `size` écrans.
+
+    Avec `prepared`, les niveaux viennent d'un LevelPool à processus de
+    fond, qui a fini de préparer la file avant chaque changement (le temps
+    que la partie joue le niveau); sinon, chacun est construit et validé
+    sur place. Sans cache disque dans les deux cas, ni la collecte de
+    GCPolicy.level_loaded (commune aux deux, voir gcpolicy.py).
+    """
+    config = Config()
+    config.LEVEL_WIDTH = config.PLAY_AREA_WIDTH * size
+    config.LEVEL_HEIGHT = config.PLAY_AREA_HEIGHT * size
+    engine = GameEngine(config, headless=True)
+    engine.init()
+    engine.level_pool = LevelPool(engine.level_generator, worker=prepared)
+    engine.gc_policy.enabled = False
+    engine.seed(seed)
+    engine._start_game()
+
+    times = []
+    try:
+        for _ in range(levels):
+            if prepared:
+                engine.level_pool.wait()
+            start = time.perf_counter()
+            engine._create_level(next_base(engine.chunks.level_seed))
+            times.append((time.perf_counter() - start) * 1000)
+    finally:
+        engine.level_pool.close()
+    return times
+
+
+def run_transition_benchmark(sizes=(1, 3, 10), levels: int = 20,
+                             seed: int = 0) -> list[tuple[int, list[float], list[float]]]:
+    """
+    Durée d'un changement de niveau, niveau construit sur place puis préparé à l'avance.
+
+    Returns:
+        Liste de (côté en écrans, durées sur place en ms, durées préparées en ms)
+    """
+    return [
+        (size, level_transition_times(size, levels, False, seed), level_transition_times(size, levels, True, seed))
+        for size in sizes
+    ]
+
+
+def main_memory():
+    print(f"{'Entité':<12} {'octets avant':>13} {'octets après':>13} {'Mlect/s avant':>14} {'Mlect/s après':>14}")
+    for name, bytes_before, bytes_after, reads_before, reads_after in run_memory_benchmark():
+        print(
+            f"{name:<12} {bytes_before:>13.0f} {bytes_after:>13.0f} "
+            f"{reads_before / 1e6:>14.1f} {reads_after / 1e6:>14.1f}"
+        )
+
+
+def main_horde(args):
+    if not args.window:
+        # Rendu dans une surface hors écran: mesure le coût CPU du dessin, sans vsync
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    results, best = run_horde_benchmark(args.start, args.step, args.limit, args.frames, args.budget, args.seed)
+    print(f"{'ennemis':>8} {'moyens':>8} {'moy. ms':>8} {'p95 ms':>8}")
+    for count, enemies, mean_ms, p95 in results:
+        print(f"{count:>8} {enemies:>8.0f} {mean_ms:>8.2f} {p95:>8.2f}")
+    print(f"Plus grande horde tenant {args.budget or Config.HORDE_FRAME_BUDGET_MS:.1f} ms par frame: {best} ennemis")
+
+
+def main_bullets(args):
+    if not args.window:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    results, best = run_bullet_benchmark(args.start, args.step, args.limit, args.frames, args.budget, args.seed)
+    print(f"{'bulles':>8} {'moy. ms':>8} {'p95 ms':>8}")
+    for count, mean_ms, p95 in results:
+        print(f"{count:>8} {mean_ms:>8.2f} {p95:>8.2f}")
+    print(f"Plus grand nombre de bulles tenant {args.budget or Config.HORDE_FRAME_BUDGET_MS:.1f} ms par frame: {best}")
+
+
+def main_levels(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    results = run_level_benchmark(args.sizes, args.frames, args.seed)
+    print(
+        f"{'écrans':>8} {'moy. ms':>8} {'p95 ms':>8} {'obstacles':>10} {'chargés':>8} "
+        f"{'compactés':>10} {'Ko compactés':>13}"
+    )
+    for size, mean_ms, p95, stats in results:
+        print(
+            f"{size * size:>8} {mean_ms:>8.2f} {p95:>8.2f} {stats['obstacles']:>10} {stats['live_chunks']:>8} "
+            f"{stats['evicted_chunks']:>10} {stats['evicted_bytes'] / 1024:>13.1f}"
+        )
+
+
+def main_transitions(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    results = run_transition_benchmark(args.sizes, args.levels, args.seed)
+    print(f"{'écrans':>8} {'sur place moy. ms':>18} {'max ms':>8} {'préparés moy. ms':>17} {'max ms':>8}")
+    for size, inline, prepared in results:
+        print(
+            f"{size * size:>8} {sum(inline) / len(inline):>18.2f} {max(inline):>8.2f} "
+            f"{sum(prepared) / len(prepared):>17.2f} {max(prepared):>8.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesures de performance")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("memory", help="Mémoire et lectures d'attributs des entités (par défaut)")
+    horde = commands.add_parser("horde", help="Plus grande horde tenant le budget de frame")
+    horde.add_argument("--start", type=int, default=50)
+    horde.add_argument("--step", type=int, default=50)
+    horde.add_argument("--limit", type=int, default=1000)
+    horde.add_argument("--frames", type=int, default=240, help="Frames mesurées par taille")
+    horde.add_argument("--budget", type=float, help="Budget de frame en ms (défaut: 16.6)")
+    horde.add_argument("--seed", type=int, default=0)
+    horde.add_argument("--window", action="store_true", help="Rendu dans une vraie fenêtre")
+    bullets = commands.add_parser("bullets", help="Plus grand nombre de bulles ennemies tenant le budget de frame")
+    bullets.add_argument("--start", type=int, default=500)
+    bullets.add_argument("--step", type=int, default=500)
+    bullets.add_argument("--limit", type=int, default=20000)
+    bullets.add_argument("--frames", type=int, default=240, help="Frames mesurées par nombre de bulles")
+    bullets.add_argument("--budget", type=float, help="Budget de frame en ms (défaut: 16.6)")
+    bullets.add_argument("--seed", type=int, default=0)
+    bullets.add_argument("--window", action="store_true", help="Rendu dans une vraie fenêtre")
+    levels = commands.add_parser("levels", help="Coût de simulation selon la taille du niveau")
+    levels.add_argument("--sizes", type=int, nargs="+", default=[1, 3, 10, 30], help="Côtés des niveaux en écrans")
+    levels.add_argument("--frames", type=int, default=1200, help="Frames mesurées par niveau")
+    levels.add_argument("--seed", type=int, default=0)
+    transitions = commands.add_parser("transitions", help="Changements de niveau: construits sur place ou préparés")
+    transitions.add_argument("--sizes", type=int, nargs="+", default=[1, 3, 10], help="Côtés des niveaux en écrans")
+    transitions.add_argument("--levels", type=int, default=20, help="Changements de niveau mesurés par taille")
+    transitions.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "horde":
+        main_horde(args)
+    elif args.command == "bullets":
+        main_bullets(args)
+    elif args.command == "levels":
+        main_levels(args)
+    elif args.command == "transitions":
+        main_transitions(args)
+    else:
+        main_memory()
+
+
+if __name__ == '__main__':
+    main()
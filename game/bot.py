@@ -0,0 +1,278 @@
+"""
+Joueur automatique à base d'heuristiques.
+
+Un Bot produit à chaque frame le masque d'entrées d'un joueur (voir
+inputs.py), comme le clavier ou le pair distant en netplay : il se branche
+sur GameEngine.tick, sur GameEngine.bot (fenêtré) ou sur un GameEnv. Il
+esquive les bulles ennemies, va chercher les coeurs et la porte, s'approche
+des ennemis pour leur sauter sur la tête et tire quand il est aligné.
+
+Le bot a son propre générateur aléatoire : à graine égale, il rejoue
+exactement la même partie, ce qui en fait une charge de rendu répétable.
+
+Test d'endurance headless (fuites, listes d'entités qui grossissent):
+    python -m game.bot --frames 216000 --players 2
+"""
+
+import argparse
+import gc
+import random
+import time
+from typing import Optional
+import numpy as np
+from .config import Config
+from .engine import GameEngine, GameState
+from .inputs import Input
+
+
+def _lerp(a: float, b: float, t: float) -> float:
+    return a + (b - a) * t
+
+
+class Bot:
+    """
+    Contrôleur heuristique d'un joueur.
+
+    `difficulty` (0 à 1) règle le temps de réaction, la portée d'esquive et
+    le taux d'erreurs; `aggression` (0 à 1) la distance gardée avec les
+    ennemis (tir à distance ou saut sur la tête) et l'envie de tirer.
+    """
+
+    def __init__(self, engine: GameEngine, player: int = 0, difficulty: float = None,
+                 aggression: float = None, seed: Optional[int] = None):
+        config = engine.config
+        self.engine = engine
+        self.player = player
+        self.difficulty = config.BOT_DIFFICULTY if difficulty is None else difficulty
+        self.aggression = config.BOT_AGGRESSION if aggression is None else aggression
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        d = self.difficulty
+        a = self.aggression
+        self.reaction_frames = max(1, round(_lerp(12, 2, d)))  # Frames entre deux décisions
+        self.mistake_chance = _lerp(0.25, 0.0, d)
+        self.dodge_radius = _lerp(90, 240, d)
+        self.standoff = _lerp(380, 0, a)  # Distance horizontale gardée avec la cible
+        self.fire_chance = _lerp(0.3, 1.0, a)
+
+        self._plan = 0  # Boutons tenus jusqu'à la prochaine décision
+        self._wants_jump = False
+        self._wants_super = False
+        self._countdown = 0
+        self._previous = 0
+        self._stuck_frames = 0
+
+    def reset(self):
+        """Oublie le plan en cours (nouvelle partie)."""
+        self._plan = 0
+        self._wants_jump = False
+        self._wants_super = False
+        self._countdown = 0
+        self._previous = 0
+        self._stuck_frames = 0
+
+    def decide(self) -> int:
+        """Masque d'entrées pour la frame à venir."""
+        engine = self.engine
+        if engine.state != GameState.PLAYING or self.player >= len(engine.players):
+            self._previous = 0
+            return 0
+        ball = engine.players[self.player]
+
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._countdown = self.reaction_frames
+            self._think(ball)
+
+        # Coincé contre un obstacle: sauter par-dessus
+        if self._plan & (Input.LEFT | Input.RIGHT) and abs(ball.vx) < 0.5:
+            self._stuck_frames += 1
+            if self._stuck_frames > 20:
+                self._stuck_frames = 0
+                self._wants_jump = True
+        else:
+            self._stuck_frames = 0
+
+        mask = self._plan
+        # Saut et super attaque partent sur l'appui: relâcher une frame entre deux appuis
+        if self._wants_jump and not self._previous & Input.JUMP:
+            mask |= Input.JUMP
+            self._wants_jump = False
+        if self._wants_super and not self._previous & Input.SUPER:
+            mask |= Input.SUPER
+            self._wants_super = False
+        self._previous = mask
+        return mask
+
+    # --- Décision ---
+
+    def _think(self, ball):
+        engine = self.engine
+        config = engine.config
+        rng = self.rng
+        plan = 0
+
+        # 1. Esquive: bulle proche qui se dirige vers nous
+        threat = self._nearest_threat(ball)
+        if threat is not None:
+            threat_x, threat_y = threat
+            away = 1 if ball.x >= threat_x else -1
+            plan |= Input.RIGHT if away > 0 else Input.LEFT
+            if abs(threat_y - ball.y) < ball.half_h * 1.5:
+                self._wants_jump = True
+
+        # 2. Cible: porte ouverte, coeur si des vies manquent, sinon l'ennemi le plus proche
+        target = None
+        enemy = None
+        door = engine.door
+        if door is not None and door.active:
+            target = (door.x + door.width / 2, door.y + door.height / 2)
+        elif ball.lives < ball.max_lives and engine.heart_pickups:
+            heart = min(engine.heart_pickups, key=lambda h: abs(h.x - ball.x) + abs(h.y - ball.y))
+            target = (heart.x, heart.y)
+        elif engine.ai_balls:
+            enemy = min(engine.ai_balls, key=lambda e: (e.x - ball.x) ** 2 + (e.y - ball.y) ** 2)
+            target = (enemy.x, enemy.y)
+
+        if threat is None and target is not None:
+            dx = target[0] - ball.x
+            dy = target[1] - ball.y
+            standoff = self.standoff if enemy is not None else 0.0
+            if abs(dx) > standoff * 1.2 + ball.half_w * 0.5:
+                plan |= Input.RIGHT if dx > 0 else Input.LEFT
+            elif standoff and abs(dx) < standoff * 0.8:
+                plan |= Input.LEFT if dx > 0 else Input.RIGHT  # Reculer
+            elif (dx > 0) != (ball.facing_direction > 0):
+                plan |= Input.RIGHT if dx > 0 else Input.LEFT  # Se tourner vers la cible
+
+            # Cible plus haute: sauter (double saut seulement en descente)
+            if dy < -ball.half_h * 2 and (ball.on_ground or (ball.vy > 0 and ball.has_energy_for_double_jump())):
+                self._wants_jump = True
+
+            if enemy is not None:
+                plan |= self._attack(ball, enemy, dx, dy)
+
+        # Erreurs: mauvaise direction ou tir oublié
+        if rng.random() < self.mistake_chance:
+            if plan & (Input.LEFT | Input.RIGHT):
+                plan ^= Input.LEFT | Input.RIGHT
+            plan &= ~Input.FIRE
+
+        # Freiner une chute longue au-dessus du vide
+        if ball.vy > 9 and not ball.on_ground and ball.energy > config.MAX_ENERGY * 0.5:
+            plan |= Input.FLOAT
+        self._plan = plan
+
+    def _attack(self, ball, enemy, dx: float, dy: float) -> int:
+        """Boutons de tir pour un ennemi visé, et saut sur sa tête si on est assez agressif."""
+        config = self.engine.config
+        plan = 0
+        has_energy = ball.energy >= config.MISSILE_ENERGY_COST * 2  # Garder de quoi sauter
+        wants_fire = has_energy and self.rng.random() < self.fire_chance
+        facing = (dx > 0) == (ball.facing_direction > 0)
+
+        if abs(dy) < enemy.half_h and facing:
+            if wants_fire:
+                plan |= Input.FIRE
+            if self.engine.rage >= config.RAGE_SUPER_COST:
+                self._wants_super = True
+        elif abs(dx) < enemy.half_w:
+            # Ennemi juste au-dessus ou au-dessous: tir vertical
+            if wants_fire:
+                plan |= Input.FIRE | (Input.UP if dy < 0 else Input.DOWN)
+
+        # Saut sur la tête: ennemi proche au même niveau ou plus bas
+        if self.aggression >= 0.5 and ball.on_ground and abs(dx) < 140 and dy > -enemy.half_h:
+            self._wants_jump = True
+        return plan
+
+    def _nearest_threat(self, ball) -> Optional[tuple[float, float]]:
+        """Position de la bulle ennemie la plus proche qui se rapproche, dans le rayon d'esquive."""
+        bullets = self.engine.enemy_bullets
+        if not len(bullets):
+            return None
+        dx = ball.x - bullets.x
+        dy = ball.y - bullets.y
+        distance = dx * dx + dy * dy
+        # Ignorer les bulles qui s'éloignent ou hors de portée
+        distance[(dx * bullets.vx + dy * bullets.vy <= 0) | (distance >= self.dodge_radius ** 2)] = np.inf
+        best = int(np.argmin(distance))
+        if distance[best] == np.inf:
+            return None
+        return float(bullets.x[best]), float(bullets.y[best])
+
+
+def soak(frames: int, players: int = 1, seed: int = 0, report_every: int = 3600,
+         difficulty: float = None, aggression: float = None, config: Config = None) -> list[dict]:
+    """
+    Fait jouer des bots en headless et relève régulièrement la taille des listes d'entités.
+
+    Une partie perdue est relancée aussitôt. Retourne les relevés (un par
+    intervalle); le nombre d'objets vivants suivis par le GC et la taille des
+    listes doivent rester stables sur une longue durée. Chaque relevé lance
+    une collecte complète d'abord : les cycles morts (ennemi détruit et son
+    timer de tir) ne sont pas des fuites et sont comptés à part.
+    """
+    engine = GameEngine(config, headless=True, players=players)
+    engine.init()
+    bots = [Bot(engine, i, difficulty, aggression, seed + i) for i in range(players)]
+    engine.seed(seed)
+    engine._start_game()
+
+    reports = []
+    games = 1
+    start = time.perf_counter()
+    for frame in range(1, frames + 1):
+        engine.tick([bot.decide() for bot in bots])
+        if engine.state == GameState.GAME_OVER:
+            games += 1
+            for bot in bots:
+                bot.reset()
+            engine._start_game()
+        if frame % report_every == 0:
+            elapsed = time.perf_counter() - start
+            garbage = gc.collect()
+            reports.append({
+                'frame': frame,
+                'ms_per_frame': elapsed * 1000 / report_every,
+                'games': games,
+                'level': engine.current_level,
+                'ai_balls': len(engine.ai_balls),
+                'missiles': len(engine.missiles),
+                'enemy_bullets': len(engine.enemy_bullets),
+                'heart_pickups': len(engine.heart_pickups),
+                'obstacles': len(engine.obstacles),
+                'timers': len(engine.timers),
+                # Objets gelés par GCPolicy.level_loaded() compris: gc.get_objects() ne les voit pas
+                'gc_objects': len(gc.get_objects()) + gc.get_freeze_count(),
+                'gc_garbage': garbage,
+            })
+            start = time.perf_counter()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test d'endurance headless avec des bots")
+    parser.add_argument("--frames", type=int, default=60 * 60 * 10)
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report-every", type=int, default=3600)
+    parser.add_argument("--difficulty", type=float)
+    parser.add_argument("--aggression", type=float)
+    args = parser.parse_args()
+
+    reports = soak(args.frames, args.players, args.seed, args.report_every, args.difficulty, args.aggression)
+    columns = list(reports[0]) if reports else []
+    print(" ".join(f"{name:>13}" for name in columns))
+    for report in reports:
+        print(" ".join(f"{report[name]:>13.3f}" if isinstance(report[name], float) else f"{report[name]:>13}"
+                       for name in columns))
+    if len(reports) >= 3:
+        # Le premier relevé inclut le démarrage: comparer le deuxième au dernier
+        growth = reports[-1]['gc_objects'] - reports[1]['gc_objects']
+        print(f"Objets suivis par le GC: {growth:+d} entre la frame {reports[1]['frame']} et la fin")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Broadphase des collisions.
+
+Trie les corps le long de l'axe x (sweep and prune) pour ne tester que ceux
+dont la boîte englobante chevauche la zone d'une requête (tirs, joueurs).
+Les paires ennemi-ennemi sont calculées par EnemyStore.candidate_pairs.
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+class SweepAndPrune:
+    """
+    Broadphase incrémental sur l'axe x.
+
+    Les corps (tout objet avec x, y, half_w, half_h) restent triés par borne
+    gauche d'une frame à l'autre : comme ils bougent peu entre deux frames,
+    un tri par insertion remet la liste en ordre en temps quasi linéaire.
+    """
+
+    def __init__(self):
+        self._bodies: list = []
+        self._keys: list[float] = []  # Borne gauche de chaque corps (triée)
+        self._max_width = 0.0  # Plus grande largeur, pour les requêtes
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def update(self, bodies: list):
+        """Synchronise la liste avec `bodies` et la retrie par insertion."""
+        current = {id(body) for body in bodies}
+        known = {id(body) for body in self._bodies}
+
+        # Retirer les corps disparus, ajouter les nouveaux en fin de liste
+        if current != known:
+            self._bodies = [body for body in self._bodies if id(body) in current]
+            self._bodies.extend(body for body in bodies if id(body) not in known)
+
+        items = self._bodies
+        keys = [body.x - body.half_w for body in items]
+        max_width = 0.0
+
+        # Tri par insertion: quasi linéaire grâce à la cohérence temporelle
+        for i in range(1, len(items)):
+            key = keys[i]
+            if key >= keys[i - 1]:
+                continue
+            body = items[i]
+            j = i - 1
+            while j >= 0 and keys[j] > key:
+                keys[j + 1] = keys[j]
+                items[j + 1] = items[j]
+                j -= 1
+            keys[j + 1] = key
+            items[j + 1] = body
+
+        for body in items:
+            if body.half_w > max_width:
+                max_width = body.half_w
+
+        self._keys = keys
+        self._max_width = max_width * 2
+
+    def order(self) -> list:
+        """Corps dans l'ordre de tri courant."""
+        return list(self._bodies)
+
+    def restore_order(self, bodies: list):
+        """
+        Reprend un ordre de tri capturé (restauration d'instantané).
+
+        L'ordre est repris tel quel, sans retri: la prochaine update() trie
+        à partir de lui comme elle l'aurait fait à la capture, ce qui garde
+        l'ordre des résultats de query() (et donc des collisions) identique.
+        """
+        self._bodies = list(bodies)
+        self._keys = [body.x - body.half_w for body in self._bodies]
+
+    def query(self, min_x: float, max_x: float, min_y: float, max_y: float) -> list:
+        """Retourne les corps dont la boîte chevauche le rectangle donné."""
+        keys = self._keys
+        start = bisect_left(keys, min_x - self._max_width)
+        end = bisect_right(keys, max_x)
+        result = []
+
+        for body in self._bodies[start:end]:
+            if body.x + body.half_w <= min_x:
+                continue
+            if body.x - body.half_w >= max_x:
+                continue
+            if body.y + body.half_h <= min_y or body.y - body.half_h >= max_y:
+                continue
+            result.append(body)
+
+        return result
@@ -0,0 +1,61 @@
+"""
+Caméra à défilement.
+
+Le niveau peut couvrir plusieurs écrans (Config.LEVEL_WIDTH/LEVEL_HEIGHT) ;
+la caméra est la fenêtre de la taille de l'aire de jeu qui le parcourt en
+suivant les joueurs. Elle ne sert qu'au rendu : la simulation travaille en
+coordonnées du niveau et ne dépend jamais de la caméra.
+"""
+
+from .config import Config
+
+
+class Camera:
+    """Vue sur le niveau (coin haut-gauche en coordonnées du niveau)."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.width = self.config.PLAY_AREA_WIDTH
+        self.height = self.config.PLAY_AREA_HEIGHT
+        self.x = 0.0
+        self.y = 0.0
+
+    def _clamped(self, x: float, y: float) -> tuple[float, float]:
+        """Position de vue gardée dans le niveau."""
+        cfg = self.config
+        x = max(0.0, min(x, cfg.LEVEL_WIDTH - self.width))
+        y = max(0.0, min(y, cfg.LEVEL_HEIGHT - self.height))
+        return x, y
+
+    def snap(self, center_x: float, center_y: float):
+        """Centre immédiatement la vue sur un point."""
+        self.x, self.y = self._clamped(center_x - self.width / 2, center_y - self.height / 2)
+
+    def follow(self, center_x: float, center_y: float):
+        """
+        Rapproche la vue d'un point (une fraction Config.CAMERA_SMOOTHING de l'écart par frame).
+
+        Un saut de plus d'un écran (nouveau niveau, salle secrète) recentre
+        la vue d'un coup plutôt que de faire défiler tout le niveau.
+        """
+        x, y = self._clamped(center_x - self.width / 2, center_y - self.height / 2)
+        if abs(x - self.x) > self.width or abs(y - self.y) > self.height:
+            self.x, self.y = x, y
+            return
+        smoothing = self.config.CAMERA_SMOOTHING
+        self.x += (x - self.x) * smoothing
+        self.y += (y - self.y) * smoothing
+
+    @property
+    def offset(self) -> tuple[int, int]:
+        """Translation monde -> écran, en pixels entiers (pas de tremblement des sprites)."""
+        return int(self.x), int(self.y)
+
+    def rect(self, margin: float = 0.0) -> tuple[float, float, float, float]:
+        """Rectangle visible (x, y, largeur, hauteur) en coordonnées du niveau, élargi de `margin`."""
+        return self.x - margin, self.y - margin, self.width + 2 * margin, self.height + 2 * margin
+
+    def to_screen(self, x: float, y: float) -> tuple[int, int]:
+        """Coordonnées écran d'un point du niveau."""
+        ox, oy = self.offset
+        return int(x) - ox, int(y) - oy
@@ -0,0 +1,355 @@
+"""
+Tronçons des grands niveaux.
+
+Un niveau de plusieurs écrans est découpé en tronçons d'un écran (aire de
+jeu). Le coût de simulation ne dépend que des tronçons autour des joueurs,
+pas de la taille du niveau :
+
+- tronçons proches (Config.CHUNK_NEAR_RADIUS écrans autour d'un joueur) :
+  simulation complète des obstacles, ennemis et projectiles;
+- tronçons chargés mais lointains : les plateformes mobiles avancent d'un
+  bloc toutes les Config.CHUNK_FAR_INTERVAL frames (position déduite de leur
+  phase, voir MovingPlatform.advance), plateformes fragiles et ennemis sont
+  figés et les ennemis ne tirent pas;
+- au-delà de Config.CHUNK_EVICT_RADIUS : le tronçon est compacté (obstacles
+  et ennemis encodés comme dans un instantané, puis compressés) et retiré
+  du monde. Il est restauré quand un joueur revient à Config.CHUNK_LOAD_RADIUS
+  écrans, ses plateformes mobiles avancées du temps écoulé.
+
+Un tronçon jamais approché n'existe pas encore : il est généré à la demande
+avec son propre générateur aléatoire (graine du niveau et index du
+tronçon), si bien que le niveau ne dépend pas du chemin suivi. Les tronçons
+qui seront bientôt chargés (Config.CHUNK_PREFETCH_RADIUS, et
+Config.ENDLESS_LOOKAHEAD écrans devant les joueurs en mode sans fin) sont
+générés à l'avance hors du monde, un obstacle à la fois, dans un budget de
+temps par frame : le chargement n'a plus qu'à les ajouter. Le résultat ne
+dépend que de la graine, pas du moment où la génération a eu lieu.
+
+En mode sans fin, un tronçon qui sort de Config.CHUNK_EVICT_RADIUS n'est pas
+compacté mais retiré : la mémoire reste constante quelle que soit la
+distance parcourue (un retour en arrière régénère le tronçon à neuf).
+
+La proximité se déduit de la position des joueurs, jamais de la caméra (qui
+ne sert qu'au rendu) : deux simulations aux mêmes entrées découpent le
+monde de la même façon. Seuls les tronçons chargés et les enregistrements
+compactés font partie de l'état (instantanés et empreinte).
+"""
+
+import struct
+import time
+import zlib
+from typing import Iterator, Optional
+from .config import Config
+from .entities import Obstacle, MovingPlatform, FragilePlatform
+
+_RECORD = struct.Struct('<q')  # Frame du compactage (suivie des corps compressés)
+
+
+class ChunkMap:
+    """Découpage d'un GameEngine en tronçons, chargement et niveaux de détail."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.config: Config = engine.config
+        self.width = self.config.PLAY_AREA_WIDTH
+        self.height = self.config.PLAY_AREA_HEIGHT
+        self.cols = 1
+        self.rows = 1
+        self.level_seed = 0  # Graine des tronçons générés à la demande
+        self.live: set[int] = set()  # Tronçons chargés dans le monde
+        self.evicted: dict[int, bytes] = {}  # Tronçons compactés, par index
+        self._state_key = None  # Empreinte des tronçons (recalculée à chaque changement)
+
+        # Répartition de la frame, recalculée par update()
+        self.near_obstacles: list[Obstacle] = []
+        self.near_enemies: list = []
+        self._far_platforms: list[tuple[MovingPlatform, int]] = []
+        self._source = None  # Liste d'obstacles répartie (comparée par identité)
+        self._near = None
+
+        # Génération anticipée (hors de l'état de simulation)
+        self._prefetched: dict[int, list[Obstacle]] = {}  # Tronçons prêts à charger
+        self._pending: Optional[tuple[int, Iterator[Obstacle], list[Obstacle]]] = None  # Tronçon en cours
+
+    # --- Géométrie ---
+
+    def reset(self, level_seed: int, prepared: Optional[dict[int, list[Obstacle]]] = None):
+        """Nouveau niveau: aucun tronçon chargé ni compacté (`prepared`: tronçons déjà générés, par index)."""
+        cfg = self.config
+        self.cols = max(1, cfg.LEVEL_WIDTH // self.width)
+        self.rows = max(1, cfg.LEVEL_HEIGHT // self.height)
+        self.level_seed = level_seed
+        self.live = set()
+        self.evicted = {}
+        self._prefetched = dict(prepared or {})
+        self._pending = None
+        self._changed()
+
+    def cell(self, x: float, y: float) -> tuple[int, int]:
+        """(colonne, ligne) du tronçon contenant un point (bornée au niveau)."""
+        col = min(max(int(x // self.width), 0), self.cols - 1)
+        row = min(max(int(y // self.height), 0), self.rows - 1)
+        return col, row
+
+    def index(self, x: float, y: float) -> int:
+        """Index du tronçon contenant un point."""
+        col, row = self.cell(x, y)
+        return row * self.cols + col
+
+    def home(self, obs: Obstacle) -> int:
+        """Tronçon d'un obstacle: celui de son coin haut-gauche (de sa course pour une plateforme mobile)."""
+        if obs.__class__ is MovingPlatform:
+            return self.index(obs.min_x, obs.y)
+        return self.index(obs.x, obs.y)
+
+    def _player_cells(self) -> list[tuple[int, int]]:
+        return [self.cell(ball.x, ball.y) for ball in self.engine.players]
+
+    def _ring(self, cells: list[tuple[int, int]], radius: int) -> set[int]:
+        """Tronçons à au plus `radius` écrans (distance de Tchebychev) d'une des cellules."""
+        ring = set()
+        for col, row in cells:
+            for r in range(max(0, row - radius), min(self.rows, row + radius + 1)):
+                for c in range(max(0, col - radius), min(self.cols, col + radius + 1)):
+                    ring.add(r * self.cols + c)
+        return ring
+
+    def is_near(self, x: float, y: float) -> bool:
+        """True si un point est dans un tronçon simulé en détail."""
+        if self.engine.in_secret_room:
+            return True
+        radius = self.config.CHUNK_NEAR_RADIUS
+        col, row = self.cell(x, y)
+        return any(abs(col - c) <= radius and abs(row - r) <= radius for c, r in self._player_cells())
+
+    def near_bounds(self) -> tuple[float, float, float, float]:
+        """Rectangle (gauche, haut, droite, bas) englobant les tronçons proches des joueurs."""
+        cfg = self.config
+        cells = self._player_cells()
+        if self.engine.in_secret_room or not cells:
+            return 0.0, 0.0, float(cfg.LEVEL_WIDTH), float(cfg.LEVEL_HEIGHT)
+        radius = self.config.CHUNK_NEAR_RADIUS
+        cols = [col for col, _ in cells]
+        rows = [row for _, row in cells]
+        left = max(0, min(cols) - radius) * self.width
+        top = max(0, min(rows) - radius) * self.height
+        # Le dernier tronçon s'étend jusqu'au bord du niveau
+        right = cfg.LEVEL_WIDTH if max(cols) + radius >= self.cols - 1 else (max(cols) + radius + 1) * self.width
+        bottom = cfg.LEVEL_HEIGHT if max(rows) + radius >= self.rows - 1 else (max(rows) + radius + 1) * self.height
+        return float(left), float(top), float(right), float(bottom)
+
+    def near_count(self) -> int:
+        """Nombre de tronçons simulés en détail."""
+        if self.engine.in_secret_room:
+            return self.cols * self.rows
+        return len(self._ring(self._player_cells(), self.config.CHUNK_NEAR_RADIUS))
+
+    # --- Système "chunks" ---
+
+    def update(self):
+        """Charge et compacte les tronçons autour des joueurs, puis répartit le monde pour la frame."""
+        engine = self.engine
+        if engine.in_secret_room:
+            self._use_everything()
+            return
+        cfg = self.config
+        cells = self._player_cells()
+        keep = self._ring(cells, cfg.CHUNK_EVICT_RADIUS)
+        for index in sorted(self.live - keep):
+            self._evict(index)
+        for index in sorted(self._ring(cells, cfg.CHUNK_LOAD_RADIUS) - self.live):
+            self._load(index)
+
+        near = self._ring(cells, cfg.CHUNK_NEAR_RADIUS)
+        if len(near) == self.cols * self.rows:
+            self._use_everything()
+            return
+
+        obstacles = engine.obstacles
+        if obstacles is not self._source or near != self._near:
+            self._source = obstacles
+            self._near = near
+            self.near_obstacles = []
+            self._far_platforms = []
+            for obs in obstacles:
+                home = self.home(obs)
+                if home in near:
+                    self.near_obstacles.append(obs)
+                elif obs.__class__ is MovingPlatform:
+                    self._far_platforms.append((obs, home))
+        self.near_enemies = [ball for ball in engine.ai_balls if self.index(ball.x, ball.y) in near]
+
+    def _use_everything(self):
+        """Tout le monde chargé est proche: simulation complète, comme sans tronçons."""
+        self._source = None
+        self._near = None
+        self.near_obstacles = self.engine.obstacles
+        self.near_enemies = self.engine.ai_balls
+        self._far_platforms = []
+
+    def advance_far_platforms(self, frame: int):
+        """Avance les plateformes mobiles lointaines d'un bloc, chaque tronçon à son tour."""
+        interval = self.config.CHUNK_FAR_INTERVAL
+        for platform, home in self._far_platforms:
+            if (frame + home) % interval == 0:
+                platform.advance(interval)
+
+    # --- Chargement et compactage ---
+
+    def _load(self, index: int):
+        """Génère un tronçon jamais vu, ou restaure un tronçon compacté."""
+        engine = self.engine
+        record = self.evicted.pop(index, None)
+        if record is None:
+            obstacles = self._prefetched.pop(index, None)
+            if obstacles is None:
+                obstacles = list(self._generate(index))
+            ai_balls = []
+        else:
+            evicted_at = _RECORD.unpack_from(record)[0]
+            obstacles, ai_balls = engine.world_snapshot.restore_bodies(zlib.decompress(record[_RECORD.size:]))
+            elapsed = engine.timers.now - evicted_at
+            for obs in obstacles:
+                if obs.__class__ is MovingPlatform:
+                    obs.advance(elapsed)
+            for ball in ai_balls:
+                engine._arm_enemy(ball)
+
+        # Nouvelle liste: les caches indexés par liste d'obstacles (grille, empreinte, rendu) se reconstruisent
+        engine.obstacles = engine.obstacles + obstacles
+        engine.ai_balls.extend(ai_balls)
+        self.live.add(index)
+        self._changed()
+
+    def _generate(self, index: int) -> Iterator[Obstacle]:
+        """Obstacles d'un tronçon neuf (ne dépendent que de la graine du niveau et de l'index)."""
+        return self.engine.level_generator.screen(self.level_seed, index)
+
+    def _evict(self, index: int):
+        """Compacte un tronçon chargé et le retire du monde (simplement retiré en mode sans fin)."""
+        engine = self.engine
+        timers = engine.timers
+        obstacles = [obs for obs in engine.obstacles if self.home(obs) == index]
+        ai_balls = [ball for ball in engine.ai_balls if self.index(ball.x, ball.y) == index]
+
+        # Les timers ne sont pas compactés: réapparitions faites tout de suite,
+        # tirs reprogrammés au retour du tronçon
+        for obs in obstacles:
+            if obs.__class__ is FragilePlatform and obs.broken:
+                timers.cancel(obs.respawn_timer)
+                obs.respawn()
+        for ball in ai_balls:
+            timers.cancel(ball.shoot_timer)
+            ball.shoot_timer = None
+            ball.volleys_left = 0
+
+        if not engine.endless:
+            body = engine.world_snapshot.capture_bodies(obstacles, ai_balls)
+            self.evicted[index] = _RECORD.pack(timers.now) + zlib.compress(body)
+
+        removed = {id(obj) for obj in obstacles}
+        removed.update(id(ball) for ball in ai_balls)
+        engine.obstacles = [obs for obs in engine.obstacles if id(obs) not in removed]
+        engine.ai_balls = [ball for ball in engine.ai_balls if id(ball) not in removed]
+        self.live.discard(index)
+        self._changed()
+
+    # --- Génération anticipée ---
+
+    def _prefetch_targets(self) -> list[int]:
+        """Tronçons à générer à l'avance, les plus proches des joueurs d'abord."""
+        cells = self._player_cells()
+        targets = self._ring(cells, self.config.CHUNK_PREFETCH_RADIUS)
+        axis = self.engine.endless
+        if axis is not None:
+            # Bande devant les joueurs, dans le sens de la course
+            ahead = [(col + step, row) if axis == 'horizontal' else (col, row - step)
+                     for col, row in cells for step in range(1, self.config.ENDLESS_LOOKAHEAD + 1)]
+            targets |= self._ring([(col, row) for col, row in ahead
+                                   if 0 <= col < self.cols and 0 <= row < self.rows], 0)
+        targets -= self.live
+        targets -= self.evicted.keys()
+
+        def distance(index: int) -> int:
+            row, col = divmod(index, self.cols)
+            return min(max(abs(col - c), abs(row - r)) for c, r in cells)
+        return sorted(targets, key=lambda index: (distance(index), index))
+
+    def prefetch(self, budget_ms: float):
+        """
+        Génère à l'avance les tronçons bientôt chargés, pendant au plus `budget_ms`.
+
+        Appelé hors des systèmes de simulation : le travail peut s'arrêter
+        n'importe où (entre deux obstacles) et reprendre à la frame suivante.
+        """
+        if self.engine.in_secret_room or len(self.live) == self.cols * self.rows:
+            return
+        deadline = time.perf_counter() + budget_ms / 1000
+        targets = self._prefetch_targets()
+        wanted = set(targets)
+        # Oublier ce qui n'est plus devant les joueurs (mémoire bornée)
+        for index in [index for index in self._prefetched if index not in wanted]:
+            del self._prefetched[index]
+        if self._pending is not None and self._pending[0] not in wanted:
+            self._pending = None
+
+        # Filtre évalué au fil de l'eau: un tronçon terminé entre-temps n'est pas refait
+        queue = (index for index in targets if index not in self._prefetched)
+        while time.perf_counter() < deadline:
+            if self._pending is None:
+                index = next(queue, None)
+                if index is None:
+                    return
+                self._pending = (index, self._generate(index), [])
+            index, steps, obstacles = self._pending
+            obs = next(steps, None)
+            if obs is None:
+                self._prefetched[index] = obstacles
+                self._pending = None
+            else:
+                obstacles.append(obs)
+
+    # --- État ---
+
+    def _changed(self):
+        self._state_key = None
+        self._source = None
+        self.engine.world_version += 1  # Obstacles du monde modifiés (voir statehash.py)
+
+    def restore_state(self, level_seed: int, live, evicted: dict[int, bytes]):
+        """Reprend l'état capturé par un instantané (le monde est restauré à part)."""
+        cfg = self.config
+        self.cols = max(1, cfg.LEVEL_WIDTH // self.width)
+        self.rows = max(1, cfg.LEVEL_HEIGHT // self.height)
+        if level_seed != self.level_seed:
+            self._prefetched = {}
+            self._pending = None
+        self.level_seed = level_seed
+        self.live = set(live)
+        self.evicted = dict(evicted)
+        self._changed()
+
+    def state_key(self) -> tuple:
+        """Entiers résumant les tronçons chargés et compactés (empreinte d'état)."""
+        if self._state_key is None:
+            self._state_key = (
+                self.level_seed,
+                tuple(sorted(self.live)),
+                tuple((index, zlib.crc32(record)) for index, record in sorted(self.evicted.items())),
+            )
+        return self._state_key
+
+    def evicted_bytes(self) -> int:
+        """Mémoire occupée par les tronçons compactés."""
+        return sum(len(record) for record in self.evicted.values())
+
+    def stats(self) -> dict:
+        """Compteurs de charge (benchmarks)."""
+        return {
+            'live_chunks': len(self.live),
+            'evicted_chunks': len(self.evicted),
+            'evicted_bytes': self.evicted_bytes(),
+            'prefetched_chunks': len(self._prefetched),
+            'near_obstacles': len(self.near_obstacles),
+            'near_enemies': len(self.near_enemies),
+        }
@@ -137,6 +137,8 @@ class Config:
     AI_BALL_RADIUS_3HP = 18
     AI_BALL_SPEED = 3
     BALL_BOUNCE_FACTOR = 0.9  # Rebond entre boules
+    AI_SLEEP_VELOCITY = 0.1  # Vitesse horizontale sous laquelle un ennemi au sol est au repos
+    AI_SLEEP_FRAMES = 20  # Frames de repos consécutives avant endormissement
 
     # Animation double saut
     DOUBLE_JUMP_PARTICLE_COUNT = 16
@@ -195,3 +197,127 @@ class Config:
     ENEMY_SPAWN_INTERVAL = 180  # Frames entre chaque spawn (3 secondes à 60 FPS)
     ENEMY_MAX_COUNT = 6  # Nombre maximum d'ennemis
     ENEMIES_TO_WIN = 10  # Nombre d'ennemis à vaincre pour débloquer la porte (réduit de 15 à 10)
+
+    # Ramasse-miettes (voir gcpolicy.py)
+    GC_POLICY_ENABLED = True
+    GC_PLAYING_THRESHOLDS = (10000, 50, 1000)  # Seuils (gen0, gen1, gen2) pendant le jeu
+    GC_PAUSE_HISTORY = 120  # Nombre de pauses GC conservées pour la télémétrie
+
+    # Systèmes de mise à jour (voir systems.py)
+    SYSTEM_RATES = {}  # Cadence par système, une frame sur N (ex: {"enemy_ai": 3} pour 20 Hz, frames rattrapées)
+    SYSTEMS_DISABLED = ()  # Systèmes à ne pas exécuter (ex: ("particles",))
+
+    # Coopération et netplay (voir netplay.py)
+    COOP_PARTNER_OFFSET = 80  # Écart horizontal entre les deux joueurs à l'apparition
+    NETPLAY_PORT = 7777
+    NETPLAY_INPUT_DELAY = 2  # Frames de délai local (moins de rollbacks)
+    # Frames d'avance maximale sur les entrées distantes confirmées: un rollback rejoue au plus
+    # autant de frames (instantané + tick, ~1,1 ms chacune), 5 tient en ~6 ms au p95
+    NETPLAY_MAX_ROLLBACK = 5
+    NETPLAY_INPUT_REDUNDANCY = 8  # Entrées renvoyées dans chaque paquet (pertes UDP)
+    NETPLAY_HANDSHAKE_TIMEOUT = 30.0  # Secondes d'attente du partenaire
+    NETPLAY_HASH_WINDOW = 120  # Empreintes locales gardées pour comparaison avec le pair
+
+    # Empreinte d'état (détection des désynchros et tests de déterminisme)
+    STATE_HASH_ENABLED = True  # Empreinte calculée à chaque tick
+    STATE_HASH_RNG_INTERVAL = 16  # Frames entre deux relevés des générateurs aléatoires (lecture coûteuse)
+
+    # Environnement d'apprentissage (voir env.py)
+    ENV_MAX_ENEMIES = 6  # Ennemis les plus proches dans l'observation
+    ENV_MAX_BULLETS = 8  # Bulles ennemies les plus proches
+    ENV_MAX_PLATFORMS = 32  # Obstacles du niveau (géométrie)
+    ENV_MAX_STEPS = 60 * 60 * 5  # Frames par épisode (5 minutes)
+    ENV_REWARD_KILL = 1.0
+    ENV_REWARD_LEVEL = 5.0
+    ENV_REWARD_LIFE = 1.0  # Par vie gagnée (négatif quand une vie est perdue)
+
+    # Observations en pixels (voir obs_renderer.py)
+    OBS_RENDER_SIZE = (120, 80)  # Aire de jeu réduite (1200x800 -> 120x80)
+    OBS_COLORS = {
+        'background': (0, 0, 0),
+        'wall': (128, 128, 128),
+        'platform': (160, 96, 32),
+        'moving_platform': (224, 160, 64),
+        'fragile_platform': (96, 192, 224),
+        'door': (255, 255, 0),
+        'heart': (255, 0, 128),
+        'player': (255, 255, 255),
+        'partner': (192, 255, 192),
+        'enemy': [(0, 0, 255), (128, 0, 255), (255, 0, 0), (255, 0, 0)],  # Par PV restants (1, 2, 3, 4)
+        'missile': (0, 255, 0),
+        'bullet': (0, 255, 255),
+    }
+
+    # Bots (voir bot.py)
+    BOT_DIFFICULTY = 0.7  # 0 = réactions lentes et erreurs, 1 = réactions rapides
+    BOT_AGGRESSION = 0.6  # 0 = tir à distance, 1 = fonce sauter sur les ennemis
+
+    # Mode horde (python main.py --horde, voir aussi python -m game.benchmarks horde)
+    HORDE_START_ENEMIES = 20  # Ennemis autorisés au début de la partie
+    HORDE_MAX_ENEMIES = 400
+    HORDE_RAMP_FRAMES = 60  # Le plafond monte d'un palier chaque seconde...
+    HORDE_RAMP_STEP = 5  # ...de 5 ennemis (300 ennemis après un peu moins d'une minute)
+    HORDE_SPAWN_INTERVAL = 3  # Frames entre deux spawns tant que le plafond n'est pas atteint
+    HORDE_FIRE_INTERVAL = (300, 600)  # Frames entre deux tirs d'un même ennemi
+    HORDE_FRAME_BUDGET_MS = 1000 / 60  # Durée de frame visée par le benchmark
+
+    # Budgets d'effets (foules d'ennemis)
+    BALL_COLLISION_MIN_SPEED = 0.7  # Chocs entre ennemis plus lents: ni particules ni son (contacts au repos)
+    BALL_COLLISION_EVENTS_MAX = 8  # Chocs entre ennemis signalés par frame (les plus violents)
+    PARTICLE_BUDGET = 800  # Particules vivantes au maximum, les nouvelles sont abandonnées au-delà
+
+    # Tirs ennemis (voir projectiles.py)
+    ENEMY_BULLET_RADIUS = 6
+    ENEMY_BULLET_COLOR = (150, 200, 255)
+    GRID_CELL_SIZE = 4  # Côté des cellules de la grille de distance aux obstacles (pixels)
+    GRID_MAX_DISTANCE = 64  # Distance plafond gardée par la grille (pixels): au-delà, « loin de tout »
+    FIRE_PATTERNS = {
+        'single': {'kind': 'single', 'speed': 4, 'interval': (120, 240), 'aimed': True},
+        'fan': {'kind': 'fan', 'count': 3, 'spread': 0.35, 'speed': 4, 'interval': (150, 270), 'aimed': True},
+        'radial': {'kind': 'radial', 'count': 10, 'speed': 3, 'interval': (200, 320)},
+        'spiral': {'kind': 'spiral', 'count': 3, 'spin': 0.06, 'speed': 3.5, 'interval': (240, 360),
+                   'burst': 8, 'burst_interval': 6},
+    }
+    ENEMY_FIRE_PATTERNS = {1: 'single', 2: 'fan', 3: 'spiral'}  # Motif par type d'ennemi
+
+    # Grands niveaux et caméra (voir camera.py; python main.py --level-size 3x2)
+    LEVEL_WIDTH = PLAY_AREA_WIDTH  # Taille du niveau: un écran par défaut, la caméra défile au-delà
+    LEVEL_HEIGHT = PLAY_AREA_HEIGHT
+    CAMERA_SMOOTHING = 0.15  # Part de l'écart à la cible rattrapée par frame
+    SPATIAL_CELL_SIZE = 256  # Cellules de l'index spatial du rendu (pixels)
+
+    # Tronçons des grands niveaux (voir chunks.py): rayons en écrans autour des joueurs
+    CHUNK_NEAR_RADIUS = 1  # Simulation complète
+    CHUNK_LOAD_RADIUS = 2  # Tronçons générés ou restaurés
+    CHUNK_EVICT_RADIUS = 3  # Au-delà, tronçons compactés et retirés du monde
+    CHUNK_FAR_INTERVAL = 8  # Frames entre deux avancées des plateformes mobiles lointaines
+    CHUNK_PREFETCH_RADIUS = 3  # Écrans générés à l'avance, hors du monde, en attendant d'être chargés
+    CHUNK_PREFETCH_BUDGET_MS = 1.0  # Temps accordé par frame à la génération anticipée
+
+    # Mode sans fin (python main.py --endless horizontal|vertical)
+    ENDLESS_SCREENS = 1_000_000  # Longueur de la piste en écrans: hors d'atteinte, coordonnées < 2**31 (rendu)
+    ENDLESS_LOOKAHEAD = 5  # Écrans générés à l'avance devant les joueurs, dans le sens de la course
+    ENDLESS_CLIMB_ROWS = 9  # Rangées de plateformes par écran de piste verticale (une tous les ~90 pixels)
+
+    # Génération des niveaux (voir levelgen.py; python -m game.benchmarks transitions)
+    LEVELGEN_QUEUE = 3  # Niveaux suivants validés et préparés à l'avance
+    LEVELGEN_MAX_ATTEMPTS = 16  # Graines essayées avant de garder un niveau non validé
+    LEVELGEN_VALIDATE_ROWS = 2  # Rangées d'écrans (depuis le haut) couvertes par la validation
+    LEVELGEN_WALKWAY_OVERLAP = 16  # Hauteur de porte couverte par le plus petit joueur sur la passerelle de secours
+    LEVELGEN_WORKER = True  # Préparation dans un processus séparé (jeu fenêtré seulement)
+    LEVELGEN_CACHE_DIR = "~/.ededo_levels"  # Cache disque des niveaux validés, par graine
+    LEVELGEN_CACHE_MAX_FILES = 64  # Niveaux gardés sur disque (les moins récemment utilisés sont supprimés)
+
+    # Navigation des ennemis (voir navigation.py)
+    ENEMY_NAVIGATION = True  # Poursuite et fuite le long du graphe des plateformes
+    ENEMY_NAV_BEHAVIOR = {1: 'flee', 2: 'chase', 3: 'chase'}  # Par type d'ennemi: 'chase', 'flee' ou 'wander'
+    ENEMY_NAV_RADIUS = 900  # Distance au joueur en deçà de laquelle un poursuivant le traque
+    ENEMY_FLEE_RADIUS = 300  # Distance au joueur en deçà de laquelle un fuyard s'éloigne
+    ENEMY_NAV_MOVE_CHANCE = 0.12  # Probabilité d'impulsion par frame d'un ennemi guidé
+    NAV_WALK_STEP = 4  # Écart (pixels) franchi en marchant entre deux surfaces
+
+    # Lignes de vue des ennemis (voir sight.py)
+    ENEMY_FIRE_NEEDS_SIGHT = True  # Un ennemi ne commence une salve que s'il voit le joueur le plus proche
+    SIGHT_CELL_SIZE = 32  # Cellules des paires ennemi/joueur du cache de visibilité (pixels)
+    SIGHT_CACHE_SIZE = 8192  # Paires gardées avant de vider le cache
+    SIGHT_RETRY_FRAMES = 30  # Délai avant de retenter un tir retenu faute de ligne de vue
@@ -0,0 +1,660 @@
+"""
+Gestion groupée des ennemis.
+
+Conserve l'état des boules IA dans des tableaux NumPy (structure de tableaux)
+pour intégrer et résoudre les collisions de tous les ennemis en une seule passe.
+"""
+
+from typing import Optional
+import numpy as np
+from .config import Config
+from .entities import AIBall, Obstacle
+from .grid import ObstacleGrid
+from .navigation import NavGraph, FALL, JUMP, UNREACHABLE
+from .physics import PhysicsEngine
+
+# Index de support particuliers
+NO_SUPPORT = -1  # Pas d'obstacle sous la boule (en l'air ou sur le sol)
+LOST_SUPPORT = -2  # Le support en cache n'existe plus dans le niveau
+
+# Comportements de navigation (Config.ENEMY_NAV_BEHAVIOR)
+NAV_BEHAVIORS = {'wander': 0, 'chase': 1, 'flee': 2}
+WANDER, CHASE, FLEE = 0, 1, 2
+
+
+class EnemyStore:
+    """
+    Stockage vectorisé de l'état des ennemis.
+
+    Les objets AIBall restent la représentation de référence pour le reste du
+    moteur : le store charge leur état dans des tableaux, met à jour tous les
+    ennemis d'un coup, puis réécrit le résultat dans les objets.
+
+    Les ennemis immobiles au sol s'endorment : ils ne sont plus intégrés ni
+    testés contre les obstacles jusqu'à ce que leur IA décide de bouger ou que
+    leur support (plateforme mobile ou fragile) bouge ou casse.
+
+    Avec des cibles (joueurs), les ennemis qui poursuivent ou fuient suivent
+    le graphe de navigation des obstacles (voir navigation.py) au lieu
+    d'errer au hasard.
+    """
+
+    def __init__(self, config: Config = None, seed: Optional[int] = None):
+        self.config = config or Config()
+        self.rng = np.random.default_rng(seed)
+        self.count = 0
+        self.navigation = NavGraph(self.config)
+
+        # Tables de paramètres par archétype (une ligne par valeur de HP initiale)
+        self._archetype_rows: dict[int, int] = {}
+        self.movement_chance = np.zeros(0)
+        self.jump_chance = np.zeros(0)
+        self.speed_multiplier = np.zeros(0)
+        self.jump_force = np.zeros(0)
+        self.nav_behavior = np.zeros(0, dtype=np.intp)
+        for hp in sorted(set(self.config.ENEMY_TYPE_HP.values())):
+            self._archetype_row(hp)
+
+        self._resize(0)
+        self._clear_contacts()
+        self._ids: list[int] = []  # id() des boules chargées, dans l'ordre de la liste
+        self._sorted_ids: list[int] = []  # Ordre de tri par borne gauche de la frame précédente
+        self._previous_order = np.zeros(0, dtype=np.intp)
+
+    def seed(self, seed: Optional[int]):
+        """Réinitialise le générateur aléatoire de l'IA."""
+        self.rng = np.random.default_rng(seed)
+
+    def _archetype_row(self, max_hp: int) -> int:
+        """Retourne (et crée si besoin) la ligne de paramètres d'un archétype."""
+        row = self._archetype_rows.get(max_hp)
+        if row is None:
+            movement, jump, speed, force = AIBall.behavior_for(max_hp, self.config)
+            row = len(self._archetype_rows)
+            self._archetype_rows[max_hp] = row
+            self.movement_chance = np.append(self.movement_chance, movement)
+            self.jump_chance = np.append(self.jump_chance, jump)
+            self.speed_multiplier = np.append(self.speed_multiplier, speed)
+            self.jump_force = np.append(self.jump_force, force)
+            enemy_type = next((t for t, hp in self.config.ENEMY_TYPE_HP.items() if hp == max_hp), None)
+            behavior = NAV_BEHAVIORS[self.config.ENEMY_NAV_BEHAVIOR.get(enemy_type, 'wander')]
+            self.nav_behavior = np.append(self.nav_behavior, behavior)
+        return row
+
+    def _resize(self, count: int):
+        """Alloue les tableaux d'état pour `count` ennemis."""
+        self.count = count
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.vx = np.zeros(count)
+        self.vy = np.zeros(count)
+        self.half_w = np.zeros(count)
+        self.half_h = np.zeros(count)
+        self.facing = np.ones(count)
+        self.on_ground = np.zeros(count, dtype=bool)
+        self.archetype = np.zeros(count, dtype=np.intp)
+        self.sleeping = np.zeros(count, dtype=bool)
+        self.rest_frames = np.zeros(count, dtype=np.intp)
+        self.support = np.full(count, NO_SUPPORT, dtype=np.intp)
+        self.support_x = np.zeros(count)
+        self.support_y = np.zeros(count)
+
+    def gather(self, ai_balls: list[AIBall], obstacles: list[Obstacle]):
+        """Charge l'état des boules IA dans les tableaux."""
+        if len(ai_balls) != self.count:
+            self._resize(len(ai_balls))
+        if not ai_balls:
+            return
+
+        # Le support est mémorisé par objet, converti ici en index d'obstacle
+        obstacle_index = {id(obs): i for i, obs in enumerate(obstacles)}
+
+        # Ordre de tri de la frame précédente, ramené aux index courants (nouvelles boules à la fin)
+        self._ids = [id(ball) for ball in ai_balls]
+        position = {key: i for i, key in enumerate(self._ids)}
+        previous = [position[key] for key in self._sorted_ids if key in position]
+        if len(previous) < len(ai_balls):
+            kept = set(previous)
+            previous.extend(i for i in range(len(ai_balls)) if i not in kept)
+        self._previous_order = np.array(previous, dtype=np.intp)
+
+        # Une seule passe Python, puis découpage en colonnes
+        state = np.array([
+            (ball.x, ball.y, ball.vx, ball.vy, ball.half_w, ball.half_h,
+             ball.facing_direction, ball.on_ground, self._archetype_row(ball.max_hp),
+             ball.sleeping, ball.rest_frames,
+             NO_SUPPORT if ball.support is None else obstacle_index.get(id(ball.support), LOST_SUPPORT),
+             ball.support_x, ball.support_y)
+            for ball in ai_balls
+        ], dtype=float)
+
+        self.x = state[:, 0].copy()
+        self.y = state[:, 1].copy()
+        self.vx = state[:, 2].copy()
+        self.vy = state[:, 3].copy()
+        self.half_w = state[:, 4].copy()
+        self.half_h = state[:, 5].copy()
+        self.facing = state[:, 6].copy()
+        self.on_ground = state[:, 7] != 0
+        self.archetype = state[:, 8].astype(np.intp)
+        self.sleeping = state[:, 9] != 0
+        self.rest_frames = state[:, 10].astype(np.intp)
+        self.support = state[:, 11].astype(np.intp)
+        self.support_x = state[:, 12].copy()
+        self.support_y = state[:, 13].copy()
+
+    def scatter(self, ai_balls: list[AIBall], obstacles: list[Obstacle]):
+        """Réécrit l'état des tableaux dans les boules IA."""
+        x = self.x.tolist()
+        y = self.y.tolist()
+        vx = self.vx.tolist()
+        vy = self.vy.tolist()
+        facing = self.facing.astype(int).tolist()
+        on_ground = self.on_ground.tolist()
+        sleeping = self.sleeping.tolist()
+        rest_frames = self.rest_frames.tolist()
+        support = self.support.tolist()
+        support_x = self.support_x.tolist()
+        support_y = self.support_y.tolist()
+
+        for i, ball in enumerate(ai_balls):
+            ball.x = x[i]
+            ball.y = y[i]
+            ball.vx = vx[i]
+            ball.vy = vy[i]
+            ball.facing_direction = facing[i]
+            ball.on_ground = on_ground[i]
+            ball.sleeping = sleeping[i]
+            ball.rest_frames = rest_frames[i]
+            if support[i] >= 0:
+                ball.support = obstacles[support[i]]
+                ball.support_x = support_x[i]
+                ball.support_y = support_y[i]
+            else:
+                ball.support = None
+
+    def _clear_contacts(self):
+        """Aucun contact entre ennemis (voir collide)."""
+        self.contact_x = np.zeros(0)
+        self.contact_y = np.zeros(0)
+        self.contact_speed = np.zeros(0)
+
+    def update(self, ai_balls: list[AIBall], physics: PhysicsEngine, obstacles: list[Obstacle],
+               targets: Optional[list] = None, grid: Optional[ObstacleGrid] = None, frames: int = 1):
+        """
+        Met à jour toutes les boules IA en une passe vectorisée, chocs entre elles compris.
+
+        `targets` (joueurs) active la navigation des poursuivants et des fuyards;
+        `grid` (grille de distance des obstacles, voir grid.py) sert à leurs sondes.
+        `frames` frames sont simulées entre un seul chargement et une seule
+        écriture des boules (système IA à cadence réduite).
+        """
+        if not ai_balls:
+            self._clear_contacts()
+            return
+        self.gather(ai_balls, obstacles)
+        for _ in range(frames):
+            self.step(physics, obstacles, targets, grid)
+            self.collide(physics)
+        self.scatter(ai_balls, obstacles)
+
+    def candidate_pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Paires (a, b) d'ennemis dont les boîtes englobantes se chevauchent.
+
+        Sweep and prune vectorisé : tri par borne gauche, puis pour chaque
+        boule la plage des suivantes qui commencent avant sa borne droite.
+
+        Le tri repart de l'ordre de la frame précédente : les ennemis bougeant
+        peu d'une frame à l'autre, la liste est presque triée et le tri stable
+        (adaptatif, comme un tri par insertion) la remet en ordre en temps
+        quasi linéaire. Les égalités exactes sont départagées par index, pour
+        que l'ordre des paires ne dépende que de l'état courant (rollbacks).
+        """
+        n = self.count
+        left = self.x - self.half_w
+        order = self._previous_order
+        if len(order) != n:
+            order = np.arange(n)
+        order = order[np.argsort(left[order], kind='stable')]
+        sorted_left = left[order]
+        if n > 1 and (sorted_left[1:] == sorted_left[:-1]).any():
+            order = np.lexsort((np.arange(n), left))
+            sorted_left = left[order]
+        self._previous_order = order
+        if len(self._ids) == n:
+            self._sorted_ids = [self._ids[i] for i in order.tolist()]
+        sorted_right = (self.x + self.half_w)[order]
+
+        start = np.arange(1, n + 1)
+        end = np.searchsorted(sorted_left, sorted_right, side='left')
+        counts = np.maximum(end - start, 0)
+        total = int(counts.sum())
+        if not total:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        first = np.repeat(np.arange(n), counts)
+        # Position de chaque paire dans sa plage: rang global moins le début de la plage
+        offsets = np.repeat(start - (np.cumsum(counts) - counts), counts)
+        second = offsets + np.arange(total)
+        a = order[first]
+        b = order[second]
+
+        close = np.abs(self.y[a] - self.y[b]) < self.half_h[a] + self.half_h[b]
+        return a[close], b[close]
+
+    def collide(self, physics: PhysicsEngine):
+        """
+        Sépare les ennemis qui se chevauchent et échange leurs impulsions.
+
+        Reproduit PhysicsEngine.check_ellipse_collision sur toutes les paires
+        en contact à la fois : les corrections de chaque paire sont calculées
+        sur l'état de début de passe puis cumulées (une boule prise dans une
+        pile reçoit la somme des poussées de ses voisines). Les points de
+        contact et vitesses relatives sont gardés dans contact_x, contact_y et
+        contact_speed pour les effets.
+        """
+        a, b = self.candidate_pairs()
+        if not len(a):
+            self._clear_contacts()
+            return
+
+        sx = np.maximum(self.half_w[a] + self.half_w[b], 1e-6)
+        sy = np.maximum(self.half_h[a] + self.half_h[b], 1e-6)
+        ndx = (self.x[b] - self.x[a]) / sx
+        ndy = (self.y[b] - self.y[a]) / sy
+        dist_sq = ndx * ndx + ndy * ndy
+        hit = (dist_sq < 1.0) & (dist_sq > 0)
+        if not hit.any():
+            self._clear_contacts()
+            return
+
+        a = a[hit]
+        b = b[hit]
+        sx = sx[hit]
+        sy = sy[hit]
+        dist = np.sqrt(dist_sq[hit])
+        nx = ndx[hit] / dist
+        ny = ndy[hit] / dist
+        overlap = 1.0 - dist
+
+        # Séparation dans l'espace réel, à moitié pour chaque boule
+        sep_x = nx * overlap * sx * 0.5
+        sep_y = ny * overlap * sy * 0.5
+
+        # Impulsion le long de la normale réelle, si les boules se rapprochent
+        real_nx = nx * sx
+        real_ny = ny * sy
+        n_len = np.sqrt(real_nx * real_nx + real_ny * real_ny)
+        real_nx /= n_len
+        real_ny /= n_len
+        dvn = (self.vx[a] - self.vx[b]) * real_nx + (self.vy[a] - self.vy[b]) * real_ny
+        dvn = np.maximum(dvn, 0.0)
+        m1 = self.half_w[a] * self.half_h[a]
+        m2 = self.half_w[b] * self.half_h[b]
+        scale = 2 * dvn * physics.config.BALL_BOUNCE_FACTOR / (m1 + m2)
+        factor1 = m2 * scale
+        factor2 = m1 * scale
+
+        np.add.at(self.x, a, -sep_x)
+        np.add.at(self.y, a, -sep_y)
+        np.add.at(self.x, b, sep_x)
+        np.add.at(self.y, b, sep_y)
+        np.add.at(self.vx, a, -factor1 * real_nx)
+        np.add.at(self.vy, a, -factor1 * real_ny)
+        np.add.at(self.vx, b, factor2 * real_nx)
+        np.add.at(self.vy, b, factor2 * real_ny)
+
+        # Une boule poussée se réveille
+        self.sleeping[a] = False
+        self.sleeping[b] = False
+        self.rest_frames[a] = 0
+        self.rest_frames[b] = 0
+
+        self.contact_x = (self.x[a] + self.x[b]) / 2
+        self.contact_y = (self.y[a] + self.y[b]) / 2
+        self.contact_speed = np.hypot(self.vx[a] - self.vx[b], self.vy[a] - self.vy[b])
+
+    def step(self, physics: PhysicsEngine, obstacles: list[Obstacle], targets: Optional[list] = None,
+             grid: Optional[ObstacleGrid] = None):
+        """
+        Avance la simulation d'une frame pour tous les ennemis.
+
+        Comportement par archétype (AIBall.behavior_for), tirages aléatoires
+        faits par lots, puis gravité, murs, obstacles et endormissement.
+        Sans `targets`, aucun ennemi n'est guidé (même suite de tirages).
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        # Rectangles des obstacles: (x, y, largeur, hauteur, solide)
+        obstacle_rects = np.array(
+            [(obs.x, obs.y, obs.width, obs.height, obs.is_solid()) for obs in obstacles],
+            dtype=float
+        ).reshape(-1, 5)
+
+        # Un support qui bouge, casse ou disparaît réveille la boule
+        self._wake_on_support_change(obstacle_rects)
+
+        row = self.archetype
+
+        # Tirages aléatoires groupés: mouvement, amplitude, saut
+        rolls = self.rng.random((3, n))
+        steering = direction = None
+        if targets:
+            steering, direction, leap = self._steer(obstacles, obstacle_rects, targets, grid)
+        if steering is not None and steering.any():
+            # Un ennemi guidé bouge plus souvent, dans le sens du chemin, et saute au bon endroit
+            chance = np.where(steering, self.config.ENEMY_NAV_MOVE_CHANCE, self.movement_chance[row])
+            move = (rolls[0] < chance) | leap
+            jump = self.on_ground & ((rolls[2] < self.jump_chance[row]) & ~steering | leap)
+            # Élan complet au décollage
+            rolls[1] = np.where(leap, 1.0, rolls[1])
+        else:
+            steering = None
+            move = rolls[0] < self.movement_chance[row]
+            jump = self.on_ground & (rolls[2] < self.jump_chance[row])
+
+        # L'IA qui décide de bouger réveille la boule, les autres dormeurs sont sautés
+        decided = move | jump
+        self.sleeping &= ~decided
+        self.rest_frames[decided] = 0
+
+        awake = np.flatnonzero(~self.sleeping)
+        if awake.size:
+            guided = None if steering is None else (steering[awake], direction[awake])
+            self._integrate(physics, obstacle_rects, awake, move[awake], jump[awake], rolls[1][awake], guided)
+
+    def _steer(self, obstacles: list[Obstacle], obstacle_rects: np.ndarray, targets: list,
+               grid: Optional[ObstacleGrid] = None):
+        """
+        Direction de chaque ennemi qui poursuit ou fuit le joueur le plus proche.
+
+        La prochaine surface du chemin est visée à sa position courante : une
+        plateforme mobile trop loin est attendue au bord, une fragile cassée
+        aussi. Un saut n'est déclenché que si l'arc de l'archétype atteint la
+        surface depuis la position actuelle.
+
+        Returns:
+            (guidé, direction -1/0/1, saut) par ennemi
+        """
+        cfg = self.config
+        n = self.count
+        steering = np.zeros(n, dtype=bool)
+        direction = np.zeros(n)
+        leap = np.zeros(n, dtype=bool)
+
+        behavior = self.nav_behavior[self.archetype]
+        if not (behavior != WANDER).any():
+            return steering, direction, leap
+
+        # Joueur le plus proche de chaque ennemi
+        target_x = np.array([t.x for t in targets], dtype=float)
+        target_feet = np.array([t.y + t.half_h for t in targets], dtype=float)
+        dx = target_x[None, :] - self.x[:, None]
+        dy = target_feet[None, :] - (self.y + self.half_h)[:, None]
+        dist_sq = dx * dx + dy * dy
+        nearest = np.argmin(dist_sq, axis=1)
+        reach = np.sqrt(dist_sq[np.arange(n), nearest])
+        active = ((behavior == CHASE) & (reach < cfg.ENEMY_NAV_RADIUS)) | \
+            ((behavior == FLEE) & (reach < cfg.ENEMY_FLEE_RADIUS))
+
+        # Surface sous chaque ennemi: son support, le sol, ou aucune en l'air
+        nav = self.navigation
+        max_speed = cfg.AI_BALL_SPEED * 2 * self.speed_multiplier
+        nav.build(obstacles, list(zip(self.jump_force.tolist(), max_speed.tolist())))
+        node = np.where(self.support >= 0, self.support, np.where(self.on_ground, nav.floor, UNREACHABLE))
+        active &= node != UNREACHABLE
+        if not active.any():
+            return steering, direction, leap
+
+        # Rectangles courants des surfaces (plateformes mobiles à leur place du moment), sol en dernier
+        floor = (nav.left[-1], nav.top[-1], nav.right[-1] - nav.left[-1], cfg.WALL_THICKNESS, 1.0)
+        rects = np.vstack((obstacle_rects, floor))
+
+        for player in np.unique(nearest[active]):
+            index = np.flatnonzero(active & (nearest == player))
+            goal = nav.locate(target_x[player], target_feet[player])
+            hops, distance = nav.paths(goal)
+            row = self.archetype[index]
+            src = node[index]
+            hop = hops[row, src]
+            x = self.x[index]
+
+            flee = behavior[index] == FLEE
+            if flee.any():
+                # Voisine la plus loin du joueur (hors d'atteinte: la meilleure),
+                # si elle vaut mieux que la surface actuelle
+                fleeing = np.flatnonzero(flee)
+                far = np.where(distance < 0, nav.floor + 2, distance)[row[fleeing]]
+                score = np.where(nav.kind[row[fleeing], src[fleeing]] != 0, far, -1)
+                best = np.argmax(score, axis=1)
+                better = score[np.arange(len(fleeing)), best] > far[np.arange(len(fleeing)), src[fleeing]]
+                hop[fleeing] = np.where(better, best, src[fleeing])
+
+            # Même surface que la cible: aller vers le joueur (ou s'en éloigner)
+            here = hop == src
+            away = np.where(target_x[player] >= x, -1.0, 1.0)
+            direction[index[here]] = np.where(flee[here], away[here], -away[here])
+            steering[index[here]] = True
+
+            moving = np.flatnonzero(~here & (hop != UNREACHABLE))
+            if not len(moving):
+                continue
+            idx = index[moving]
+            x = x[moving]
+            hw = self.half_w[idx]
+            target = rects[hop[moving]]
+            left = target[:, 0]
+            right = target[:, 0] + target[:, 2]
+            source = rects[src[moving]]
+            kind = nav.kind[row[moving], src[moving], hop[moving]]
+
+            # Point visé: au-dessus de la surface, ou pour un saut à côté (pas dessous, on s'y cognerait)
+            aim = np.clip(x, left + hw, right - hw)
+            under = (x > left - hw) & (x < right + hw)
+            side = np.where(x - left < right - x, left - hw, right + hw)
+            aim = np.where((kind == JUMP) & under, side, aim)
+            # Le décollage se fait depuis la source: ne pas courir au-delà de son bord
+            aim = np.where(kind == JUMP, np.clip(aim, source[:, 0], source[:, 0] + source[:, 2]), aim)
+            # Chute sur une surface qui passe sous la source: sortir par le bord le plus proche
+            on_source = (aim > source[:, 0]) & (aim < source[:, 0] + source[:, 2])
+            exit_edge = np.where(aim - source[:, 0] < source[:, 0] + source[:, 2] - aim,
+                                 source[:, 0] - hw, source[:, 0] + source[:, 2] + hw)
+            aim = np.where((kind == FALL) & on_source, exit_edge, aim)
+            step = np.sign(aim - x)
+
+            # Saut: uniquement si l'arc atteint la surface depuis ici (sinon continuer d'approcher)
+            gap = np.maximum(0.0, np.maximum(left - hw - x, x - right - hw))
+            rise = source[:, 1] - target[:, 1]
+            ready = np.zeros(len(idx), dtype=bool)
+            jumps = np.flatnonzero((kind == JUMP) & ~under)
+            for arc_row in np.unique(row[moving][jumps]):
+                sel = jumps[row[moving][jumps] == arc_row]
+                arc = nav.jump_arcs[arc_row]
+                # Pas de plafond (dessous d'un obstacle solide) à portée du saut au-dessus de la tête
+                head = self.y[idx[sel]] - self.half_h[idx[sel]]
+                ceilings = obstacle_rects
+                free = np.ones(len(sel), dtype=bool)
+                if grid is not None:
+                    # Obstacles rasterisés: un rayon épais de la tête au sommet du saut; mobiles: boîtes
+                    start = head - hw[sel]
+                    top = np.minimum(start, head - arc.max_rise + hw[sel])
+                    free = grid.segment_clear(x[sel], start, x[sel], top, hw[sel])
+                    ceilings = np.array([(obs.x, obs.y, obs.width, obs.height, obs.is_solid()) for obs in grid.dynamic],
+                                        dtype=float).reshape(-1, 5)
+                bottom = ceilings[:, 1] + ceilings[:, 3]
+                overhead = (ceilings[:, 4] != 0) & \
+                    (ceilings[:, 0] < (x[sel] + hw[sel])[:, None]) & \
+                    (ceilings[:, 0] + ceilings[:, 2] > (x[sel] - hw[sel])[:, None]) & \
+                    (bottom <= head[:, None] + 1) & (bottom > head[:, None] - arc.max_rise)
+                ready[sel] = arc.reaches(rise[sel], gap[sel]) & free & ~overhead.any(axis=1)
+            step = np.where(ready, np.sign((left + right) / 2 - x), step)
+
+            # Plateforme fragile cassée: attendre sur place qu'elle se reforme
+            broken = target[:, 4] == 0
+            direction[idx] = np.where(broken, 0.0, step)
+            leap[idx] = ready & ~broken
+            steering[idx] = True
+
+        return steering, direction, leap
+
+    def _wake_on_support_change(self, obstacle_rects: np.ndarray):
+        """Réveille les dormeurs dont le support a bougé, cassé ou disparu."""
+        asleep = self.sleeping & (self.support != NO_SUPPORT)
+        if not asleep.any():
+            return
+
+        index = np.flatnonzero(asleep)
+        support = self.support[index]
+        lost = support == LOST_SUPPORT
+        rects = obstacle_rects[np.where(lost, 0, support)]
+        changed = lost | (rects[:, 0] != self.support_x[index]) | \
+            (rects[:, 1] != self.support_y[index]) | (rects[:, 4] == 0)
+
+        woken = index[changed]
+        self.sleeping[woken] = False
+        self.rest_frames[woken] = 0
+
+    def _integrate(
+        self,
+        physics: PhysicsEngine,
+        obstacle_rects: np.ndarray,
+        index: np.ndarray,
+        move: np.ndarray,
+        jump: np.ndarray,
+        amplitude: np.ndarray,
+        guided: Optional[tuple[np.ndarray, np.ndarray]] = None
+    ):
+        """
+        Intègre et résout les collisions des boules éveillées `index`.
+
+        `guided` (guidé, direction) remplace le sens aléatoire des impulsions
+        des ennemis guidés par la navigation.
+        """
+        cfg = physics.config
+        x = self.x[index]
+        y = self.y[index]
+        vx = self.vx[index]
+        vy = self.vy[index]
+        hw = self.half_w[index]
+        hh = self.half_h[index]
+        on_ground = self.on_ground[index]
+        row = self.archetype[index]
+        speed_multiplier = self.speed_multiplier[row]
+
+        # Appliquer gravité et friction au sol
+        vy += cfg.GRAVITY
+        vx = np.where(on_ground, vx * cfg.FRICTION, vx)
+
+        # Mouvement et saut aléatoires
+        max_impulse = cfg.AI_BALL_SPEED * speed_multiplier
+        impulse = -max_impulse + 2 * max_impulse * amplitude  # Comme random.uniform
+        if guided is not None:
+            steering, direction = guided
+            impulse = np.where(steering, direction * max_impulse * amplitude, impulse)
+        vx += np.where(move, impulse, 0.0)
+        vy = np.where(jump, self.jump_force[row], vy)
+
+        # Limiter la vitesse horizontale selon le type
+        max_speed = cfg.AI_BALL_SPEED * 2 * speed_multiplier
+        np.clip(vx, -max_speed, max_speed, out=vx)
+        facing = np.where(vx > 0.2, 1, np.where(vx < -0.2, -1, self.facing[index]))
+
+        # Mettre à jour position
+        x += vx
+        y += vy
+
+        x, y, vx, vy, on_ground, _ = physics.check_wall_collision_ellipse_batch(x, y, hw, hh, vx, vy)
+        x, y, vx, vy, on_ground, support = self._collide_obstacles(
+            physics, obstacle_rects, x, y, vx, vy, hw, hh, on_ground, self.support[index]
+        )
+
+        # Endormissement après quelques frames immobile au sol
+        rest_frames = np.where(
+            on_ground & (np.abs(vx) < cfg.AI_SLEEP_VELOCITY), self.rest_frames[index] + 1, 0
+        )
+        asleep = rest_frames >= cfg.AI_SLEEP_FRAMES
+        vx = np.where(asleep, 0.0, vx)
+        vy = np.where(asleep, 0.0, vy)
+
+        self.x[index] = x
+        self.y[index] = y
+        self.vx[index] = vx
+        self.vy[index] = vy
+        self.facing[index] = facing
+        self.on_ground[index] = on_ground
+        self.rest_frames[index] = rest_frames
+        self.sleeping[index] = asleep
+        self.support[index] = support
+        if len(obstacle_rects):
+            # Position du support au contact, pour détecter s'il bouge ensuite
+            anchor = obstacle_rects[np.maximum(support, 0)]
+            self.support_x[index] = anchor[:, 0]
+            self.support_y[index] = anchor[:, 1]
+
+    def _collide_obstacles(self, physics: PhysicsEngine, obstacle_rects: np.ndarray, x, y, vx, vy, hw, hh, on_ground,
+                           support):
+        """
+        Collision contre les obstacles solides.
+
+        Le dernier support de chaque boule est testé en premier (c'est le contact
+        le plus probable), puis les autres obstacles dans l'ordre du niveau.
+        Seuls les obstacles dont le rectangle touche la boîte d'une boule sont
+        résolus (en général aucun ou deux) ; la liste est recalculée après
+        chaque poussée, une boule déplacée pouvant en atteindre un suivant.
+
+        Returns:
+            (x, y, vx, vy, on_ground, support)
+        """
+        new_support = np.full(len(x), NO_SUPPORT, dtype=np.intp)
+        if not len(obstacle_rects):
+            return x, y, vx, vy, on_ground, new_support
+
+        # Support en cache d'abord (rectangle propre à chaque boule)
+        cached = support >= 0
+        if cached.any():
+            rects = obstacle_rects[np.where(cached, support, 0)]
+            cached &= rects[:, 4] != 0
+            x, y, vx, vy, _, on_top = physics.check_rect_collision_ellipse_batch(
+                x, y, hw, hh, vx, vy,
+                rects[:, 0], rects[:, 1], rects[:, 2], rects[:, 3], cached
+            )
+            on_ground = on_ground | on_top
+            new_support = np.where(on_top, support, new_support)
+
+        # Puis les autres obstacles solides touchés, dans l'ordre du niveau
+        start = 0
+        candidates = self._touching(obstacle_rects, start, x, y, hw, hh, support)
+        while len(candidates):
+            i = int(candidates[0])
+            rect_x, rect_y, rect_w, rect_h = obstacle_rects[i, :4].tolist()
+            x, y, vx, vy, hit, on_top = physics.check_rect_collision_ellipse_batch(
+                x, y, hw, hh, vx, vy, rect_x, rect_y, rect_w, rect_h, support != i
+            )
+            start = i + 1
+            if hit.any():
+                on_ground = on_ground | on_top
+                new_support = np.where(on_top, i, new_support)
+                candidates = self._touching(obstacle_rects, start, x, y, hw, hh, support)
+            else:
+                candidates = candidates[1:]
+        return x, y, vx, vy, on_ground, new_support
+
+    @staticmethod
+    def _touching(obstacle_rects: np.ndarray, start: int, x, y, hw, hh, support) -> np.ndarray:
+        """
+        Index (à partir de `start`) des obstacles solides dont le rectangle touche
+        la boîte d'au moins une boule, hors support en cache de celle-ci.
+
+        Une ellipse ne peut chevaucher un rectangle sans que sa boîte le touche :
+        les obstacles écartés n'auraient rien résolu.
+        """
+        rects = obstacle_rects[start:]
+        left, top = rects[:, 0], rects[:, 1]
+        touch = (left <= (x + hw)[:, None]) & (left + rects[:, 2] >= (x - hw)[:, None]) & \
+            (top <= (y + hh)[:, None]) & (top + rects[:, 3] >= (y - hh)[:, None]) & (rects[:, 4] != 0)
+        touch &= support[:, None] != np.arange(start, len(obstacle_rects))
+        return start + np.flatnonzero(touch.any(axis=0))
@@ -6,12 +6,29 @@ Gère la boucle de jeu, les entrées et la coordination des composants.
 
 from enum import Enum, auto
 import math
+import os
 import random
+from typing import Optional
+import numpy as np
 import pygame
 from .config import Config
 from .physics import PhysicsEngine
-from .entities import Ball, Obstacle, MovingPlatform, FragilePlatform, AIBall, Missile, EnemyBullet, HeartPickup, Door
+from .entities import Ball, Obstacle, AIBall, Missile, HeartPickup, Door
+from .broadphase import SweepAndPrune
+from .chunks import ChunkMap
+from .enemies import EnemyStore
+from .grid import ObstacleGrid
+from .sight import SightCache
+from .levelgen import LevelGenerator, LevelPool, next_base
+from .projectiles import BulletField, pattern_velocities
+from .gcpolicy import GCPolicy
+from .timers import TimerWheel
+from .systems import SystemScheduler
 from .particles import ParticleSystem
+from .events import EventQueue, ParticleConsumer, AudioConsumer, TelemetryConsumer, ScoreConsumer
+from .snapshot import WorldSnapshot
+from .statehash import StateHasher
+from .inputs import Input, read_keyboard, read_joystick
 from .renderer import Renderer
 from .audio import AudioManager, SoundType
 
@@ -29,30 +46,40 @@ class GameState(Enum):
 class GameEngine:
     """Moteur de jeu principal orchestrant tous les composants."""
 
-    def __init__(self, config: Config = None):
+    def __init__(self, config: Config = None, headless: bool = False, players: int = 1):
         self.config = config or Config()
+        self.headless = headless  # Sans affichage ni son: particules et audio coupés
+        self.player_count = players  # 2 en coopération
         self.running = False
         self.clock = None
         self.screen = None
         self.renderer = None
         self.physics = None
-        self.ball = None
+        self.ball = None  # Joueur principal (players[0])
+        self.players = []  # Boules des joueurs, dans l'ordre des masques d'entrées
         self.obstacles = []
+        self.world_version = 0  # Incrémenté quand obstacles ou porte changent (caches d'empreinte)
         self.ai_balls = []
+        self.enemy_store = None  # État vectorisé des boules IA
+        self.broadphase = SweepAndPrune()  # Paires candidates entre boules IA
         self.missiles = []
-        self.enemy_bullets = []  # Bulles tirées par les ennemis
+        self.enemy_bullets = BulletField(self.config)  # Bulles tirées par les ennemis (tableaux)
+        self.obstacle_grid = ObstacleGrid(self.config)  # Distance aux obstacles des écrans proches
+        self.sight = SightCache(self.config)  # Lignes de vue ennemi -> joueur (voir sight.py)
+        self._pending_shots = []  # Tireurs de la frame en attente de leur ligne de vue (voir _resolve_shots)
         self.heart_pickups = []  # Coeurs qui tombent
-        self.heart_spawn_timer = 0
+        self.heart_spawn_timer = None  # Prochain coeur (roue de timers)
         self.game_over_timer = 0  # Timer pour animation game over
         self.audio = None
         self.state = GameState.WELCOME
         self.selected_color_index = 0
         self.pause_menu_index = 0  # 0 = Reprendre, 1 = Menu
-        self.spawn_timer = 0
-        self.fire_cooldown = 0  # Cooldown pour tir automatique
-        self.super_cooldown = 0
-        self.super_button_was_pressed = False
+        self.timers = TimerWheel()  # Échéances en frames: cooldowns, spawns, tirs ennemis
+        self.spawn_timer = None  # Prochain spawn d'ennemi (roue de timers)
         self.joystick = None  # Manette
+        self.bot = None  # Contrôleur automatique du joueur local (voir bot.py)
+        self.horde = False  # Mode horde: arène unique, ennemis de plus en plus nombreux (Config.HORDE_*)
+        self.endless = None  # Mode sans fin: 'horizontal' ou 'vertical' (voir set_endless)
         self.enemies_defeated = 0  # Compteur d'ennemis vaincus
         self.door = None  # La porte vers le prochain niveau
         self.current_level = 1  # Niveau actuel
@@ -66,9 +93,31 @@ class GameEngine:
         self.secret_reward_claimed = False
         self.in_secret_room = False
         self._main_world_snapshot = None
+        self.gc_policy = GCPolicy(self.config)  # Collectes GC hors des phases de jeu
+        self._blocked_missiles = []  # Missiles arrêtés par un obstacle pendant la frame
+        self.events = EventQueue()  # Effets de la frame, vidés en fin de mise à jour
+        self.telemetry = TelemetryConsumer()
+        self.score_stats = ScoreConsumer()
+        self.event_consumers = [self.score_stats, self.telemetry]
+        self.world_snapshot = WorldSnapshot(self)  # Capture/restauration binaire du monde
+        self.level_generator = LevelGenerator(self.config)  # Obstacles des écrans, niveaux validés
+        # Niveaux suivants préparés à l'avance (fenêtré: processus de fond et cache disque)
+        self.level_pool = LevelPool(
+            self.level_generator,
+            worker=self.config.LEVELGEN_WORKER and not headless,
+            cache_dir=None if headless else os.path.expanduser(self.config.LEVELGEN_CACHE_DIR)
+        )
+        self.chunks = ChunkMap(self)  # Tronçons des grands niveaux: chargement et niveaux de détail
+        self.resimulating = False  # Frames rejouées après un rollback: pas d'effets cosmétiques
+        self.state_hasher = StateHasher(self)
+        self.frame_hash = 0  # Empreinte de l'état après le dernier tick (voir statehash.py)
+        self.systems = SystemScheduler()  # Systèmes de mise à jour, dans l'ordre
+        self._register_systems()
 
     def init(self):
         """Initialise Pygame et les composants du jeu."""
+        if self.headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
         pygame.init()
         pygame.display.set_caption(self.config.TITLE)
 
@@ -78,11 +127,16 @@ class GameEngine:
         self.clock = pygame.time.Clock()
         self.renderer = Renderer(self.screen, self.config)
         self.physics = PhysicsEngine(self.config)
+        self.enemy_store = EnemyStore(self.config)
         self.particles = ParticleSystem(self.config)
+        self.particles.enabled = not self.headless
         self.audio = AudioManager(
-            enabled=self.config.AUDIO_ENABLED,
+            enabled=self.config.AUDIO_ENABLED and not self.headless,
             master_volume=self.config.AUDIO_MASTER_VOLUME
         )
+        if not self.headless:
+            # Effets cosmétiques: inutiles sans écran ni son
+            self.event_consumers += [ParticleConsumer(self.particles), AudioConsumer(self.audio)]
 
         # Initialiser la manette si disponible
         pygame.joystick.init()
@@ -91,92 +145,104 @@ class GameEngine:
             self.joystick.init()
             print(f"Manette détectée: {self.joystick.get_name()}")
 
-    def _create_level(self):
-        """Crée le niveau avec la boule et les obstacles."""
-        cfg = self.config
-
-        # Position initiale de la boule (tout en haut, tombe) avec couleur et stats sélectionnées
-        selected_color = cfg.PLAYER_BALL_COLORS[self.selected_color_index]
-        max_lives, speed_mult, jump_mult = cfg.PLAYER_STATS[self.selected_color_index]
-        player_hitbox_w, player_hitbox_h = cfg.PLAYER_HITBOX_SIZES[self.selected_color_index]
-        self.ball = Ball(
-            x=cfg.PLAY_AREA_WIDTH // 2,
-            y=cfg.WALL_THICKNESS + player_hitbox_h / 2 + 5,
-            color=selected_color,
-            lives=max_lives,
-            max_lives=max_lives,
-            speed_multiplier=speed_mult,
-            jump_multiplier=jump_mult,
-            character_index=self.selected_color_index,
-            hitbox_width=player_hitbox_w,
-            hitbox_height=player_hitbox_h,
-            radius=max(player_hitbox_w, player_hitbox_h) / 2
-        )
-
-        # Générer obstacles aléatoirement
-        self.obstacles = []
+        # Geler les ressources chargées (sprites, sons) pour les collectes suivantes
+        self.gc_policy.install()
+        self.gc_policy.level_loaded()
 
-        # Toujours une plateforme en bas au centre (spawn safe)
-        self.obstacles.append(
-            Obstacle.create_platform(250, 450, 300)
-        )
+    def set_endless(self, axis: Optional[str]):
+        """
+        Active le mode sans fin sur une piste horizontale (vers la droite) ou verticale (vers le haut).
 
-        # Nombre aléatoire de plateformes statiques (3-6)
-        num_static = random.randint(3, 6)
-        for _ in range(num_static):
-            x = random.randint(cfg.WALL_THICKNESS + 50, cfg.PLAY_AREA_WIDTH - cfg.WALL_THICKNESS - 200)
-            y = random.randint(150, 400)
-            width = random.randint(80, 180)
-            self.obstacles.append(Obstacle.create_platform(x, y, width))
-
-        # Quelques plateformes fragiles (différentes visuellement et temporaires)
-        num_fragile = random.randint(1, 2)
-        for _ in range(num_fragile):
-            x = random.randint(cfg.WALL_THICKNESS + 60, cfg.PLAY_AREA_WIDTH - cfg.WALL_THICKNESS - 220)
-            y = random.randint(180, 380)
-            width = random.randint(90, 170)
-            self.obstacles.append(FragilePlatform.create(x, y, width))
-
-        # Plateformes mobiles: moitié lentes, moitié rapides
-        num_moving = random.randint(2, 4)
-        for i in range(num_moving):
-            x = random.randint(cfg.WALL_THICKNESS + 50, cfg.PLAY_AREA_WIDTH - cfg.WALL_THICKNESS - 200)
-            y = random.randint(100, 350)
-            width = random.randint(100, 160)
-            travel = random.randint(150, 300)
-            # Alterner entre lent et rapide
-            is_fast = (i % 2 == 1)
-            speed = cfg.MOVING_PLATFORM_SPEED_FAST if is_fast else cfg.MOVING_PLATFORM_SPEED_SLOW
-            self.obstacles.append(
-                MovingPlatform.create(x, y, width, travel, speed, is_fast)
+        La piste fait Config.ENDLESS_SCREENS écrans : les écrans sont générés
+        devant les joueurs et retirés derrière eux (voir chunks.py), sans
+        porte ni salle secrète. None revient aux niveaux normaux d'un écran.
+        """
+        if axis not in (None, 'horizontal', 'vertical'):
+            raise ValueError(f"Axe de piste inconnu: {axis}")
+        cfg = self.config
+        self.endless = axis
+        self.level_generator.endless = axis
+        cfg.LEVEL_WIDTH = cfg.PLAY_AREA_WIDTH * (cfg.ENDLESS_SCREENS if axis == 'horizontal' else 1)
+        cfg.LEVEL_HEIGHT = cfg.PLAY_AREA_HEIGHT * (cfg.ENDLESS_SCREENS if axis == 'vertical' else 1)
+
+    def _create_level(self, base: Optional[int] = None):
+        """
+        Crée le niveau avec la boule et les obstacles.
+
+        `base` est la graine demandée pour le niveau (tirée au hasard par
+        défaut) : le niveau suivant en dérive (voir levelgen.next_base).
+        """
+        cfg = self.config
+        generator = self.level_generator
+        spawn_x, spawn_y = generator.spawn_corner()
+
+        # Boules des joueurs (tout en haut, tombent), le partenaire de coopération
+        # à côté avec le personnage suivant
+        num_characters = len(cfg.PLAYER_BALL_COLORS)
+        self.players = [
+            self._create_player(
+                (self.selected_color_index + i) % num_characters,
+                spawn_x + cfg.PLAY_AREA_WIDTH // 2 + i * cfg.COOP_PARTNER_OFFSET,
+                spawn_y
             )
-
-        # Quelques blocs (1-3)
-        num_blocks = random.randint(1, 3)
-        for _ in range(num_blocks):
-            x = random.randint(cfg.WALL_THICKNESS + 50, cfg.PLAY_AREA_WIDTH - cfg.WALL_THICKNESS - 100)
-            y = random.randint(100, 300)
-            size = random.randint(40, 70)
-            self.obstacles.append(Obstacle.create_block(x, y, size))
-
-        # Créer les boules IA
+            for i in range(self.player_count)
+        ]
+        self.ball = self.players[0]
+
+        # Toujours une plateforme en bas au centre de l'écran de départ (spawn safe);
+        # le reste est généré écran par écran autour des joueurs (voir chunks.py)
+        self.obstacles = [generator.spawn_platform()]
+        self.world_version += 1
+        if base is None:
+            base = random.getrandbits(32)
+        if self.endless:
+            # Piste sans fin: rien à valider, les écrans sont générés en avançant
+            seed = base
+            door_x, door_y = generator.door(seed)
+            prepared = {}
+        else:
+            # Niveau validé, préparé à l'avance: les écrans du chemin vers la porte sont déjà prêts
+            layout = self.level_pool.take(base)
+            seed = layout.seed
+            door_x, door_y = layout.door_x, layout.door_y
+            prepared = {index: self.world_snapshot.restore_bodies(body)[0] for index, body in layout.screens.items()}
+        self.chunks.reset(seed, prepared)
+
+        # Créer les boules IA (en mode sans fin, elles apparaissent autour des joueurs)
         enemy_size = self.config.PLAYER_SPRITE_SIZES[self.ball.character_index]
         self.ai_balls = [
             AIBall.create_random(cfg, i, enemy_size=enemy_size)
-            for i in range(cfg.AI_BALL_COUNT)
+            for i in range(0 if self.endless else cfg.AI_BALL_COUNT)
         ]
+        for ai_ball in self.ai_balls:
+            self._arm_enemy(ai_ball)
 
-        # Créer la porte (position random en haut, initialement inactive)
-        door_x = random.randint(
-            cfg.WALL_THICKNESS + 20,
-            cfg.PLAY_AREA_WIDTH - cfg.WALL_THICKNESS - 100
-        )
-        door_y = random.randint(
-            cfg.WALL_THICKNESS + 20,
-            cfg.WALL_THICKNESS + 150  # Dans le tiers supérieur de l'écran
-        )
+        # Créer la porte (en haut, initialement inactive)
         self.door = Door(x=door_x, y=door_y)
         self._reset_secret_room()
+        self.chunks.update()  # Écrans autour du départ
+
+        # Transition de niveau: collecter maintenant et geler le nouveau niveau
+        self.gc_policy.level_loaded()
+
+    def _create_player(self, character_index: int, x: float, top: float = 0) -> Ball:
+        """Crée la boule d'un joueur avec la couleur et les stats du personnage (en haut de l'écran `top`)."""
+        cfg = self.config
+        max_lives, speed_mult, jump_mult = cfg.PLAYER_STATS[character_index]
+        player_hitbox_w, player_hitbox_h = cfg.PLAYER_HITBOX_SIZES[character_index]
+        return Ball(
+            x=x,
+            y=top + cfg.WALL_THICKNESS + player_hitbox_h / 2 + 5,
+            color=cfg.PLAYER_BALL_COLORS[character_index],
+            lives=max_lives,
+            max_lives=max_lives,
+            speed_multiplier=speed_mult,
+            jump_multiplier=jump_mult,
+            character_index=character_index,
+            hitbox_width=player_hitbox_w,
+            hitbox_height=player_hitbox_h,
+            radius=max(player_hitbox_w, player_hitbox_h) / 2
+        )
 
     def _is_pause_button(self, button: int) -> bool:
         """Supporte Start/Select (Back) selon les mappings manette."""
@@ -185,15 +251,15 @@ class GameEngine:
     def _reset_secret_room(self):
         """Initialise la salle secrète du niveau courant."""
         self.secret_side = random.choice([-1, 1])
-        self.secret_hole_y = random.randint(150, self.config.PLAY_AREA_HEIGHT - 180)
+        self.secret_hole_y = random.randint(150, self.config.LEVEL_HEIGHT - 180)
         self.secret_hole_open = False
         self.secret_reward_claimed = False
         self.in_secret_room = False
         self._main_world_snapshot = None
 
     def _is_hitting_secret_wall(self, missile: Missile) -> bool:
-        """Retourne True si un tir touche la zone de la salle secrète."""
-        if self.secret_hole_open or self.in_secret_room:
+        """Retourne True si un tir touche la zone de la salle secrète (ni en horde ni en mode sans fin)."""
+        if self.secret_hole_open or self.in_secret_room or self.horde or self.endless:
             return False
 
         hole_half = self.config.SECRET_HOLE_HALF_HEIGHT
@@ -205,29 +271,32 @@ class GameEngine:
         wall = self.config.WALL_THICKNESS
         if self.secret_side == -1:
             return missile.x <= wall + 6
-        return missile.x + missile.width >= self.config.PLAY_AREA_WIDTH - wall - 6
+        return missile.x + missile.width >= self.config.LEVEL_WIDTH - wall - 6
 
     def _is_player_on_secret_hole(self) -> bool:
-        """Retourne True si le joueur touche l'entrée secrète ouverte."""
+        """Retourne True si un joueur touche l'entrée secrète ouverte."""
         if not self.secret_hole_open or self.in_secret_room:
             return False
 
         wall = self.config.WALL_THICKNESS
         hole_half = self.config.SECRET_HOLE_HALF_HEIGHT
-        if abs(self.ball.y - self.secret_hole_y) > hole_half:
-            return False
-
-        if self.secret_side == -1:
-            return self.ball.x - self.ball.half_w <= wall + 4
-        return self.ball.x + self.ball.half_w >= self.config.PLAY_AREA_WIDTH - wall - 4
+        for ball in self.players:
+            if abs(ball.y - self.secret_hole_y) > hole_half:
+                continue
+            if self.secret_side == -1:
+                if ball.x - ball.half_w <= wall + 4:
+                    return True
+            elif ball.x + ball.half_w >= self.config.LEVEL_WIDTH - wall - 4:
+                return True
+        return False
 
     def _create_secret_room_obstacles(self) -> list[Obstacle]:
         """Crée une petite pièce fermée au centre de l'arène."""
         cfg = self.config
         room_w = 300
         room_h = 220
-        left = cfg.PLAY_AREA_WIDTH // 2 - room_w // 2
-        top = cfg.PLAY_AREA_HEIGHT // 2 - room_h // 2
+        left = cfg.LEVEL_WIDTH // 2 - room_w // 2
+        top = cfg.LEVEL_HEIGHT // 2 - room_h // 2
         thickness = 18
 
         return [
@@ -251,8 +320,6 @@ class GameEngine:
             "enemy_bullets": self.enemy_bullets,
             "heart_pickups": self.heart_pickups,
             "door_active": self.door.active if self.door else False,
-            "spawn_timer": self.spawn_timer,
-            "heart_spawn_timer": self.heart_spawn_timer,
             "enemies_defeated": self.enemies_defeated,
             "ball_x": self.ball.x,
             "ball_y": self.ball.y,
@@ -260,11 +327,12 @@ class GameEngine:
 
         self.in_secret_room = True
         self.obstacles = self._create_secret_room_obstacles()
+        self.world_version += 1
         enemy_hitbox_w, enemy_hitbox_h = self.config.PLAYER_HITBOX_SIZES[self.ball.character_index]
         enemy_sprite_w, enemy_sprite_h = self.config.PLAYER_SPRITE_SIZES[self.ball.character_index]
         self.ai_balls = [AIBall(
-            x=self.config.PLAY_AREA_WIDTH // 2,
-            y=self.config.PLAY_AREA_HEIGHT // 2 - 40,
+            x=self.config.LEVEL_WIDTH // 2,
+            y=self.config.LEVEL_HEIGHT // 2 - 40,
             hp=2,
             max_hp=2,
             color=self.config.AI_BALL_COLOR_2HP,
@@ -275,13 +343,15 @@ class GameEngine:
             sprite_width=enemy_sprite_w,
             sprite_height=enemy_sprite_h,
         )]
+        self._arm_enemy(self.ai_balls[0])
         self.missiles = []
-        self.enemy_bullets = []
+        self.enemy_bullets = BulletField(self.config)
         self.heart_pickups = []
-        self.ball.x = self.config.PLAY_AREA_WIDTH // 2
-        self.ball.y = self.config.PLAY_AREA_HEIGHT // 2 + 55
-        self.ball.vx = 0
-        self.ball.vy = 0
+        for i, ball in enumerate(self.players):
+            ball.x = self.config.LEVEL_WIDTH // 2 + i * self.config.COOP_PARTNER_OFFSET / 2
+            ball.y = self.config.LEVEL_HEIGHT // 2 + 55
+            ball.vx = 0
+            ball.vy = 0
         if self.door:
             self.door.active = False
 
@@ -292,21 +362,23 @@ class GameEngine:
 
         snapshot = self._main_world_snapshot
         self.obstacles = snapshot["obstacles"]
+        self.world_version += 1
         self.ai_balls = snapshot["ai_balls"]
         self.missiles = snapshot["missiles"]
         self.enemy_bullets = snapshot["enemy_bullets"]
         self.heart_pickups = snapshot["heart_pickups"]
-        self.spawn_timer = snapshot["spawn_timer"]
-        self.heart_spawn_timer = snapshot["heart_spawn_timer"]
         self.enemies_defeated = snapshot["enemies_defeated"]
 
-        hole_x = self.config.WALL_THICKNESS + self.ball.half_w + 8
-        if self.secret_side == 1:
-            hole_x = self.config.PLAY_AREA_WIDTH - self.config.WALL_THICKNESS - self.ball.half_w - 8
-        self.ball.x = hole_x
-        self.ball.y = self.secret_hole_y
-        self.ball.vx = 0
-        self.ball.vy = 0
+        for i, ball in enumerate(self.players):
+            # Le partenaire ressort un peu plus loin du mur
+            offset = ball.half_w + 8 + i * self.config.COOP_PARTNER_OFFSET / 2
+            hole_x = self.config.WALL_THICKNESS + offset
+            if self.secret_side == 1:
+                hole_x = self.config.LEVEL_WIDTH - self.config.WALL_THICKNESS - offset
+            ball.x = hole_x
+            ball.y = self.secret_hole_y
+            ball.vx = 0
+            ball.vy = 0
 
         if self.door:
             self.door.active = snapshot["door_active"]
@@ -336,19 +408,13 @@ class GameEngine:
                     self._handle_highscores_keydown(event.key)
                 else:  # PLAYING
                     self._handle_game_keydown(event.key)
-            elif event.type == pygame.KEYUP:
-                if self.state == GameState.PLAYING:
-                    if event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
-                        self.ball.stop_floating()
             # Gestion manette
             elif event.type == pygame.JOYBUTTONDOWN:
                 if self.state == GameState.WELCOME:
                     # N'importe quel bouton passe au menu
                     self.state = GameState.MENU
                 elif self.state == GameState.PLAYING:
-                    if event.button == 0:  # Bouton A = saut
-                        self._handle_game_keydown(pygame.K_z)
-                    elif self._is_pause_button(event.button):  # Bouton Start = pause
+                    if self._is_pause_button(event.button):  # Bouton Start = pause
                         self.state = GameState.PAUSED
                         self.pause_menu_index = 0
                 elif self.state == GameState.PAUSED:
@@ -370,10 +436,6 @@ class GameEngine:
                 elif self.state == GameState.MENU:
                     if event.button == 0:  # A = sélectionner
                         self._handle_menu_keydown(pygame.K_RETURN)
-            elif event.type == pygame.JOYBUTTONUP:
-                if self.state == GameState.PLAYING:
-                    if event.button == 1:  # Bouton B relâché = stop float
-                        self.ball.stop_floating()
             elif event.type == pygame.JOYHATMOTION:
                 if self.state == GameState.MENU:
                     if event.value[1] == 1:  # D-pad haut
@@ -455,59 +517,204 @@ class GameEngine:
         if key == pygame.K_ESCAPE:
             self.state = GameState.PAUSED  # ESC met en pause maintenant
             self.pause_menu_index = 0
-        elif key in (pygame.K_UP, pygame.K_w, pygame.K_z, pygame.K_k):
-            # Vérifier si un saut est possible et quel type
-            can_jump = self.ball.can_jump()
-            will_be_double = self.ball.is_double_jump()
-
-            # Effectuer le saut
-            is_double_jump = self.ball.jump()
-
-            # Jouer le son approprié si le saut a été effectué
-            if is_double_jump:
-                self.audio.play(SoundType.DOUBLE_JUMP)
-                self.particles.spawn_double_jump(
-                    self.ball.x, self.ball.y, self.ball.visual_radius
-                )
-            elif can_jump and not will_be_double:
-                # Saut simple effectué
-                self.audio.play(SoundType.JUMP)
         elif key == pygame.K_r:
             self._create_level()  # Reset
             self.particles.clear()
             self.missiles = []
-            self.enemy_bullets = []
+            self.enemy_bullets = BulletField(self.config)
             self.heart_pickups = []
-            self.spawn_timer = 0
-            self.heart_spawn_timer = 0
+            self._reset_spawn_timers()
             self.enemies_defeated = 0
             self.rage = 0
 
+    def seed(self, seed: Optional[int]):
+        """
+        Réinitialise les générateurs aléatoires de la simulation.
+
+        Deux moteurs initialisés avec la même graine puis alimentés avec les
+        mêmes entrées jouent exactement la même partie (netplay, replays).
+        """
+        random.seed(seed)
+        self.enemy_store.seed(seed)
+        self.particles.rng.seed(seed)
+
     def _start_game(self):
         """Démarre le jeu avec la couleur sélectionnée."""
+        self.timers.reset(0)
+        self.systems.reset()
         self._create_level()
         self.particles.clear()
+        self.events.clear()
+        self.score_stats.reset()
         self.missiles = []
-        self.enemy_bullets = []
+        self.enemy_bullets = BulletField(self.config)
         self.heart_pickups = []
-        self.spawn_timer = 0
-        self.heart_spawn_timer = 0
+        self._reset_spawn_timers()
         self.enemies_defeated = 0  # Reset le compteur
         self.rage = 0
         self.current_level = 1  # Reset le niveau
         self.state = GameState.PLAYING
 
-    def _fire_missile(self, direction: int, direction_y: int = 0):
-        """Tire un missile dans la direction donnée."""
+    def _reset_spawn_timers(self):
+        """Annule les spawns programmés (ils repartent de zéro)."""
+        self.timers.cancel(self.spawn_timer)
+        self.timers.cancel(self.heart_spawn_timer)
+        self.spawn_timer = None
+        self.heart_spawn_timer = None
+
+    def _fire_pattern(self, ai_ball: AIBall) -> dict:
+        """Motif de tir d'un ennemi (selon son type)."""
+        return self.config.FIRE_PATTERNS[self.config.ENEMY_FIRE_PATTERNS[ai_ball.enemy_type]]
+
+    def _arm_enemy(self, ai_ball: AIBall, delay: Optional[int] = None):
+        """Programme le prochain tir d'un ennemi (intervalle du motif, plus espacé en horde, ou `delay`)."""
+        if delay is None:
+            pattern = self._fire_pattern(ai_ball)
+            if ai_ball.volleys_left > 0:
+                delay = pattern['burst_interval']  # Salve suivante de la rafale
+            else:
+                low, high = self.config.HORDE_FIRE_INTERVAL if self.horde else pattern['interval']
+                delay = random.randint(low, high)
+        ai_ball.shoot_timer = self.timers.schedule_in(delay, self._enemy_shoot, ai_ball)
+
+    def _enemy_shoot(self, ai_ball: AIBall):
+        """Rappel de la roue de timers: l'ennemi tire une salve de son motif."""
+        if not any(ball is ai_ball for ball in self.ai_balls):
+            # Ennemi mis de côté pendant la salle secrète: il tirera à son retour
+            parked = self._main_world_snapshot["ai_balls"] if self._main_world_snapshot else []
+            if any(ball is ai_ball for ball in parked):
+                self._arm_enemy(ai_ball)
+            return  # Sinon l'ennemi a été détruit
+        if not self.chunks.is_near(ai_ball.x, ai_ball.y):
+            # Ennemi lointain (figé): il tirera quand un joueur approchera
+            ai_ball.volleys_left = 0
+            self._arm_enemy(ai_ball)
+            return
+
+        if ai_ball.volleys_left > 0 or not self.config.ENEMY_FIRE_NEEDS_SIGHT:
+            # Rafale en cours: la salve part sans nouvelle vérification
+            self._fire_volley(ai_ball, self._nearest_player(ai_ball))
+        else:
+            # Ligne de vue vérifiée en fin de système, avec celles des autres tireurs de la frame
+            self._pending_shots.append(ai_ball)
+
+    def _nearest_player(self, ai_ball: AIBall) -> Ball:
+        """Joueur le plus proche d'un ennemi."""
+        return min(self.players, key=lambda b: (b.x - ai_ball.x) ** 2 + (b.y - ai_ball.y) ** 2)
+
+    def _resolve_shots(self):
+        """
+        Tirs en attente de la frame: une ligne de vue par tireur, lancées en un seul lot.
+
+        Un ennemi qui ne voit pas le joueur le plus proche retient son tir et
+        réessaie après Config.SIGHT_RETRY_FRAMES frames.
+        """
+        shooters = self._pending_shots
+        self._pending_shots = []
+        targets = [self._nearest_player(ai_ball) for ai_ball in shooters]
+        visible = self.sight.visible(
+            self._static_grid(),
+            [ai_ball.x for ai_ball in shooters], [ai_ball.y for ai_ball in shooters],
+            [target.x for target in targets], [target.y for target in targets]
+        )
+        for ai_ball, target, seen in zip(shooters, targets, visible.tolist()):
+            if seen:
+                self._fire_volley(ai_ball, target)
+            else:
+                self._arm_enemy(ai_ball, self.config.SIGHT_RETRY_FRAMES)
+
+    def _fire_volley(self, ai_ball: AIBall, target: Ball):
+        """Tire une salve du motif de l'ennemi (visée sur `target` pour les motifs visés)."""
+        pattern = self._fire_pattern(ai_ball)
+        if ai_ball.volleys_left <= 0:
+            ai_ball.volleys_left = pattern.get('burst', 1)
+        ai_ball.volleys_left -= 1
+
+        aim = None
+        if pattern.get('aimed'):
+            aim = math.atan2(target.y - ai_ball.y, target.x - ai_ball.x)
+        vx, vy = pattern_velocities(pattern, ai_ball.facing_direction, aim, self.timers.now)
+        self.enemy_bullets.spawn(ai_ball.x, ai_ball.y, vx, vy)
+        self._arm_enemy(ai_ball)
+
+    def _enemy_cap(self) -> int:
+        """Nombre d'ennemis autorisés en même temps."""
+        cfg = self.config
+        if self.horde:
+            # La horde grossit par paliers depuis le début de la partie
+            ramp = self.timers.now // cfg.HORDE_RAMP_FRAMES * cfg.HORDE_RAMP_STEP
+            return min(cfg.HORDE_START_ENEMIES + ramp, cfg.HORDE_MAX_ENEMIES)
+        per_screen = min(3 + self.current_level, cfg.ENEMY_MAX_COUNT)  # 4 pour niveau 1, 5 pour niveau 2, 6 pour 3+
+        return per_screen * self.chunks.near_count()
+
+    def _can_spawn_enemy(self) -> bool:
+        """Retourne True s'il reste de la place pour un ennemi dans le niveau."""
+        return not self.in_secret_room and len(self.ai_balls) < self._enemy_cap()
+
+    def _spawn_enemy(self):
+        """Rappel de la roue de timers: fait apparaître un ennemi en haut de l'arène."""
+        if not self._can_spawn_enemy():
+            return  # Plus de place: le spawn sera reprogrammé quand il y en aura
+
+        # Spawner un nouvel ennemi en haut des écrans proches des joueurs avec HP aléatoires
+        wall = self.config.WALL_THICKNESS
+        left, top, right, _ = self.chunks.near_bounds()
+        enemy_type = random.randint(1, 3)
+        hp = self.config.ENEMY_TYPE_HP[enemy_type]
+        if enemy_type == 3:
+            color = self.config.AI_BALL_COLOR_3HP
+        elif enemy_type == 2:
+            color = self.config.AI_BALL_COLOR_2HP
+        else:
+            color = self.config.AI_BALL_COLOR_1HP
+        hitbox_w, hitbox_h = self.config.PLAYER_HITBOX_SIZES[self.ball.character_index]
+        sprite_w, sprite_h = self.config.PLAYER_SPRITE_SIZES[self.ball.character_index]
+
+        margin = hitbox_w / 2 + 10
+        new_enemy = AIBall(
+            x=random.uniform(max(left, wall) + margin, min(right, self.config.LEVEL_WIDTH - wall) - margin),
+            y=max(top, wall) + hitbox_h / 2 + 10,
+            radius=max(hitbox_w, hitbox_h) / 2,
+            hitbox_width=hitbox_w,
+            hitbox_height=hitbox_h,
+            sprite_width=sprite_w,
+            sprite_height=sprite_h,
+            vx=random.uniform(-2, 2),
+            vy=0,
+            color=color,
+            enemy_type=enemy_type,
+            hp=hp,
+            max_hp=hp
+        )
+        new_enemy.facing_direction = 1 if new_enemy.vx >= 0 else -1
+        self.ai_balls.append(new_enemy)
+        self._arm_enemy(new_enemy)
+
+    def _can_spawn_heart(self) -> bool:
+        """Retourne True si le joueur peut recevoir un coeur."""
+        return not self.in_secret_room and any(ball.lives < ball.max_lives for ball in self.players)
+
+    def _spawn_heart(self):
+        """Rappel de la roue de timers: fait tomber un coeur."""
+        if not self._can_spawn_heart():
+            return
+        wall = self.config.WALL_THICKNESS
+        left, top, right, _ = self.chunks.near_bounds()
+        heart_x = random.uniform(max(left, wall) + 50, min(right, self.config.LEVEL_WIDTH - wall) - 50)
+        self.heart_pickups.append(HeartPickup(x=heart_x, y=max(top, wall) + 20))
+
+    def _fire_missile(self, direction: int, direction_y: int = 0, ball: Optional[Ball] = None):
+        """Tire un missile dans la direction donnée (depuis le joueur principal par défaut)."""
+        ball = ball or self.ball
         # Vérifier si assez d'énergie
-        if self.ball.energy < self.config.MISSILE_ENERGY_COST:
+        if ball.energy < self.config.MISSILE_ENERGY_COST:
             return  # Pas assez d'énergie
 
         # Consommer l'énergie
-        self.ball.energy -= self.config.MISSILE_ENERGY_COST
-        self.ball.energy_usage_timer = 0  # Reset le timer
+        ball.energy -= self.config.MISSILE_ENERGY_COST
+        ball.energy_usage_timer = 0  # Reset le timer
 
-        player_w, player_h = self.config.PLAYER_SPRITE_SIZES[self.ball.character_index]
+        player_w, player_h = self.config.PLAYER_SPRITE_SIZES[ball.character_index]
         missile_w = max(8, int(player_w * 0.675))  # +125% sur l'ancienne taille (30%)
         missile_h = max(8, int(player_h * 0.675))
 
@@ -516,14 +723,14 @@ class GameEngine:
             shoot_direction = 0  # Tir vertical pur si haut/bas maintenu
 
         # Position de départ du missile (à côté de la boule)
-        offset_x = 0 if direction_y != 0 else (self.ball.half_w + missile_w / 2) * shoot_direction
+        offset_x = 0 if direction_y != 0 else (ball.half_w + missile_w / 2) * shoot_direction
         offset_y = 0
         if direction_y != 0:
-            offset_y = (self.ball.half_h + missile_h / 2) * direction_y
+            offset_y = (ball.half_h + missile_h / 2) * direction_y
 
         missile = Missile(
-            x=self.ball.x + offset_x,
-            y=self.ball.y + offset_y - missile_h / 2,
+            x=ball.x + offset_x,
+            y=ball.y + offset_y - missile_h / 2,
             width=missile_w,
             height=missile_h,
             direction=shoot_direction,
@@ -536,14 +743,15 @@ class GameEngine:
         """Augmente la rage (0 à 100)."""
         self.rage = max(0.0, min(100.0, self.rage + amount))
 
-    def _fire_storm_attack(self, direction: int, direction_y: int = 0):
-        """Tire la super attaque en consommant la rage."""
+    def _fire_storm_attack(self, direction: int, direction_y: int = 0, ball: Optional[Ball] = None):
+        """Tire la super attaque en consommant la rage (partagée entre les joueurs)."""
+        ball = ball or self.ball
         if self.rage < self.config.RAGE_SUPER_COST:
             return
 
         self.rage -= self.config.RAGE_SUPER_COST
 
-        player_w, player_h = self.config.PLAYER_SPRITE_SIZES[self.ball.character_index]
+        player_w, player_h = self.config.PLAYER_SPRITE_SIZES[ball.character_index]
         super_w = max(20, int(player_w * 0.75))
         super_h = max(20, int(player_h * 0.75))
 
@@ -552,14 +760,14 @@ class GameEngine:
             shoot_direction = 0  # Super tir vertical si haut/bas maintenu
 
         # Position de départ de l'attaque orageuse
-        offset_x = 0 if direction_y != 0 else (self.ball.half_w + super_w / 2) * shoot_direction
+        offset_x = 0 if direction_y != 0 else (ball.half_w + super_w / 2) * shoot_direction
         offset_y = 0
         if direction_y != 0:
-            offset_y = (self.ball.half_h + super_h / 2) * direction_y
+            offset_y = (ball.half_h + super_h / 2) * direction_y
 
         missile = Missile(
-            x=self.ball.x + offset_x,
-            y=self.ball.y + offset_y - super_h / 2,
+            x=ball.x + offset_x,
+            y=ball.y + offset_y - super_h / 2,
             width=super_w,
             height=super_h,
             speed=self.config.CHARGED_MISSILE_SPEED,
@@ -569,179 +777,313 @@ class GameEngine:
             charged=True
         )
         self.missiles.append(missile)
-        self.audio.play(SoundType.DOUBLE_JUMP, 1.0)
+        if not self.resimulating:
+            self.audio.play(SoundType.DOUBLE_JUMP, 1.0)
+
+    def read_input(self) -> int:
+        """Masque d'entrées du joueur local (clavier et manette, ou bot)."""
+        if self.bot is not None:
+            return self.bot.decide()
+        mask = read_keyboard(pygame.key.get_pressed())
+        if self.joystick:
+            mask |= read_joystick(self.joystick)
+        return mask
 
     def handle_input(self):
         """Gère les entrées clavier et manette continues."""
-        keys = pygame.key.get_pressed()
+        self.apply_input(0, self.read_input())
 
-        # Gestion manette
-        joy_left = False
-        joy_right = False
-        joy_up = False
-        joy_down = False
-        joy_float = False
-        joy_fire = False
-        joy_super = False
+    def apply_input(self, player: int, mask: int):
+        """
+        Applique le masque d'entrées d'une frame à un joueur.
 
-        if self.joystick:
-            # Stick analogique gauche (axe 0 = horizontal, axe 1 = vertical)
-            axis_x = self.joystick.get_axis(0)
-            axis_y = self.joystick.get_axis(1)
-            if axis_x < -0.3:  # Seuil de déclenchement
-                joy_left = True
-            elif axis_x > 0.3:
-                joy_right = True
-
-            if axis_y < -0.3:  # Stick vers le haut
-                joy_up = True
-            elif axis_y > 0.3:  # Stick vers le bas
-                joy_down = True
-
-            # D-pad (chapeau)
-            if self.joystick.get_numhats() > 0:
-                hat = self.joystick.get_hat(0)
-                if hat[0] < 0:
-                    joy_left = True
-                elif hat[0] > 0:
-                    joy_right = True
-                if hat[1] > 0:  # D-pad haut
-                    joy_up = True
-                elif hat[1] < 0:  # D-pad bas
-                    joy_down = True
-
-            # Boutons : A (0) = saut, B (1) = float, X (2) = tir
-            if self.joystick.get_button(1):  # B
-                joy_float = True
-            if self.joystick.get_button(2):  # X
-                joy_fire = True
-            if self.joystick.get_button(3):  # Y (4e touche Xbox)
-                joy_super = True
+        Le saut et la super attaque partent sur l'appui: le masque précédent
+        est gardé sur la boule pour détecter les fronts.
+        """
+        ball = self.players[player]
+        previous = ball.input_mask
+        pressed = mask & ~previous
+        ball.input_mask = mask
+
+        if pressed & Input.JUMP:
+            self._jump(ball)
 
         # Direction de visée verticale
-        if keys[pygame.K_UP] or keys[pygame.K_w] or joy_down:
-            self.ball.aim_direction_y = -1  # Viser vers le haut
-        elif keys[pygame.K_DOWN] or keys[pygame.K_s] or joy_up:
-            self.ball.aim_direction_y = 1  # Viser vers le bas
+        if mask & Input.UP:
+            ball.aim_direction_y = -1  # Viser vers le haut
+        elif mask & Input.DOWN:
+            ball.aim_direction_y = 1  # Viser vers le bas
         else:
-            self.ball.aim_direction_y = 0  # Viser horizontalement
+            ball.aim_direction_y = 0  # Viser horizontalement
 
         # Mouvement
-        if keys[pygame.K_LEFT] or keys[pygame.K_a] or joy_left:
-            self.ball.move_left()
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d] or joy_right:
-            self.ball.move_right()
-        if keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT] or joy_float:
-            self.ball.start_floating()
+        if mask & Input.LEFT:
+            ball.move_left()
+        if mask & Input.RIGHT:
+            ball.move_right()
+        if mask & Input.FLOAT:
+            ball.start_floating()
+        elif previous & Input.FLOAT:
+            ball.stop_floating()
 
         # Tir normal
-        if keys[pygame.K_SPACE] or joy_fire:
-            if self.fire_cooldown <= 0:
-                self._fire_missile(self.ball.facing_direction, self.ball.aim_direction_y)
-                self.fire_cooldown = 10
-
-        # Super attaque uniquement sur Y manette et seulement rage pleine
-        super_pressed = joy_super
-        if super_pressed and not self.super_button_was_pressed and self.super_cooldown <= 0:
+        if mask & Input.FIRE:
+            if not self.timers.pending(ball.fire_cooldown):
+                self._fire_missile(ball.facing_direction, ball.aim_direction_y, ball)
+                ball.fire_cooldown = self.timers.schedule_in(10)
+
+        # Super attaque seulement rage pleine
+        if pressed & Input.SUPER and not self.timers.pending(ball.super_cooldown):
             if self.rage >= 100:
-                self._fire_storm_attack(self.ball.facing_direction, self.ball.aim_direction_y)
-                self.super_cooldown = 20
-        self.super_button_was_pressed = super_pressed
+                self._fire_storm_attack(ball.facing_direction, ball.aim_direction_y, ball)
+                ball.super_cooldown = self.timers.schedule_in(20)
+
+    def _jump(self, ball: Ball):
+        """Fait sauter un joueur avec le son et l'effet correspondants."""
+        # Vérifier si un saut est possible et quel type
+        can_jump = ball.can_jump()
+        will_be_double = ball.is_double_jump()
+
+        # Effectuer le saut
+        is_double_jump = ball.jump()
+        if self.resimulating:
+            return
+
+        # Jouer le son approprié si le saut a été effectué
+        if is_double_jump:
+            self.audio.play(SoundType.DOUBLE_JUMP)
+            self.particles.spawn_double_jump(ball.x, ball.y, ball.visual_radius)
+        elif can_jump and not will_be_double:
+            # Saut simple effectué
+            self.audio.play(SoundType.JUMP)
+
+    def tick(self, inputs) -> int:
+        """
+        Applique les masques d'entrées de chaque joueur puis avance d'une frame.
+
+        Retourne l'empreinte de l'état obtenu (0 si Config.STATE_HASH_ENABLED
+        est désactivé).
+        """
+        if self.state == GameState.PLAYING:
+            for player, mask in enumerate(inputs):
+                self.apply_input(player, mask)
+        self.update()
+        if self.config.STATE_HASH_ENABLED:
+            self.frame_hash = self.state_hasher.update()
+        return self.frame_hash
+
+    def _register_systems(self):
+        """
+        Déclare les systèmes de mise à jour, dans leur ordre d'exécution.
+
+        Config.SYSTEM_RATES fixe la cadence d'un système (une frame sur N) et
+        Config.SYSTEMS_DISABLED ceux à ne pas exécuter. Chaque système reçoit
+        le nombre de frames à simuler: les systèmes liés au temps avancent
+        d'autant, les autres (tests d'état, collisions) l'ignorent.
+        """
+        systems = [
+            ("timers", self._update_timers),
+            ("chunks", self._update_chunks),
+            ("obstacles", self._update_obstacles),
+            ("player", self._update_player),
+            ("enemy_ai", self._update_enemy_ai),
+            ("enemy_fire", self._update_enemy_fire),
+            ("projectiles", self._update_projectiles),
+            ("collisions", self._update_collisions),
+            ("pickups", self._update_pickups),
+            ("secret_room", self._update_secret_room),
+            ("particles", self._update_particles),
+        ]
+        for name, update in systems:
+            self.systems.register(
+                name,
+                update,
+                every=self.config.SYSTEM_RATES.get(name, 1),
+                enabled=name not in self.config.SYSTEMS_DISABLED
+            )
+        if self.headless:
+            self.systems.set_enabled("particles", False)
 
     def update(self):
-        """Met à jour l'état du jeu."""
+        """Met à jour l'état du jeu (systèmes dans l'ordre déclaré)."""
         # Si game over, continuer l'animation
         if self.state == GameState.GAME_OVER:
             self.game_over_timer += 1
-            self.particles.update()  # Continuer l'animation des particules
-            return
-
-        # Décrémenter le cooldown de tir
-        if self.fire_cooldown > 0:
-            self.fire_cooldown -= 1
-
-        if self.super_cooldown > 0:
-            self.super_cooldown -= 1
-
-        # Rage max: boost vitesse + immunité collision
-        self.ball.rage_boost_active = self.rage >= 100
-
-        # Mettre à jour les obstacles (plateformes mobiles)
-        for obs in self.obstacles:
-            obs.update()
+            if self.systems["particles"].enabled and not self.resimulating:
+                self.particles.update()  # Continuer l'animation des particules
+        else:
+            self.systems.run()
+            if not self.resimulating:
+                # Écrans à venir générés à l'avance, dans le temps restant (sans effet sur la simulation)
+                self.chunks.prefetch(self.config.CHUNK_PREFETCH_BUDGET_MS)
+                self.level_pool.poll()
+        self._dispatch_events()
+
+    def snapshot(self) -> bytes:
+        """Capture l'état complet de la simulation (à appeler entre deux frames)."""
+        return self.world_snapshot.capture()
+
+    def restore(self, data: bytes):
+        """Restaure un état capturé par snapshot()."""
+        self.world_snapshot.restore(data)
+
+    def _dispatch_events(self):
+        """Vide la file d'événements de la frame dans les consommateurs."""
+        if self.resimulating:
+            # Frame rejouée: seules les statistiques (capturées dans les instantanés) suivent
+            self.score_stats.consume(self.events)
+        else:
+            for consumer in self.event_consumers:
+                consumer.consume(self.events)
+        self.events.clear()
+
+    def _update_timers(self, frames: int = 1):
+        """Système timers: rappels arrivés à échéance (tirs, spawns, réapparitions)."""
+        # Avancer la roue de timers: cooldowns, réapparitions, tirs et spawns programmés
+        self.timers.advance(frames)
+        if self._pending_shots:
+            self._resolve_shots()
+
+    def _update_chunks(self, frames: int = 1):
+        """Système tronçons: chargement autour des joueurs et niveaux de détail (voir chunks.py)."""
+        self.chunks.update()
+
+    def _update_obstacles(self, frames: int = 1):
+        """Système obstacles: plateformes mobiles et fragiles."""
+        # Mettre à jour les obstacles proches; les plateformes mobiles lointaines avancent par blocs
+        for _ in range(frames):
+            for obs in self.chunks.near_obstacles:
+                obs.update(self.timers)
+        self.chunks.advance_far_platforms(self.timers.now)
+
+    def _update_player(self, frames: int = 1) -> bool:
+        """Système joueurs: physique et mort (en coopération, la partie s'arrête au premier joueur à 0 vie)."""
+        for ball in self.players:
+            # Rage max: boost vitesse + immunité collision
+            ball.rage_boost_active = self.rage >= 100
+
+            # Mettre à jour la boule (les chocs sont ajoutés à la file d'événements)
+            for _ in range(frames):
+                ball.update(self.physics, self.chunks.near_obstacles, self.events)
+
+        for ball in self.players:
+            # Vérifier si mort (0 vie)
+            if ball.lives <= 0:
+                self.state = GameState.GAME_OVER
+                self.game_over_timer = 0
+                # Sauvegarder le score
+                self.current_score = self.enemies_defeated
+                if not self.resimulating:
+                    self._add_score(self.current_score)
+                # Son de mort et grande explosion de particules
+                self.events.life_lost(ball.x, ball.y, 1.0, fatal=True)
+                return True  # Arrêter la mise à jour
+        return False
+
+    def _update_enemy_ai(self, frames: int = 1):
+        """Système IA ennemie: spawns et mise à jour des boules IA."""
+        # Programmer le prochain spawn d'ennemi quand il y a de la place
+        if self._can_spawn_enemy() and not self.timers.pending(self.spawn_timer):
+            interval = self.config.HORDE_SPAWN_INTERVAL if self.horde else self.config.ENEMY_SPAWN_INTERVAL
+            self.spawn_timer = self.timers.schedule_in(interval, self._spawn_enemy)
+
+        # Mettre à jour les boules IA proches en une passe vectorisée (chocs entre elles compris);
+        # les lointaines restent figées. Poursuivants et fuyards suivent le graphe de navigation
+        store = self.enemy_store
+        targets = self.players if self.config.ENEMY_NAVIGATION else None
+        store.update(
+            self.chunks.near_enemies, self.physics, self.chunks.near_obstacles, targets, self._static_grid(), frames
+        )
 
-        # Mettre à jour la boule et récupérer les collisions
-        collisions = self.ball.update(self.physics, self.obstacles)
+        # Particules et sons des chocs les plus violents seulement (une foule se bouscule en permanence)
+        if len(store.contact_speed):
+            strong = np.flatnonzero(store.contact_speed >= self.config.BALL_COLLISION_MIN_SPEED)
+            if len(strong) > self.config.BALL_COLLISION_EVENTS_MAX:
+                strongest = np.argsort(-store.contact_speed[strong], kind='stable')
+                strongest = strongest[:self.config.BALL_COLLISION_EVENTS_MAX]
+                strong = np.sort(strong[strongest])
+            speed = store.contact_speed[strong]
+            self.events.ball_collisions(
+                store.contact_x[strong], store.contact_y[strong], speed / 5, np.minimum(1.0, speed / 10)
+            )
 
-        # Vérifier si mort (0 vie)
-        if self.ball.lives <= 0:
-            self.state = GameState.GAME_OVER
-            self.game_over_timer = 0
-            # Sauvegarder le score
-            self.current_score = self.enemies_defeated
-            self._add_score(self.current_score)
-            # Son de mort (réutiliser le son de perte de vie mais plus grave)
-            self.audio.play(SoundType.LIFE_LOST, 1.0)
-            # Grande explosion de particules
-            for _ in range(30):
-                angle = random.uniform(0, 2 * math.pi)
-                speed = random.uniform(2, 8)
-                self.particles.spawn_directional(
-                    self.ball.x, self.ball.y,
-                    math.cos(angle) * speed, math.sin(angle) * speed, 5.0
-                )
-            return  # Arrêter la mise à jour
-
-        # Créer des particules et jouer sons pour chaque collision
-        for x, y, dir_x, dir_y, intensity in collisions:
-            self.particles.spawn_directional(x, y, dir_x, dir_y, intensity)
-            # Son différent selon le type de collision
-            if dir_y == -1:  # Impact sur plateforme/sol
-                self.audio.play(SoundType.PLATFORM_IMPACT, min(1.0, intensity))
-            else:  # Impact sur mur
-                self.audio.play(SoundType.WALL_IMPACT, min(1.0, intensity))
-
-        # Mettre à jour les missiles et créer des trainées
+    def _static_grid(self) -> ObstacleGrid:
+        """
+        Grille de distance des obstacles proches, reconstruite si le niveau,
+        les écrans ou une fragile ont changé.
+        """
+        self.obstacle_grid.build(self.chunks.near_obstacles, self.chunks.near_bounds())
+        return self.obstacle_grid
+
+    def _update_enemy_fire(self, frames: int = 1):
+        """Système tirs ennemis: déplacement des bulles (vectorisé, voir projectiles.py)."""
+        for _ in range(frames):
+            self.enemy_bullets.update(self.chunks.near_obstacles, self.chunks.near_bounds(), self._static_grid())
+
+    def _update_projectiles(self, frames: int = 1):
+        """Système projectiles: déplacement des missiles du joueur."""
+        # Mettre à jour les missiles et créer des trainées (ceux qui quittent les écrans proches disparaissent)
+        self._blocked_missiles = []
+        left, top, right, bottom = self.chunks.near_bounds()
+        grid = self._static_grid()
         for missile in self.missiles:
             # Créer une petite trainée
-            if random.random() < 0.3:  # 30% de chance par frame
-                self.particles.spawn_missile_trail(
-                    missile.x + missile.width / 2,
-                    missile.y + missile.height / 2
-                )
-            missile.update(self.config)
+            self.events.missile_trail(
+                missile.x + missile.width / 2,
+                missile.y + missile.height / 2
+            )
+            # Trajet rectiligne: sur plusieurs frames, les tests continus couvrent tout le trajet
+            start_x, start_y = missile.x, missile.y
+            for _ in range(frames):
+                missile.update(self.config)
+            missile.prev_x, missile.prev_y = start_x, start_y
+            if missile.x + missile.width < left or missile.x > right or \
+                    missile.y + missile.height < top or missile.y > bottom:
+                missile.active = False
 
             if self._is_hitting_secret_wall(missile):
                 self.secret_hole_open = True
-                self.particles.spawn_explosion(
-                    self.config.WALL_THICKNESS if self.secret_side == -1 else self.config.PLAY_AREA_WIDTH - self.config.WALL_THICKNESS,
+                wall = self.config.WALL_THICKNESS
+                self.events.explosion(
+                    wall if self.secret_side == -1 else self.config.LEVEL_WIDTH - wall,
                     self.secret_hole_y,
-                    1.2
+                    1.2,
+                    0.7
                 )
-                self.audio.play(SoundType.BALL_COLLISION, 0.7)
 
-            # Vérifier collision avec obstacles
-            for obstacle in self.obstacles:
+            # Collision continue avec les obstacles: premier impact sur le trajet de la frame,
+            # pour que les missiles rapides ne traversent pas les plateformes fines.
+            # Loin de tout obstacle fixe (lecture de grille), seuls les mobiles sont testés
+            half_w = missile.width / 2
+            half_h = missile.height / 2
+            reach = math.hypot(
+                abs(missile.x - missile.prev_x) / 2 + half_w, abs(missile.y - missile.prev_y) / 2 + half_h
+            )
+            mid_x = (missile.x + missile.prev_x) / 2 + half_w
+            mid_y = (missile.y + missile.prev_y) / 2 + half_h
+            clear = grid.clearance(mid_x, mid_y) > reach
+            impact = None
+            for obstacle in (grid.dynamic if clear else self.chunks.near_obstacles):
                 if not obstacle.is_solid():
                     continue
-                if missile.check_obstacle_collision(obstacle):
-                    missile.active = False
-                    # Si missile chargé, créer une explosion
-                    if missile.charged:
-                        self.particles.spawn_explosion(
-                            missile.x + missile.width / 2,
-                            missile.y + missile.height / 2,
-                            2.0
-                        )
-                        self.audio.play(SoundType.BALL_COLLISION, 1.0)
-                    break
+                toi = missile.sweep_obstacle_collision(obstacle)
+                if toi is not None and (impact is None or toi < impact):
+                    impact = toi
+            if impact is not None:
+                # Le trajet s'arrête à l'impact: seuls les ennemis avant l'obstacle sont touchés
+                missile.stop_at(impact)
+                self._blocked_missiles.append(missile)
 
         # Retirer les missiles inactifs
         self.missiles = [m for m in self.missiles if m.active]
 
-        # Vérifier les collisions missile-ennemi
+    def _update_collisions(self, frames: int = 1):
+        """Système collisions: missiles, bulles, boules IA et porte."""
+        # Vérifier les collisions missile-ennemi (ennemis proches du trajet seulement)
         enemies_to_remove = []
         missiles_to_remove = []
+        if self.missiles:
+            self.broadphase.update(self.ai_balls)
         for missile in self.missiles[:]:  # Copie de la liste pour itération sûre
             if not missile.active:
                 continue
@@ -750,9 +1092,14 @@ class GameEngine:
             if missile.charged:
                 explosion_x = missile.x + missile.width / 2
                 explosion_y = missile.y + missile.height / 2
+                reach = self.config.CHARGED_MISSILE_EXPLOSION_RADIUS
+                nearby = self.broadphase.query(
+                    min(explosion_x - reach, missile.prev_x), max(explosion_x + reach, missile.prev_x + missile.width),
+                    min(explosion_y - reach, missile.prev_y), max(explosion_y + reach, missile.prev_y + missile.height)
+                )
 
                 # Le missile chargé traverse les ennemis et les détruit sans se faire détruire
-                for ai_ball in self.ai_balls[:]:
+                for ai_ball in nearby:
                     # Distance entre missile et ennemi pour explosion de zone
                     dist_x = ai_ball.x - explosion_x
                     dist_y = ai_ball.y - explosion_y
@@ -761,43 +1108,60 @@ class GameEngine:
                     if distance < self.config.CHARGED_MISSILE_EXPLOSION_RADIUS:
                         if ai_ball not in enemies_to_remove:
                             enemies_to_remove.append(ai_ball)
-                            self.particles.spawn_enemy_destruction(
-                                ai_ball.x, ai_ball.y, ai_ball.color
-                            )
+                            self.events.enemy_killed(ai_ball.x, ai_ball.y, ai_ball.color)
 
                     # Si collision directe, créer une explosion MAIS ne pas détruire le missile chargé
-                    if missile.check_collision(ai_ball.x, ai_ball.y, ai_ball.half_w, ai_ball.half_h):
+                    if missile.sweep_collision(ai_ball.x, ai_ball.y, ai_ball.half_w, ai_ball.half_h) is not None:
                         # Grande explosion mais le missile continue !
-                        self.particles.spawn_explosion(explosion_x, explosion_y, 3.0)
-                        self.audio.play(SoundType.BALL_COLLISION, 1.0)
+                        self.events.explosion(explosion_x, explosion_y, 3.0, 1.0)
             else:
-                # Missile normal - réduit les HP
-                for ai_ball in self.ai_balls[:]:
-                    if missile.check_collision(ai_ball.x, ai_ball.y, ai_ball.half_w, ai_ball.half_h):
-                        # Réduire les HP
-                        ai_ball.hp -= 1
-                        ai_ball.update_size()  # Mettre à jour la couleur selon les nouveaux HP
-
-                        if missile not in missiles_to_remove:
-                            missiles_to_remove.append(missile)
-
-                        # Si HP à 0, détruire l'ennemi
-                        if ai_ball.hp <= 0:
-                            if ai_ball not in enemies_to_remove:
-                                enemies_to_remove.append(ai_ball)
-                            # Effet de destruction avec la couleur de l'ennemi
-                            self.particles.spawn_enemy_destruction(
-                                ai_ball.x, ai_ball.y, ai_ball.color
-                            )
-                            self.audio.play(SoundType.BALL_COLLISION, 0.8)
-                        else:
-                            # Juste un petit effet de hit
-                            self.particles.spawn_directional(
-                                ai_ball.x, ai_ball.y, 0, 0, 2.0
-                            )
-                            self.audio.play(SoundType.BALL_COLLISION, 0.4)
-                        self._add_rage(self.config.RAGE_GAIN_PER_HIT)
-                        break
+                # Missile normal - réduit les HP du premier ennemi rencontré sur le trajet
+                hit_ball = None
+                hit_time = None
+                for ai_ball in self.broadphase.query(
+                    min(missile.prev_x, missile.x), max(missile.prev_x, missile.x) + missile.width,
+                    min(missile.prev_y, missile.y), max(missile.prev_y, missile.y) + missile.height
+                ):
+                    toi = missile.sweep_collision(ai_ball.x, ai_ball.y, ai_ball.half_w, ai_ball.half_h)
+                    if toi is not None and (hit_time is None or toi < hit_time):
+                        hit_ball = ai_ball
+                        hit_time = toi
+
+                if hit_ball is not None:
+                    # Réduire les HP
+                    hit_ball.hp -= 1
+                    hit_ball.update_size()  # Mettre à jour la couleur selon les nouveaux HP
+                    hit_ball.wake()
+
+                    if missile not in missiles_to_remove:
+                        missiles_to_remove.append(missile)
+
+                    # Si HP à 0, détruire l'ennemi
+                    if hit_ball.hp <= 0:
+                        if hit_ball not in enemies_to_remove:
+                            enemies_to_remove.append(hit_ball)
+                            # Effet de destruction avec la couleur de l'ennemi (une seule fois par ennemi)
+                            self.events.enemy_killed(hit_ball.x, hit_ball.y, hit_ball.color, 0.8)
+                    else:
+                        # Juste un petit effet de hit
+                        self.events.enemy_hit(hit_ball.x, hit_ball.y, 2.0, 0.4)
+                    self._add_rage(self.config.RAGE_GAIN_PER_HIT)
+
+        # Les missiles arrêtés par un obstacle disparaissent après le test des ennemis
+        for missile in self._blocked_missiles:
+            if not missile.active or missile in missiles_to_remove:
+                continue
+            missile.active = False
+            # Si missile chargé, créer une explosion au point d'impact
+            if missile.charged:
+                self.events.explosion(
+                    missile.x + missile.width / 2,
+                    missile.y + missile.height / 2,
+                    2.0,
+                    1.0
+                )
+        self._blocked_missiles = []
+        self.missiles = [m for m in self.missiles if m.active]
 
         # Retirer les ennemis et missiles touchés
         for ball in enemies_to_remove:
@@ -808,314 +1172,235 @@ class GameEngine:
             if missile in self.missiles:
                 self.missiles.remove(missile)
 
-        # Activer la porte si assez d'ennemis vaincus
-        if not self.in_secret_room and self.enemies_defeated >= self.config.ENEMIES_TO_WIN:
+        # Activer la porte si assez d'ennemis vaincus (pas de porte en horde ni en mode sans fin:
+        # la partie dure tant qu'on survit)
+        if not self.horde and not self.endless and not self.in_secret_room and \
+                self.enemies_defeated >= self.config.ENEMIES_TO_WIN:
+            if not self.door.active:
+                self.events.door_opened(self.door.x + self.door.width / 2, self.door.y + self.door.height / 2)
             self.door.active = True
 
-        # Spawn d'ennemis selon le niveau actuel
-        enemy_max_for_level = min(3 + self.current_level, 6)  # 4 pour niveau 1, 5 pour niveau 2, 6 pour 3+
-        if not self.in_secret_room and len(self.ai_balls) < enemy_max_for_level:
-            self.spawn_timer += 1
-            if self.spawn_timer >= self.config.ENEMY_SPAWN_INTERVAL:
-                self.spawn_timer = 0
-                # Spawner un nouvel ennemi en haut avec HP aléatoires
-                wall = self.config.WALL_THICKNESS
-                enemy_type = random.randint(1, 3)
-                hp = self.config.ENEMY_TYPE_HP[enemy_type]
-                if enemy_type == 3:
-                    color = self.config.AI_BALL_COLOR_3HP
-                elif enemy_type == 2:
-                    color = self.config.AI_BALL_COLOR_2HP
-                else:
-                    color = self.config.AI_BALL_COLOR_1HP
-                hitbox_w, hitbox_h = self.config.PLAYER_HITBOX_SIZES[self.ball.character_index]
-                sprite_w, sprite_h = self.config.PLAYER_SPRITE_SIZES[self.ball.character_index]
-
-                margin = hitbox_w / 2 + 10
-                new_enemy = AIBall(
-                    x=random.uniform(wall + margin, self.config.PLAY_AREA_WIDTH - wall - margin),
-                    y=wall + hitbox_h / 2 + 10,
-                    radius=max(hitbox_w, hitbox_h) / 2,
-                    hitbox_width=hitbox_w,
-                    hitbox_height=hitbox_h,
-                    sprite_width=sprite_w,
-                    sprite_height=sprite_h,
-                    vx=random.uniform(-2, 2),
-                    vy=0,
-                    color=color,
-                    enemy_type=enemy_type,
-                    hp=hp,
-                    max_hp=hp
-                )
-                new_enemy.facing_direction = 1 if new_enemy.vx >= 0 else -1
-                self.ai_balls.append(new_enemy)
-
-        # Mettre à jour les boules IA et les faire tirer
-        for ai_ball in self.ai_balls:
-            ai_ball.update(self.physics, self.obstacles)
-
-            # Timer de tir
-            ai_ball.shoot_timer += 1
-            if ai_ball.shoot_timer >= random.randint(120, 240):  # Tir toutes les 2-4 secondes
-                ai_ball.shoot_timer = 0
-                # Tirer dans la direction actuelle de l'ennemi
-                bullet_speed = 4
-                self.enemy_bullets.append(EnemyBullet(
-                    x=ai_ball.x,
-                    y=ai_ball.y,
-                    vx=bullet_speed * ai_ball.facing_direction,
-                    vy=0
-                ))
-
-        # Mettre à jour les bulles ennemies
-        for bullet in self.enemy_bullets:
-            bullet.update(self.config)
-
-            # Vérifier collision avec les obstacles (plateformes)
-            for obstacle in self.obstacles:
-                if not obstacle.is_solid():
-                    continue
-                if bullet.check_obstacle_collision(obstacle):
-                    bullet.active = False
-                    break
-
-        # Retirer les bulles inactives
-        self.enemy_bullets = [b for b in self.enemy_bullets if b.active]
-
         # Collision missiles joueur vs bulles ennemies (annulation mutuelle SAUF pour les mega tirs)
+        bullets = self.enemy_bullets
         missiles_to_remove_collision = []
-        bullets_to_remove_collision = []
-        for missile in self.missiles[:]:
+        for missile in self.missiles:
             # Les missiles chargés (mega tirs) ne sont PAS affectés par les bulles ennemies
-            if missile.charged:
-                continue  # Skip collision check for charged missiles
-
-            for bullet in self.enemy_bullets[:]:
-                # Vérifier collision missile-bulle (seulement pour missiles normaux)
-                dx = missile.x + missile.width / 2 - bullet.x
-                dy = missile.y + missile.height / 2 - bullet.y
-                distance = (dx * dx + dy * dy) ** 0.5
-
-                if distance < bullet.radius + max(missile.width, missile.height) / 2:
-                    # Collision ! Détruire les deux (missile normal et bulle)
-                    if missile not in missiles_to_remove_collision:
-                        missiles_to_remove_collision.append(missile)
-                    if bullet not in bullets_to_remove_collision:
-                        bullets_to_remove_collision.append(bullet)
-                    # Petites particules
-                    self.particles.spawn_directional(
-                        bullet.x, bullet.y, 0, 0, 1.5
-                    )
-                    self.audio.play(SoundType.BALL_COLLISION, 0.3)
-                    break
+            if missile.charged or not len(bullets):
+                continue
+            index = bullets.first_within(
+                missile.x + missile.width / 2, missile.y + missile.height / 2,
+                max(missile.width, missile.height) / 2
+            )
+            if index is not None:
+                # Collision ! Détruire les deux (missile normal et bulle)
+                missiles_to_remove_collision.append(missile)
+                self.events.projectiles_cancelled(float(bullets.x[index]), float(bullets.y[index]))
+                bullets.remove(index)
 
-        # Retirer missiles et bulles qui se sont annulés
+        # Retirer les missiles qui se sont annulés
         for missile in missiles_to_remove_collision:
             if missile in self.missiles:
                 self.missiles.remove(missile)
-        for bullet in bullets_to_remove_collision:
-            if bullet in self.enemy_bullets:
-                self.enemy_bullets.remove(bullet)
-
-        # Collision bulles ennemies avec joueur
-        bullets_to_remove = []
-        for bullet in self.enemy_bullets:
-            if bullet.check_collision(self.ball.x, self.ball.y, self.ball.half_w, self.ball.half_h):
-                if self.ball.invincible_timer <= 0 and not self.ball.rage_boost_active:
-                    # Perte d'une vie
-                    self.ball.lives -= 1
-                    self.ball.invincible_timer = 90  # 1.5 secondes d'invincibilité
-                    # Son fun de perte de vie
-                    self.audio.play(SoundType.LIFE_LOST, 0.8)
-                    # Particules
-                    self.particles.spawn_directional(
-                        self.ball.x, self.ball.y, 0, 0, 3.0
-                    )
-                bullets_to_remove.append(bullet)
 
-        for bullet in bullets_to_remove:
-            if bullet in self.enemy_bullets:
-                self.enemy_bullets.remove(bullet)
-
-        # Spawn de coeurs si < 5 vies
-        if not self.in_secret_room and self.ball.lives < self.ball.max_lives:
-            self.heart_spawn_timer += 1
-            if self.heart_spawn_timer >= 300:  # Toutes les 5 secondes
-                self.heart_spawn_timer = 0
-                wall = self.config.WALL_THICKNESS
-                heart_x = random.uniform(wall + 50, self.config.PLAY_AREA_WIDTH - wall - 50)
-                self.heart_pickups.append(HeartPickup(x=heart_x, y=wall + 20))
-
-        # Mettre à jour les coeurs
-        for heart in self.heart_pickups:
-            heart.update(self.config)
-
-        # Collision coeurs avec joueur
-        hearts_to_remove = []
-        for heart in self.heart_pickups:
-            if heart.check_collision(self.ball.x, self.ball.y, self.ball.half_w, self.ball.half_h):
-                if self.ball.lives < self.ball.max_lives:
-                    self.ball.lives += 1
-                    self.audio.play(SoundType.DOUBLE_JUMP, 0.6)  # Son joyeux
-                hearts_to_remove.append(heart)
+        # Collision bulles ennemies avec les joueurs (une bulle ne touche que le premier joueur)
+        for ball in self.players:
+            hits = bullets.sweep_hits(ball.x, ball.y, ball.half_w, ball.half_h)
+            if not len(hits):
+                continue
+            if not self.timers.pending(ball.invincible_timer) and not ball.rage_boost_active:
+                # Perte d'une vie
+                ball.lives -= 1
+                ball.invincible_timer = self.timers.schedule_in(90)  # 1.5 secondes d'invincibilité
+                # Son fun de perte de vie et particules
+                self.events.life_lost(ball.x, ball.y, 0.8)
+            bullets.remove(hits)
+
+        # Collision entre joueurs et boules IA avec détection directionnelle
+        # (les chocs entre boules IA sont résolus par EnemyStore.collide: retri incrémental)
+        self.broadphase.update(self.ai_balls)
+        enemies_to_remove_collision = []
+        for ball in self.players:
+            self._collide_player_with_enemies(ball, enemies_to_remove_collision)
 
-        for heart in hearts_to_remove:
-            if heart in self.heart_pickups:
-                self.heart_pickups.remove(heart)
+        # Retirer les ennemis tués par saut sur la tête
+        for ball in enemies_to_remove_collision:
+            if ball in self.ai_balls:
+                self.ai_balls.remove(ball)
 
-        # Retirer coeurs inactifs
-        self.heart_pickups = [h for h in self.heart_pickups if h.active]
+        # Vérifier collision avec la porte (un seul joueur suffit)
+        if any(self.door.check_collision(ball.x, ball.y, ball.half_w, ball.half_h) for ball in self.players):
+            # Passer au niveau suivant
+            self.current_level += 1
+            self._create_level(next_base(self.chunks.level_seed))
+            self.particles.clear()
+            self.missiles = []
+            self.enemy_bullets = BulletField(self.config)
+            self.heart_pickups = []
+            self.enemies_defeated = 0  # Reset le compteur pour le nouveau niveau
+            self.timers.cancel(self.spawn_timer)  # Le spawn repart de zéro
+            # Son de victoire
+            self.events.level_complete(self.ball.x, self.ball.y, self.current_level)
+
+    def _collide_player_with_enemies(self, player: Ball, enemies_to_remove: list[AIBall]):
+        """Saut sur la tête ou choc latéral entre un joueur et les boules IA proches."""
+        for ai_ball in self.broadphase.query(
+            player.x - player.half_w, player.x + player.half_w,
+            player.y - player.half_h, player.y + player.half_h
+        ):
+            # Déjà détruit ce frame (par l'autre joueur en coop): ni hit ni rage en double
+            if ai_ball in enemies_to_remove:
+                continue
 
-        # Collisions entre boules IA
-        for i, ball1 in enumerate(self.ai_balls):
-            for ball2 in self.ai_balls[i + 1:]:
-                result = self.physics.check_ellipse_collision(
-                    ball1.x, ball1.y, ball1.half_w, ball1.half_h, ball1.vx, ball1.vy, ball1.mass,
-                    ball2.x, ball2.y, ball2.half_w, ball2.half_h, ball2.vx, ball2.vy, ball2.mass
-                )
-                if result[8]:  # Collision occurred
-                    ball1.x, ball1.y, ball1.vx, ball1.vy = result[0:4]
-                    ball2.x, ball2.y, ball2.vx, ball2.vy = result[4:8]
-                    # Particules de collision
-                    mid_x = (ball1.x + ball2.x) / 2
-                    mid_y = (ball1.y + ball2.y) / 2
-                    speed = ((ball1.vx - ball2.vx) ** 2 + (ball1.vy - ball2.vy) ** 2) ** 0.5
-                    self.particles.spawn_ball_collision(mid_x, mid_y, speed / 5)
-                    # Son de collision
-                    self.audio.play(SoundType.BALL_COLLISION, min(1.0, speed / 10))
-
-        # Collision entre joueur et boules IA avec détection directionnelle
-        enemies_to_remove_collision = []
-        for ai_ball in self.ai_balls:
             # Calculer la distance avant collision
-            dx = ai_ball.x - self.ball.x
-            dy = ai_ball.y - self.ball.y
-            nx = dx / max(self.ball.half_w + ai_ball.half_w, 1e-6)
-            ny = dy / max(self.ball.half_h + ai_ball.half_h, 1e-6)
+            dx = ai_ball.x - player.x
+            dy = ai_ball.y - player.y
+            nx = dx / max(player.half_w + ai_ball.half_w, 1e-6)
+            ny = dy / max(player.half_h + ai_ball.half_h, 1e-6)
             distance_norm = nx * nx + ny * ny
 
             # Vérifier s'il y a collision
             if distance_norm < 1.0:
                 # Sauvegarder l'ancienne vitesse Y du joueur pour détecter le saut
-                old_ball_vy = self.ball.vy
+                old_ball_vy = player.vy
 
                 # Détection directionnelle: saut sur la tête si le joueur tombe (vy > 2) et vient d'en haut
                 jumping_on_head = (
                     old_ball_vy > 2 and
-                    (self.ball.y + self.ball.half_h * 0.35) < (ai_ball.y - ai_ball.half_h * 0.15)
+                    (player.y + player.half_h * 0.35) < (ai_ball.y - ai_ball.half_h * 0.15)
                 )
 
                 if jumping_on_head:
                     # Saut sur la tête: retirer 1 HP à l'ennemi
                     ai_ball.hp -= 1
                     ai_ball.update_size()
+                    ai_ball.wake()
 
                     # Faire rebondir le joueur
-                    self.ball.vy = -8  # Petit rebond
+                    player.vy = -8  # Petit rebond
 
                     # Particules de hit
-                    self.particles.spawn_directional(
-                        ai_ball.x, ai_ball.y, 0, 0, 3.0
-                    )
-                    self.audio.play(SoundType.BALL_COLLISION, 0.6)
+                    self.events.enemy_hit(ai_ball.x, ai_ball.y, 3.0, 0.6)
                     self._add_rage(self.config.RAGE_GAIN_PER_HIT)
 
                     # Si HP à 0, détruire l'ennemi
                     if ai_ball.hp <= 0:
-                        if ai_ball not in enemies_to_remove_collision:
-                            enemies_to_remove_collision.append(ai_ball)
-                            self.enemies_defeated += 1  # Incrémenter le compteur
-                        self.particles.spawn_enemy_destruction(
-                            ai_ball.x, ai_ball.y, ai_ball.color
-                        )
-                        self.audio.play(SoundType.BALL_COLLISION, 0.8)
+                        enemies_to_remove.append(ai_ball)
+                        self.enemies_defeated += 1  # Incrémenter le compteur
+                        self.events.enemy_killed(ai_ball.x, ai_ball.y, ai_ball.color, 0.8)
                 else:
                     # Collision latérale: le joueur perd une vie si pas invincible
-                    if self.ball.invincible_timer <= 0 and not self.ball.rage_boost_active:
-                        self.ball.lives -= 1
-                        self.ball.invincible_timer = 90  # 1.5 secondes d'invincibilité
-                        self.audio.play(SoundType.LIFE_LOST, 0.8)
-                        self.particles.spawn_directional(
-                            self.ball.x, self.ball.y, 0, 0, 3.0
-                        )
+                    if not self.timers.pending(player.invincible_timer) and not player.rage_boost_active:
+                        player.lives -= 1
+                        player.invincible_timer = self.timers.schedule_in(90)  # 1.5 secondes d'invincibilité
+                        self.events.life_lost(player.x, player.y, 0.8)
 
                     # Appliquer la physique normale de collision
                     result = self.physics.check_ellipse_collision(
-                        self.ball.x, self.ball.y, self.ball.half_w, self.ball.half_h,
-                        self.ball.vx, self.ball.vy, self.ball.half_w * self.ball.half_h,
+                        player.x, player.y, player.half_w, player.half_h,
+                        player.vx, player.vy, player.half_w * player.half_h,
                         ai_ball.x, ai_ball.y, ai_ball.half_w, ai_ball.half_h,
                         ai_ball.vx, ai_ball.vy, ai_ball.mass
                     )
                     if result[8]:  # Collision occurred
-                        self.ball.x, self.ball.y, self.ball.vx, self.ball.vy = result[0:4]
+                        player.x, player.y, player.vx, player.vy = result[0:4]
                         ai_ball.x, ai_ball.y, ai_ball.vx, ai_ball.vy = result[4:8]
+                        ai_ball.wake()
                         # Particules de collision
-                        mid_x = (self.ball.x + ai_ball.x) / 2
-                        mid_y = (self.ball.y + ai_ball.y) / 2
-                        speed = ((self.ball.vx - ai_ball.vx) ** 2 + (self.ball.vy - ai_ball.vy) ** 2) ** 0.5
-                        self.particles.spawn_ball_collision(mid_x, mid_y, speed / 4)
+                        mid_x = (player.x + ai_ball.x) / 2
+                        mid_y = (player.y + ai_ball.y) / 2
+                        speed = ((player.vx - ai_ball.vx) ** 2 + (player.vy - ai_ball.vy) ** 2) ** 0.5
+                        self.events.ball_collision(mid_x, mid_y, speed / 4)
+
+    def _update_pickups(self, frames: int = 1):
+        """Système bonus: coeurs."""
+        # Spawn de coeurs si < 5 vies: programmer le prochain coeur
+        if self._can_spawn_heart() and not self.timers.pending(self.heart_spawn_timer):
+            self.heart_spawn_timer = self.timers.schedule_in(300, self._spawn_heart)  # Toutes les 5 secondes
+
+        # Mettre à jour les coeurs (ceux qui tombent sous les écrans proches disparaissent)
+        bottom = self.chunks.near_bounds()[3]
+        for heart in self.heart_pickups:
+            for _ in range(frames):
+                heart.update(self.config)
+            if heart.y > bottom:
+                heart.active = False
 
-        # Retirer les ennemis tués par saut sur la tête
-        for ball in enemies_to_remove_collision:
-            if ball in self.ai_balls:
-                self.ai_balls.remove(ball)
+        # Collision coeurs avec les joueurs
+        hearts_to_remove = []
+        for heart in self.heart_pickups:
+            for ball in self.players:
+                if heart.check_collision(ball.x, ball.y, ball.half_w, ball.half_h):
+                    if ball.lives < ball.max_lives:
+                        ball.lives += 1
+                        self.events.pickup(heart.x, heart.y, 0.6)  # Son joyeux
+                    hearts_to_remove.append(heart)
+                    break
+
+        for heart in hearts_to_remove:
+            if heart in self.heart_pickups:
+                self.heart_pickups.remove(heart)
+
+        # Retirer coeurs inactifs
+        self.heart_pickups = [h for h in self.heart_pickups if h.active]
 
-        # Vérifier collision avec la porte
+    def _update_secret_room(self, frames: int = 1):
+        """Système salle secrète: entrée par le trou du mur et récompense."""
         if self._is_player_on_secret_hole():
             self._enter_secret_room()
-        elif self.door.check_collision(self.ball.x, self.ball.y, self.ball.half_w, self.ball.half_h):
-            # Passer au niveau suivant
-            self.current_level += 1
-            self._create_level()
-            self.particles.clear()
-            self.missiles = []
-            self.enemy_bullets = []
-            self.heart_pickups = []
-            self.enemies_defeated = 0  # Reset le compteur pour le nouveau niveau
-            self.spawn_timer = 0
-            # Jouer un son de victoire
-            self.audio.play(SoundType.DOUBLE_JUMP, 1.0)
 
         if self.in_secret_room and not self.ai_balls and not self.secret_reward_claimed:
             self.secret_reward_claimed = True
-            self.ball.max_lives += 1
-            self.ball.lives += 1
-            self.audio.play(SoundType.DOUBLE_JUMP, 1.0)
+            for ball in self.players:
+                ball.max_lives += 1
+                ball.lives += 1
+            self.events.pickup(self.ball.x, self.ball.y, 1.0)
             self._exit_secret_room()
 
-        # Mettre à jour les particules
-        self.particles.update()
+    def _update_particles(self, frames: int = 1):
+        """Système particules."""
+        # Mettre à jour les particules (cosmétiques: pas pendant un rollback)
+        if not self.resimulating:
+            for _ in range(frames):
+                self.particles.update()
 
     def render(self):
         """Dessine tous les éléments du jeu."""
         self.renderer.clear()
-        self.renderer.draw_walls()
-        self.renderer.draw_secret_hole(self.secret_side, self.secret_hole_y, self.secret_hole_open)
-        self.renderer.draw_door(self.door)
-        self.renderer.draw_obstacles(self.obstacles)
-        self.renderer.draw_ai_balls(self.ai_balls)
-        self.renderer.draw_enemy_bullets(self.enemy_bullets)
-        self.renderer.draw_heart_pickups(self.heart_pickups)
-        self.renderer.draw_missiles(self.missiles)
-        self.renderer.draw_particles(self.particles)
-        self.renderer.draw_ball(self.ball, False, 0.0)
+        self._follow_camera()
+        self._draw_world()
         self.renderer.draw_hud(self.ball, len(self.ai_balls), self.enemies_defeated, self.current_level, self.rage)
         pygame.display.flip()
 
+    def _follow_camera(self):
+        """Cadre la caméra sur les joueurs (milieu des deux en coopération)."""
+        players = self.players
+        self.renderer.camera.follow(
+            sum(ball.x for ball in players) / len(players),
+            sum(ball.y for ball in players) / len(players)
+        )
+
+    def _draw_world(self):
+        """Dessine le niveau vu par la caméra (entités hors de la vue écartées)."""
+        renderer = self.renderer
+        renderer.begin_world()
+        renderer.draw_walls()
+        renderer.draw_secret_hole(self.secret_side, self.secret_hole_y, self.secret_hole_open)
+        renderer.draw_door(self.door)
+        renderer.draw_obstacles(self.obstacles)
+        renderer.draw_ai_balls(self.ai_balls)
+        renderer.draw_enemy_bullets(self.enemy_bullets)
+        renderer.draw_heart_pickups(self.heart_pickups)
+        renderer.draw_missiles(self.missiles)
+        renderer.draw_particles(self.particles)
+        for ball in self.players:
+            renderer.draw_ball(ball, False, 0.0)
+        renderer.end_world()
+
     def render_pause(self):
         """Dessine le menu de pause."""
         # Dessiner le jeu en arrière-plan
         self.renderer.clear()
-        self.renderer.draw_walls()
-        self.renderer.draw_secret_hole(self.secret_side, self.secret_hole_y, self.secret_hole_open)
-        self.renderer.draw_door(self.door)
-        self.renderer.draw_obstacles(self.obstacles)
-        self.renderer.draw_ai_balls(self.ai_balls)
-        self.renderer.draw_enemy_bullets(self.enemy_bullets)
-        self.renderer.draw_heart_pickups(self.heart_pickups)
-        self.renderer.draw_missiles(self.missiles)
-        self.renderer.draw_particles(self.particles)
-        self.renderer.draw_ball(self.ball, False, 0.0)
+        self._draw_world()
         self.renderer.draw_hud(self.ball, len(self.ai_balls), self.enemies_defeated, self.current_level, self.rage)
 
         # Overlay semi-transparent
@@ -1156,10 +1441,12 @@ class GameEngine:
         self.renderer.clear()
 
         # Dessiner les éléments du jeu en arrière-plan (figés)
+        self.renderer.begin_world()
         self.renderer.draw_walls()
         self.renderer.draw_obstacles(self.obstacles)
         self.renderer.draw_ai_balls(self.ai_balls)
         self.renderer.draw_particles(self.particles)
+        self.renderer.end_world()
 
         # Afficher "GAME OVER" seulement après 2 secondes d'animation
         if self.game_over_timer >= 120:  # Après 2 secondes
@@ -1241,10 +1528,19 @@ class GameEngine:
         """Lance la boucle de jeu principale."""
         self.init()
         self.running = True
+        last_state = None
+        if self.bot is not None:
+            # Un bot n'a pas de menu à traverser: partie reproductible avec sa graine
+            self.seed(self.bot.seed)
+            self._start_game()
 
         while self.running:
             self.handle_events()
 
+            if self.state != last_state:
+                last_state = self.state
+                self.gc_policy.on_state_change(self.state == GameState.PLAYING)
+
             if self.state == GameState.WELCOME:
                 self.render_welcome()
             elif self.state == GameState.MENU:
@@ -1263,4 +1559,6 @@ class GameEngine:
 
             self.clock.tick(self.config.FPS)
 
+        self.level_pool.close()
+        self.gc_policy.uninstall()
         pygame.quit()
@@ -9,9 +9,11 @@ from dataclasses import dataclass, field
 from typing import Optional
 from .config import Config
 from .physics import PhysicsEngine
+from .events import EventQueue
+from .timers import Timer, TimerWheel
 
 
-@dataclass
+@dataclass(slots=True)
 class Ball:
     """La boule contrôlée par le joueur."""
 
@@ -34,24 +36,24 @@ class Ball:
     walk_particle_timer: int = 0  # Pour particules de marche
     lives: int = 5  # Nombre de vies
     max_lives: int = 5  # Nombre de vies maximum
-    invincible_timer: int = 0  # Timer d'invincibilité après hit
+    invincible_timer: Optional[Timer] = None  # Fin de l'invincibilité après hit (roue de timers)
     energy_usage_timer: int = 0  # Timer depuis dernière utilisation d'énergie
     speed_multiplier: float = 1.0  # Multiplicateur de vitesse (varie selon le personnage)
     jump_multiplier: float = 1.0  # Multiplicateur de force de saut (varie selon le personnage)
     aim_direction_y: int = 0  # Direction de visée verticale: -1 = haut, 0 = horizontal, 1 = bas
     rage_boost_active: bool = False
-
-    @property
-    def half_w(self) -> float:
-        return self.hitbox_width / 2
-
-    @property
-    def half_h(self) -> float:
-        return self.hitbox_height / 2
-
-    @property
-    def visual_radius(self) -> float:
-        return max(self.half_w, self.half_h)
+    input_mask: int = 0  # Entrées de la frame précédente (détection des appuis)
+    fire_cooldown: Optional[Timer] = None  # Fin du cooldown pour tir automatique (roue de timers)
+    super_cooldown: Optional[Timer] = None
+    # Dimensions dérivées de la hitbox (fixes), calculées une fois
+    half_w: float = field(init=False, repr=False)
+    half_h: float = field(init=False, repr=False)
+    visual_radius: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.half_w = self.hitbox_width / 2
+        self.half_h = self.hitbox_height / 2
+        self.visual_radius = max(self.half_w, self.half_h)
 
     def can_jump(self) -> bool:
         """Vérifie si la boule peut sauter."""
@@ -119,16 +121,16 @@ class Ball:
     def update(
         self,
         physics: PhysicsEngine,
-        obstacles: list['Obstacle']
-    ) -> list[tuple[float, float, float, float, float]]:
+        obstacles: list['Obstacle'],
+        events: EventQueue
+    ):
         """
         Met à jour la position et vélocité de la boule.
 
-        Returns:
-            Liste des collisions: [(x, y, dir_x, dir_y, intensity), ...]
+        Les chocs (murs, sol, obstacles, frottements) sont ajoutés à `events`
+        sous forme d'événements IMPACT.
         """
         cfg = physics.config
-        collisions = []
 
         # Sauvegarder la vélocité avant collision pour calculer l'intensité
         old_vx, old_vy = self.vx, self.vy
@@ -136,10 +138,6 @@ class Ball:
         # Réinitialiser l'état du mur
         self.on_wall = 0
 
-        # Décrémenter le timer d'invincibilité
-        if self.invincible_timer > 0:
-            self.invincible_timer -= 1
-
         # Incrémenter le timer d'utilisation d'énergie
         self.energy_usage_timer += 1
 
@@ -198,9 +196,9 @@ class Ball:
                 if self.x != old_x:  # Collision horizontale
                     dir_x = 1 if old_vx < 0 else -1
                     dir_y = 0
-                    collisions.append((self.x, self.y, dir_x, dir_y, speed / 5))
+                    events.impact(self.x, self.y, dir_x, dir_y, speed / 5)
                 if self.on_ground and old_vy > 2:  # Collision sol
-                    collisions.append((self.x, self.y, 0, -1, speed / 5))
+                    events.impact(self.x, self.y, 0, -1, speed / 5)
 
         # Collision avec les obstacles
         for obs in obstacles:
@@ -219,9 +217,7 @@ class Ball:
                 # Particules uniquement si chute sur obstacle (pas collision latérale)
                 if on_top and old_vy > 2:
                     speed = (old_vx ** 2 + old_vy ** 2) ** 0.5
-                    collisions.append((
-                        old_x, old_y, 0, -1, speed / 5
-                    ))
+                    events.impact(old_x, old_y, 0, -1, speed / 5)
 
                 # Si c'est une plateforme mobile et qu'on est dessus, suivre son mouvement
                 if on_top and hasattr(obs, 'min_x'):  # C'est une MovingPlatform
@@ -246,11 +242,11 @@ class Ball:
                 if self.walk_particle_timer >= 8:  # Toutes les 8 frames
                     self.walk_particle_timer = 0
                     # Petite particule de fumée derrière
-                    collisions.append((
+                    events.impact(
                         self.x - self.vx * 2,  # Derrière la boule
                         self.y + self.half_h * 0.8,  # Près du sol
                         0, -0.3, 0.3  # Très petite intensité
-                    ))
+                    )
 
         # Particules de friction contre les murs (comme au sol)
         if self.on_wall != 0 and abs(self.vy) > 1:  # Si glisse contre un mur
@@ -259,16 +255,14 @@ class Ball:
                 self.walk_particle_timer = 0
                 # Particule sur le côté du mur
                 wall_x = self.x + self.half_w * self.on_wall  # Position du mur
-                collisions.append((
+                events.impact(
                     wall_x,
                     self.y,
                     -self.on_wall, 0, 0.4  # Direction opposée au mur
-                ))
-
-        return collisions
+                )
 
 
-@dataclass
+@dataclass(slots=True)
 class Obstacle:
     """Un obstacle rectangulaire statique."""
 
@@ -278,7 +272,7 @@ class Obstacle:
     height: float
     color: tuple = field(default_factory=lambda: Config.COLOR_PLATFORM_STATIC)
 
-    def update(self):
+    def update(self, timers: Optional[TimerWheel] = None):
         """Met à jour l'obstacle (pour sous-classes)."""
         pass
 
@@ -301,25 +295,25 @@ class Obstacle:
         return cls(x=x, y=y, width=size, height=size)
 
 
-@dataclass
+@dataclass(slots=True)
 class FragilePlatform(Obstacle):
     """Plateforme fragile qui casse temporairement au contact du joueur."""
 
     break_delay: int = Config.FRAGILE_PLATFORM_BREAK_DELAY
     respawn_time: int = Config.FRAGILE_PLATFORM_RESPAWN_TIME
-    step_timer: int = 0
+    step_timer: int = 0  # Frames consécutives avec le joueur dessus
     broken: bool = False
-    respawn_timer: int = 0
+    respawn_timer: Optional[Timer] = None  # Réapparition programmée (roue de timers)
     stepped_this_frame: bool = False
 
-    def update(self):
-        """Met à jour la casse et la réapparition de la plateforme."""
+    def update(self, timers: Optional[TimerWheel] = None):
+        """
+        Met à jour la casse de la plateforme.
+
+        La réapparition est programmée dans `timers` au moment de la casse :
+        une plateforme cassée ne coûte plus rien jusqu'à son retour.
+        """
         if self.broken:
-            self.respawn_timer += 1
-            if self.respawn_timer >= self.respawn_time:
-                self.broken = False
-                self.respawn_timer = 0
-                self.step_timer = 0
             self.stepped_this_frame = False
             return
 
@@ -330,11 +324,17 @@ class FragilePlatform(Obstacle):
 
         if self.step_timer >= self.break_delay:
             self.broken = True
-            self.respawn_timer = 0
             self.step_timer = 0
+            self.respawn_timer = timers.schedule_in(self.respawn_time, self.respawn)
 
         self.stepped_this_frame = False
 
+    def respawn(self):
+        """Rappel de la roue de timers: la plateforme réapparaît."""
+        self.broken = False
+        self.step_timer = 0
+        self.respawn_timer = None
+
     def is_solid(self) -> bool:
         """La plateforme ne collabore pas aux collisions quand elle est cassée."""
         return not self.broken
@@ -356,7 +356,7 @@ class FragilePlatform(Obstacle):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class AIBall:
     """Une boule contrôlée par l'IA."""
 
@@ -374,94 +374,58 @@ class AIBall:
     hp: int = 1  # Points de vie
     max_hp: int = 1  # HP initiaux (pour déterminer la taille)
     on_ground: bool = False
-    shoot_timer: int = 0  # Timer pour tirer
+    shoot_timer: Optional[Timer] = None  # Prochain tir programmé (roue de timers)
+    volleys_left: int = 0  # Salves restantes de la rafale en cours (motifs en rafale)
     facing_direction: int = 1  # 1 = droite, -1 = gauche
+    sleeping: bool = False  # Au repos: intégration et collisions sautées
+    rest_frames: int = 0  # Frames consécutives au repos
+    support: Optional['Obstacle'] = None  # Dernier obstacle sous la boule (cache de contact)
+    support_x: float = 0.0  # Position du support au moment du contact
+    support_y: float = 0.0
+    # Dimensions et masse dérivées de la hitbox (fixes), calculées une fois
+    half_w: float = field(init=False, repr=False)
+    half_h: float = field(init=False, repr=False)
+    mass: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.half_w = self.hitbox_width / 2
+        self.half_h = self.hitbox_height / 2
+        self.mass = self.half_w * self.half_h  # Masse proportionnelle à la taille
+
+    def wake(self):
+        """Sort la boule du sommeil (touchée, poussée ou support modifié)."""
+        self.sleeping = False
+        self.rest_frames = 0
 
     def update_size(self):
         """Conserve une taille fixe: les ennemis ne changent plus de taille avec les HP."""
         return
 
-    @property
-    def half_w(self) -> float:
-        return self.hitbox_width / 2
-
-    @property
-    def half_h(self) -> float:
-        return self.hitbox_height / 2
-
-    @property
-    def mass(self) -> float:
-        """Masse proportionnelle au rayon."""
-        return self.half_w * self.half_h
-
-    def update(self, physics: PhysicsEngine, obstacles: list['Obstacle']):
-        """Met à jour la boule IA avec comportement variant selon la couleur/HP."""
-        cfg = physics.config
-
-        # Appliquer gravité
-        self.vy += cfg.GRAVITY
-
-        # Appliquer friction au sol
-        if self.on_ground:
-            self.vx *= cfg.FRICTION
+    @staticmethod
+    def behavior_for(max_hp: int, config: Config) -> tuple[float, float, float, float]:
+        """
+        Paramètres de comportement d'un archétype d'ennemi.
 
+        Returns:
+            (movement_chance, jump_chance, speed_multiplier, jump_force)
+        """
         # Comportements différents selon max_hp (déterminé par la couleur initiale)
-        if self.max_hp == 1:  # Bleu - Rapide, saute souvent et haut
+        if max_hp == 1:  # Bleu - Rapide, saute souvent et haut
             movement_chance = 0.04  # 4% de chance (2x plus actif)
             jump_chance = 0.025  # 2.5% de chance (2.5x plus de sauts)
             speed_multiplier = 1.5  # 50% plus rapide
-            jump_force = cfg.JUMP_FORCE * 0.85  # Sauts plus hauts
-        elif self.max_hp == 2:  # Violet - Moyennement rapide, saute moyennement
+            jump_force = config.JUMP_FORCE * 0.85  # Sauts plus hauts
+        elif max_hp == 2:  # Violet - Moyennement rapide, saute moyennement
             movement_chance = 0.025  # 2.5% de chance
             jump_chance = 0.015  # 1.5% de chance
             speed_multiplier = 1.0  # Vitesse normale
-            jump_force = cfg.JUMP_FORCE * 0.7  # Sauts moyens
+            jump_force = config.JUMP_FORCE * 0.7  # Sauts moyens
         else:  # Rouge (3 HP) - Lent, saute peu et bas
             movement_chance = 0.015  # 1.5% de chance (moins actif)
             jump_chance = 0.008  # 0.8% de chance (peu de sauts)
             speed_multiplier = 0.6  # 40% plus lent
-            jump_force = cfg.JUMP_FORCE * 0.5  # Sauts bas
-
-        # Mouvement aléatoire occasionnel
-        if random.random() < movement_chance:
-            self.vx += random.uniform(-cfg.AI_BALL_SPEED * speed_multiplier,
-                                     cfg.AI_BALL_SPEED * speed_multiplier)
-
-        # Saut aléatoire si au sol
-        if self.on_ground and random.random() < jump_chance:
-            self.vy = jump_force
-
-        # Limiter la vitesse horizontale selon le type
-        max_speed = cfg.AI_BALL_SPEED * 2 * speed_multiplier
-        self.vx = max(-max_speed, min(max_speed, self.vx))
-        if self.vx > 0.2:
-            self.facing_direction = 1
-        elif self.vx < -0.2:
-            self.facing_direction = -1
-
-        # Mettre à jour position
-        self.x += self.vx
-        self.y += self.vy
-
-        # Collision avec les murs
-        self.x, self.y, self.vx, self.vy, self.on_ground, _ = \
-            physics.check_wall_collision_ellipse(
-                self.x, self.y, self.half_w, self.half_h, self.vx, self.vy
-            )
-
-        # Collision avec les obstacles
-        for obs in obstacles:
-            if not obs.is_solid():
-                continue
-
-            self.x, self.y, self.vx, self.vy, hit, on_top = \
-                physics.check_rect_collision_ellipse(
-                    self.x, self.y, self.half_w, self.half_h,
-                    self.vx, self.vy,
-                    obs.x, obs.y, obs.width, obs.height
-                )
-            if on_top:
-                self.on_ground = True
+            jump_force = config.JUMP_FORCE * 0.5  # Sauts bas
+        return movement_chance, jump_chance, speed_multiplier, jump_force
 
     @classmethod
     def create_random(
@@ -487,8 +451,8 @@ class AIBall:
 
         initial_vx = random.uniform(-2, 2)
         return cls(
-            x=random.uniform(wall + hitbox_w / 2 + 10, config.PLAY_AREA_WIDTH - wall - hitbox_w / 2 - 10),
-            y=random.uniform(wall + hitbox_h / 2 + 10, config.PLAY_AREA_HEIGHT // 2),
+            x=random.uniform(wall + hitbox_w / 2 + 10, config.LEVEL_WIDTH - wall - hitbox_w / 2 - 10),
+            y=random.uniform(wall + hitbox_h / 2 + 10, config.LEVEL_HEIGHT // 2),
             radius=max(hitbox_w, hitbox_h) / 2,
             hitbox_width=hitbox_w,
             hitbox_height=hitbox_h,
@@ -504,50 +468,7 @@ class AIBall:
         )
 
 
-@dataclass
-class EnemyBullet:
-    """Une bulle tirée par un ennemi."""
-
-    x: float
-    y: float
-    radius: float = 6
-    vx: float = 0.0
-    vy: float = 0.0
-    color: tuple = (150, 200, 255)
-    active: bool = True
-
-    def update(self, config: Config):
-        """Met à jour la position de la bulle."""
-        self.x += self.vx
-        self.y += self.vy
-
-        # Désactiver si hors écran
-        wall = config.WALL_THICKNESS
-        if (self.x < wall - self.radius or self.x > config.PLAY_AREA_WIDTH - wall + self.radius or
-            self.y < wall - self.radius or self.y > config.PLAY_AREA_HEIGHT - wall + self.radius):
-            self.active = False
-
-    def check_collision(self, ball_x: float, ball_y: float, half_w: float, half_h: float) -> bool:
-        """Vérifie la collision avec une hitbox elliptique."""
-        ndx = (self.x - ball_x) / max(half_w + self.radius, 1e-6)
-        ndy = (self.y - ball_y) / max(half_h + self.radius, 1e-6)
-        return ndx * ndx + ndy * ndy < 1.0
-
-    def check_obstacle_collision(self, obstacle) -> bool:
-        """Vérifie la collision avec un obstacle (plateforme)."""
-        # Point le plus proche du rectangle au centre de la bulle
-        closest_x = max(obstacle.x, min(self.x, obstacle.x + obstacle.width))
-        closest_y = max(obstacle.y, min(self.y, obstacle.y + obstacle.height))
-
-        # Distance entre le point le plus proche et le centre de la bulle
-        distance_x = self.x - closest_x
-        distance_y = self.y - closest_y
-        distance_squared = distance_x * distance_x + distance_y * distance_y
-
-        return distance_squared < (self.radius * self.radius)
-
-
-@dataclass
+@dataclass(slots=True)
 class HeartPickup:
     """Un coeur qui tombe du haut pour regagner une vie."""
 
@@ -561,8 +482,8 @@ class HeartPickup:
         """Met à jour la position du coeur."""
         self.y += self.vy
 
-        # Désactiver si hors écran
-        if self.y > config.PLAY_AREA_HEIGHT:
+        # Désactiver si sorti du niveau
+        if self.y > config.LEVEL_HEIGHT:
             self.active = False
 
     def check_collision(self, ball_x: float, ball_y: float, half_w: float, half_h: float) -> bool:
@@ -572,7 +493,7 @@ class HeartPickup:
         return ndx * ndx + ndy * ndy < 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Missile:
     """Un missile tiré par le joueur."""
 
@@ -586,9 +507,13 @@ class Missile:
     color: tuple = field(default_factory=lambda: Config.MISSILE_COLOR)
     active: bool = True
     charged: bool = False  # Missile chargé ou non
+    prev_x: float = 0.0  # Position au début de la frame (collision continue)
+    prev_y: float = 0.0
 
     def update(self, config: Config):
         """Met à jour la position du missile."""
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += self.speed * self.direction
         if self.direction_y != 0:
             self.y += self.speed * self.direction_y
@@ -596,15 +521,15 @@ class Missile:
         # Les missiles chargés traversent les murs, les normaux non
         if not self.charged:
             wall = config.WALL_THICKNESS
-            if self.x < wall or self.x > config.PLAY_AREA_WIDTH - wall:
+            if self.x < wall or self.x > config.LEVEL_WIDTH - wall:
                 self.active = False
-            if self.y < wall or self.y > config.PLAY_AREA_HEIGHT - wall:
+            if self.y < wall or self.y > config.LEVEL_HEIGHT - wall:
                 self.active = False
         else:
-            # Désactiver le missile chargé seulement s'il sort complètement de l'écran
-            if self.x + self.width < 0 or self.x > config.PLAY_AREA_WIDTH:
+            # Désactiver le missile chargé seulement s'il sort complètement du niveau
+            if self.x + self.width < 0 or self.x > config.LEVEL_WIDTH:
                 self.active = False
-            if self.y + self.height < 0 or self.y > config.PLAY_AREA_HEIGHT:
+            if self.y + self.height < 0 or self.y > config.LEVEL_HEIGHT:
                 self.active = False
 
     def check_collision(self, ball_x: float, ball_y: float, half_w: float, half_h: float) -> bool:
@@ -623,8 +548,37 @@ class Missile:
                 self.y < obstacle.y + obstacle.height and
                 self.y + self.height > obstacle.y)
 
+    def sweep_collision(self, ball_x: float, ball_y: float, half_w: float, half_h: float) -> Optional[float]:
+        """
+        Temps d'impact du trajet de la frame contre une ellipse (None si aucun).
+
+        Le centre du missile est lancé contre l'ellipse élargie de sa demi-taille ;
+        le test discret en fin de trajet couvre les contacts par les coins.
+        """
+        toi = PhysicsEngine.sweep_ellipse(
+            self.prev_x + self.width / 2, self.prev_y + self.height / 2,
+            self.x - self.prev_x, self.y - self.prev_y,
+            ball_x, ball_y, half_w + self.width / 2, half_h + self.height / 2
+        )
+        if toi is None and self.check_collision(ball_x, ball_y, half_w, half_h):
+            toi = 1.0
+        return toi
+
+    def sweep_obstacle_collision(self, obstacle) -> Optional[float]:
+        """Temps d'impact du trajet de la frame contre un obstacle (None si aucun)."""
+        return PhysicsEngine.sweep_rect(
+            self.prev_x, self.prev_y, self.width, self.height,
+            self.x - self.prev_x, self.y - self.prev_y,
+            obstacle.x, obstacle.y, obstacle.width, obstacle.height
+        )
 
-@dataclass
+    def stop_at(self, toi: float):
+        """Ramène le missile au point d'impact (fraction `toi` du trajet de la frame)."""
+        self.x = self.prev_x + (self.x - self.prev_x) * toi
+        self.y = self.prev_y + (self.y - self.prev_y) * toi
+
+
+@dataclass(slots=True)
 class MovingPlatform(Obstacle):
     """Une plateforme qui se déplace horizontalement."""
 
@@ -634,7 +588,7 @@ class MovingPlatform(Obstacle):
     direction: int = 1  # 1 = droite, -1 = gauche
     color: tuple = field(default_factory=lambda: Config.COLOR_PLATFORM_SLOW)
 
-    def update(self):
+    def update(self, timers: Optional[TimerWheel] = None):
         """Déplace la plateforme."""
         self.x += self.speed * self.direction
 
@@ -646,6 +600,27 @@ class MovingPlatform(Obstacle):
             self.x = self.max_x - self.width
             self.direction = -1
 
+    def advance(self, frames: int):
+        """
+        Avance la plateforme de `frames` frames d'un coup (tronçons lointains, voir chunks.py).
+
+        L'aller-retour à vitesse constante entre min_x et max_x se déduit de
+        sa phase, sans simuler chaque frame (à l'arrondi des demi-tours près).
+        """
+        span = self.max_x - self.width - self.min_x
+        if span <= 0 or frames <= 0:
+            return
+        # Phase: distance parcourue depuis min_x sur un aller-retour complet
+        offset = self.x - self.min_x
+        phase = offset if self.direction > 0 else 2 * span - offset
+        phase = (phase + self.speed * frames) % (2 * span)
+        if phase < span:
+            self.x = self.min_x + phase
+            self.direction = 1
+        else:
+            self.x = self.min_x + 2 * span - phase
+            self.direction = -1
+
     @classmethod
     def create(
         cls,
@@ -681,7 +656,7 @@ class MovingPlatform(Obstacle):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Door:
     """Une porte qui apparaît quand on a vaincu assez d'ennemis."""
 
@@ -0,0 +1,277 @@
+"""
+Environnement d'apprentissage par renforcement (API style Gym).
+
+GameEnv pilote le moteur headless : reset(seed) démarre une partie,
+step(action) applique un masque d'entrées (voir inputs.py) pendant une frame
+et retourne (observation, récompense, terminé, infos).
+
+L'observation est un unique tableau float32 préalloué, découpé en vues
+nommées (joueur, ennemis proches, bulles proches, plateformes, niveau).
+step() le réécrit en place : aucun tableau n'est recréé d'une frame à
+l'autre, il faut copier l'observation pour la garder.
+
+Avec pixels=True, l'observation est à la place l'image basse résolution de
+ObservationRenderer (vue NumPy (largeur, hauteur, 3) de sa surface).
+
+Exemple:
+    env = GameEnv()
+    obs = env.reset(seed=42)
+    obs, reward, done, info = env.step(Input.RIGHT | Input.FIRE)
+"""
+
+from typing import Optional
+import numpy as np
+from .config import Config
+from .engine import GameEngine, GameState
+from .entities import FragilePlatform, MovingPlatform
+from .obs_renderer import ObservationRenderer
+
+# Colonnes de chaque bloc de l'observation (positions relatives au joueur)
+PLAYER_FEATURES = ('x', 'y', 'vx', 'vy', 'on_ground', 'jumps', 'energy', 'lives',
+                   'facing', 'rage', 'invincible', 'can_fire')
+ENEMY_FEATURES = ('present', 'dx', 'dy', 'vx', 'vy', 'hp', 'max_hp')
+BULLET_FEATURES = ('present', 'dx', 'dy', 'vx', 'vy')
+PLATFORM_FEATURES = ('present', 'x', 'y', 'width', 'height', 'kind')
+LEVEL_FEATURES = ('door_active', 'door_dx', 'door_dy', 'progress', 'heart_dx', 'heart_dy', 'heart_present')
+
+# Types de plateforme (colonne 'kind')
+PLATFORM_STATIC = 1.0
+PLATFORM_MOVING = 2.0
+PLATFORM_FRAGILE = 3.0
+
+SPEED_SCALE = 20.0  # Vitesses divisées par cette valeur (ordre de grandeur de MAX_SPEED_RAGE)
+
+
+class GameEnv:
+    """Partie solo headless exposée comme un environnement Gym."""
+
+    def __init__(self, config: Config = None, character: int = 0, pixels: bool = False):
+        self.config = config or Config()
+        self.character = character
+        self.engine = GameEngine(self.config, headless=True)
+        self.engine.init()
+        self.pixel_renderer = ObservationRenderer(self.config) if pixels else None
+
+        config = self.config
+        self.max_enemies = config.ENV_MAX_ENEMIES
+        self.max_bullets = config.ENV_MAX_BULLETS
+        self.max_platforms = config.ENV_MAX_PLATFORMS
+        self.max_steps = config.ENV_MAX_STEPS
+        self.scale_x = 1.0 / config.LEVEL_WIDTH
+        self.scale_y = 1.0 / config.LEVEL_HEIGHT
+
+        # Buffer unique et vues par bloc
+        sizes = [
+            len(PLAYER_FEATURES),
+            self.max_enemies * len(ENEMY_FEATURES),
+            self.max_bullets * len(BULLET_FEATURES),
+            self.max_platforms * len(PLATFORM_FEATURES),
+            len(LEVEL_FEATURES),
+        ]
+        self.observation = np.zeros(sum(sizes), dtype=np.float32)
+        offsets = np.cumsum([0] + sizes)
+        obs = self.observation
+        self.player_obs = obs[offsets[0]:offsets[1]]
+        self.enemy_obs = obs[offsets[1]:offsets[2]].reshape(self.max_enemies, len(ENEMY_FEATURES))
+        self.bullet_obs = obs[offsets[2]:offsets[3]].reshape(self.max_bullets, len(BULLET_FEATURES))
+        self.platform_obs = obs[offsets[3]:offsets[4]].reshape(self.max_platforms, len(PLATFORM_FEATURES))
+        self.level_obs = obs[offsets[4]:offsets[5]]
+
+        # Tampons de tri des entités (agrandis seulement si la scène dépasse leur capacité)
+        self._enemy_rows = np.zeros((0, len(ENEMY_FEATURES)), dtype=np.float32)
+        self._bullet_rows = np.zeros((0, len(BULLET_FEATURES)), dtype=np.float32)
+        self._distances = np.zeros(0)
+        self._platforms_key = None  # Version du monde dont la géométrie est déjà écrite
+        self._moving_platforms: list[tuple[int, MovingPlatform]] = []
+
+        self.steps = 0
+        self._kills = 0
+        self._lives = 0
+        self._level = 1
+        self.info = {'kills': 0, 'lives': 0, 'level': 1, 'steps': 0, 'truncated': False, 'frame_hash': 0}
+
+    @property
+    def observation_size(self) -> int:
+        return self.observation.size
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        """Démarre une nouvelle partie et retourne la première observation."""
+        engine = self.engine
+        engine.selected_color_index = self.character
+        engine.seed(seed)
+        engine._start_game()
+        self.steps = 0
+        self._kills = engine.score_stats.total_kills
+        self._lives = engine.ball.lives
+        self._level = engine.current_level
+        self._platforms_key = None
+        self.info['truncated'] = False
+        return self._observe()
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, dict]:
+        """Joue une frame avec le masque d'entrées `action`."""
+        engine = self.engine
+        frame_hash = engine.tick((action,))
+        self.steps += 1
+
+        # Récompense: ennemis vaincus, niveaux franchis, vies perdues ou regagnées
+        config = self.config
+        kills = engine.score_stats.total_kills
+        lives = engine.ball.lives
+        level = engine.current_level
+        reward = (
+            (kills - self._kills) * config.ENV_REWARD_KILL
+            + (level - self._level) * config.ENV_REWARD_LEVEL
+            + (lives - self._lives) * config.ENV_REWARD_LIFE
+        )
+        self._kills, self._lives, self._level = kills, lives, level
+
+        truncated = self.steps >= self.max_steps
+        done = engine.state != GameState.PLAYING or truncated
+        info = self.info
+        info['kills'] = kills
+        info['lives'] = lives
+        info['level'] = level
+        info['steps'] = self.steps
+        info['truncated'] = truncated
+        info['frame_hash'] = frame_hash
+
+        return self._observe(), reward, done, info
+
+    # --- Observation ---
+
+    def _observe(self) -> np.ndarray:
+        if self.pixel_renderer is not None:
+            return self.pixel_renderer.render(self.engine)
+
+        engine = self.engine
+        ball = engine.ball
+        sx = self.scale_x
+        sy = self.scale_y
+        px = ball.x
+        py = ball.y
+
+        player = self.player_obs
+        player[0] = px * sx
+        player[1] = py * sy
+        player[2] = ball.vx / SPEED_SCALE
+        player[3] = ball.vy / SPEED_SCALE
+        player[4] = ball.on_ground
+        player[5] = ball.jumps_remaining
+        player[6] = ball.energy / self.config.MAX_ENERGY
+        player[7] = ball.lives
+        player[8] = ball.facing_direction
+        player[9] = engine.rage / 100
+        player[10] = engine.timers.pending(ball.invincible_timer)
+        player[11] = not engine.timers.pending(ball.fire_cooldown)
+
+        self._observe_enemies(engine.ai_balls, px, py)
+        self._observe_bullets(engine.enemy_bullets, px, py)
+        self._observe_platforms(engine.obstacles, engine.world_version)
+
+        level = self.level_obs
+        door = engine.door
+        if door is not None:
+            level[0] = door.active
+            level[1] = (door.x - px) * sx
+            level[2] = (door.y - py) * sy
+        else:
+            level[0:3] = 0.0
+        level[3] = engine.enemies_defeated / self.config.ENEMIES_TO_WIN
+        heart = None
+        best = 0.0
+        for h in engine.heart_pickups:
+            distance = (h.x - px) ** 2 + (h.y - py) ** 2
+            if h.active and (heart is None or distance < best):
+                heart = h
+                best = distance
+        if heart is not None:
+            level[4] = (heart.x - px) * sx
+            level[5] = (heart.y - py) * sy
+            level[6] = 1.0
+        else:
+            level[4:7] = 0.0
+        return self.observation
+
+    def _nearest(self, rows: np.ndarray, count: int, out: np.ndarray):
+        """Copie dans `out` les `count` premières lignes triées par distance croissante."""
+        kept = min(count, len(out))
+        if count:
+            order = np.argsort(self._distances[:count], kind='stable')[:kept]
+            np.take(rows[:count], order, axis=0, out=out[:kept])
+        out[kept:] = 0.0
+
+    def _ensure_capacity(self, count: int):
+        if count > len(self._distances):
+            capacity = max(count, 2 * len(self._distances), 16)
+            self._distances = np.zeros(capacity)
+            self._enemy_rows = np.zeros((capacity, len(ENEMY_FEATURES)), dtype=np.float32)
+            self._bullet_rows = np.zeros((capacity, len(BULLET_FEATURES)), dtype=np.float32)
+
+    def _observe_enemies(self, ai_balls: list, px: float, py: float):
+        count = len(ai_balls)
+        self._ensure_capacity(count)
+        rows = self._enemy_rows
+        distances = self._distances
+        sx = self.scale_x
+        sy = self.scale_y
+        for i, enemy in enumerate(ai_balls):
+            dx = enemy.x - px
+            dy = enemy.y - py
+            distances[i] = dx * dx + dy * dy
+            row = rows[i]
+            row[0] = 1.0
+            row[1] = dx * sx
+            row[2] = dy * sy
+            row[3] = enemy.vx / SPEED_SCALE
+            row[4] = enemy.vy / SPEED_SCALE
+            row[5] = enemy.hp
+            row[6] = enemy.max_hp
+        self._nearest(rows, count, self.enemy_obs)
+
+    def _observe_bullets(self, bullets, px: float, py: float):
+        count = len(bullets)
+        self._ensure_capacity(count)
+        rows = self._bullet_rows[:count]
+        dx = bullets.x - px
+        dy = bullets.y - py
+        np.multiply(dx, dx, out=self._distances[:count])
+        self._distances[:count] += dy * dy
+        rows[:, 0] = 1.0
+        rows[:, 1] = dx * self.scale_x
+        rows[:, 2] = dy * self.scale_y
+        rows[:, 3] = bullets.vx / SPEED_SCALE
+        rows[:, 4] = bullets.vy / SPEED_SCALE
+        self._nearest(self._bullet_rows, count, self.bullet_obs)
+
+    def _observe_platforms(self, obstacles: list, world_version: int):
+        """Géométrie des plateformes: écrite au changement de niveau, puis seules les mobiles bougent."""
+        out = self.platform_obs
+        sx = self.scale_x
+        key = world_version
+        if key != self._platforms_key:
+            self._platforms_key = key
+            self._moving_platforms = []
+            out[:] = 0.0
+            for i, obs in enumerate(obstacles[:len(out)]):
+                if isinstance(obs, MovingPlatform):
+                    kind = PLATFORM_MOVING
+                    self._moving_platforms.append((i, obs))
+                elif isinstance(obs, FragilePlatform):
+                    kind = PLATFORM_FRAGILE
+                    self._moving_platforms.append((i, obs))  # Présence variable (cassée ou non)
+                else:
+                    kind = PLATFORM_STATIC
+                row = out[i]
+                row[0] = 1.0
+                row[1] = obs.x * sx
+                row[2] = obs.y * self.scale_y
+                row[3] = obs.width * sx
+                row[4] = obs.height * self.scale_y
+                row[5] = kind
+        for i, obs in self._moving_platforms:
+            row = out[i]
+            if obs.__class__ is MovingPlatform:
+                row[1] = obs.x * sx
+            else:
+                row[0] = not obs.broken
@@ -0,0 +1,241 @@
+"""
+Bus d'événements de jeu.
+
+La simulation ne déclenche plus directement particules et sons : elle ajoute
+des événements typés dans une file stockée en colonnes (array), que les
+consommateurs (particules, audio, télémétrie, score) vident une fois en fin
+de frame. Un run headless peut ainsi se passer des consommateurs cosmétiques.
+"""
+
+import math
+from array import array
+from enum import IntEnum
+import numpy as np
+from .audio import SoundType
+
+
+class EventType(IntEnum):
+    """Types d'événements et signification des colonnes (a, b, c)."""
+    IMPACT = 0  # Choc sur mur/sol: (dir_x, dir_y, intensité)
+    ENEMY_HIT = 1  # Ennemi touché: (intensité, volume, -)
+    ENEMY_KILLED = 2  # Ennemi détruit: (couleur, volume, -)
+    LIFE_LOST = 3  # Vie perdue: (intensité, volume, fatal)
+    PICKUP = 4  # Bonus ramassé: (volume, -, -)
+    DOOR_OPENED = 5  # Porte activée: (-, -, -)
+    LEVEL_COMPLETE = 6  # Porte franchie: (niveau atteint, -, -)
+    EXPLOSION = 7  # Explosion: (intensité, volume, -)
+    BALL_COLLISION = 8  # Choc entre boules: (intensité, volume, -)
+    PROJECTILES_CANCELLED = 9  # Missile et bulle annulés: (-, -, -)
+    MISSILE_TRAIL = 10  # Trainée de missile: (-, -, -)
+
+
+def pack_color(color: tuple) -> float:
+    """Encode une couleur RGB dans une colonne flottante."""
+    return float((int(color[0]) << 16) | (int(color[1]) << 8) | int(color[2]))
+
+
+def unpack_color(value: float) -> tuple[int, int, int]:
+    """Décode une couleur encodée par pack_color."""
+    packed = int(value)
+    return (packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF
+
+
+class EventQueue:
+    """
+    File d'événements stockée en colonnes.
+
+    Chaque événement occupe une ligne: type, position (x, y) et trois
+    valeurs (a, b, c) dont le sens dépend du type (voir EventType).
+    """
+
+    def __init__(self):
+        self.kind = array('b')
+        self.x = array('d')
+        self.y = array('d')
+        self.a = array('d')
+        self.b = array('d')
+        self.c = array('d')
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def push(self, kind: EventType, x: float, y: float, a: float = 0.0, b: float = 0.0, c: float = 0.0):
+        """Ajoute un événement brut."""
+        self.kind.append(kind)
+        self.x.append(x)
+        self.y.append(y)
+        self.a.append(a)
+        self.b.append(b)
+        self.c.append(c)
+
+    def push_many(self, kind: EventType, x: np.ndarray, y: np.ndarray, a=0.0, b=0.0, c=0.0):
+        """Ajoute d'un coup un événement par ligne des colonnes NumPy (valeurs scalaires diffusées)."""
+        count = len(x)
+        if not count:
+            return
+        self.kind.frombytes(bytes([kind]) * count)
+        for column, values in ((self.x, x), (self.y, y), (self.a, a), (self.b, b), (self.c, c)):
+            column.frombytes(np.broadcast_to(np.asarray(values, dtype=np.float64), (count,)).tobytes())
+
+    def impact(self, x: float, y: float, dir_x: float, dir_y: float, intensity: float):
+        self.push(EventType.IMPACT, x, y, dir_x, dir_y, intensity)
+
+    def enemy_hit(self, x: float, y: float, intensity: float, volume: float):
+        self.push(EventType.ENEMY_HIT, x, y, intensity, volume)
+
+    def enemy_killed(self, x: float, y: float, color: tuple, volume: float = 0.0):
+        self.push(EventType.ENEMY_KILLED, x, y, pack_color(color), volume)
+
+    def life_lost(self, x: float, y: float, volume: float, fatal: bool = False):
+        self.push(EventType.LIFE_LOST, x, y, 3.0, volume, 1.0 if fatal else 0.0)
+
+    def pickup(self, x: float, y: float, volume: float):
+        self.push(EventType.PICKUP, x, y, volume)
+
+    def door_opened(self, x: float, y: float):
+        self.push(EventType.DOOR_OPENED, x, y)
+
+    def level_complete(self, x: float, y: float, level: int):
+        self.push(EventType.LEVEL_COMPLETE, x, y, level)
+
+    def explosion(self, x: float, y: float, intensity: float, volume: float = 0.0):
+        self.push(EventType.EXPLOSION, x, y, intensity, volume)
+
+    def ball_collision(self, x: float, y: float, intensity: float, volume: float = 0.0):
+        self.push(EventType.BALL_COLLISION, x, y, intensity, volume)
+
+    def ball_collisions(self, x: np.ndarray, y: np.ndarray, intensity: np.ndarray, volume: np.ndarray):
+        self.push_many(EventType.BALL_COLLISION, x, y, intensity, volume)
+
+    def projectiles_cancelled(self, x: float, y: float):
+        self.push(EventType.PROJECTILES_CANCELLED, x, y)
+
+    def missile_trail(self, x: float, y: float):
+        self.push(EventType.MISSILE_TRAIL, x, y)
+
+    def rows(self):
+        """Itère sur les événements dans l'ordre: (type, x, y, a, b, c)."""
+        return zip(self.kind, self.x, self.y, self.a, self.b, self.c)
+
+    def select(self, kind: EventType) -> tuple[np.ndarray, ...]:
+        """Colonnes (x, y, a, b, c) des événements d'un type, en tableaux NumPy."""
+        if not self.kind:
+            empty = np.zeros(0)
+            return empty, empty, empty, empty, empty
+        mask = np.frombuffer(self.kind, dtype=np.int8) == kind
+        return tuple(
+            np.frombuffer(column, dtype=np.float64)[mask]
+            for column in (self.x, self.y, self.a, self.b, self.c)
+        )
+
+    def counts(self) -> np.ndarray:
+        """Nombre d'événements de chaque type (indexé par EventType)."""
+        if not self.kind:
+            return np.zeros(len(EventType), dtype=np.intp)
+        return np.bincount(np.frombuffer(self.kind, dtype=np.int8), minlength=len(EventType))
+
+    def clear(self):
+        """Vide la file (les colonnes gardent leur type)."""
+        for column in (self.kind, self.x, self.y, self.a, self.b, self.c):
+            del column[:]
+
+
+class ParticleConsumer:
+    """Traduit les événements en particules."""
+
+    def __init__(self, particles):
+        self.particles = particles
+
+    def consume(self, events: EventQueue):
+        particles = self.particles
+        rng = particles.rng
+        for kind, x, y, a, b, c in events.rows():
+            if kind == EventType.IMPACT:
+                particles.spawn_directional(x, y, a, b, c)
+            elif kind == EventType.ENEMY_HIT:
+                particles.spawn_directional(x, y, 0, 0, a)
+            elif kind == EventType.ENEMY_KILLED:
+                particles.spawn_enemy_destruction(x, y, unpack_color(a))
+            elif kind == EventType.LIFE_LOST:
+                if c:
+                    # Mort: grande explosion de particules
+                    for _ in range(30):
+                        angle = rng.uniform(0, 2 * math.pi)
+                        speed = rng.uniform(2, 8)
+                        particles.spawn_directional(x, y, math.cos(angle) * speed, math.sin(angle) * speed, 5.0)
+                else:
+                    particles.spawn_directional(x, y, 0, 0, a)
+            elif kind == EventType.EXPLOSION:
+                particles.spawn_explosion(x, y, a)
+            elif kind == EventType.BALL_COLLISION:
+                particles.spawn_ball_collision(x, y, a)
+            elif kind == EventType.PROJECTILES_CANCELLED:
+                particles.spawn_directional(x, y, 0, 0, 1.5)
+            elif kind == EventType.MISSILE_TRAIL:
+                if rng.random() < 0.3:  # 30% de chance par frame
+                    particles.spawn_missile_trail(x, y)
+
+
+class AudioConsumer:
+    """Traduit les événements en sons."""
+
+    def __init__(self, audio):
+        self.audio = audio
+
+    def consume(self, events: EventQueue):
+        play = self.audio.play
+        for kind, x, y, a, b, c in events.rows():
+            if kind == EventType.IMPACT:
+                # Son différent selon le type de collision
+                sound = SoundType.PLATFORM_IMPACT if b == -1 else SoundType.WALL_IMPACT
+                play(sound, min(1.0, c))
+            elif kind in (EventType.ENEMY_HIT, EventType.ENEMY_KILLED,
+                          EventType.EXPLOSION, EventType.BALL_COLLISION):
+                if b > 0:
+                    play(SoundType.BALL_COLLISION, b)
+            elif kind == EventType.LIFE_LOST:
+                play(SoundType.LIFE_LOST, b)
+            elif kind == EventType.PICKUP:
+                play(SoundType.DOUBLE_JUMP, a)  # Son joyeux
+            elif kind == EventType.LEVEL_COMPLETE:
+                play(SoundType.DOUBLE_JUMP, 1.0)  # Son de victoire
+            elif kind == EventType.PROJECTILES_CANCELLED:
+                play(SoundType.BALL_COLLISION, 0.3)
+
+
+class TelemetryConsumer:
+    """Compte les événements par type, par frame et au total."""
+
+    def __init__(self):
+        self.totals = np.zeros(len(EventType), dtype=np.intp)
+        self.last_frame = np.zeros(len(EventType), dtype=np.intp)
+        self.frames = 0
+
+    def consume(self, events: EventQueue):
+        self.last_frame = events.counts()
+        self.totals += self.last_frame
+        self.frames += 1
+
+    def summary(self) -> dict[str, int]:
+        """Totaux par nom de type d'événement."""
+        return {kind.name.lower(): int(self.totals[kind]) for kind in EventType}
+
+
+class ScoreConsumer:
+    """Statistiques de partie tirées des événements (tous niveaux confondus)."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.total_kills = 0
+        self.lives_lost = 0
+        self.pickups = 0
+        self.levels_completed = 0
+
+    def consume(self, events: EventQueue):
+        counts = events.counts()
+        self.total_kills += int(counts[EventType.ENEMY_KILLED])
+        self.lives_lost += int(counts[EventType.LIFE_LOST])
+        self.pickups += int(counts[EventType.PICKUP])
+        self.levels_completed += int(counts[EventType.LEVEL_COMPLETE])
@@ -0,0 +1,101 @@
+"""
+Politique du ramasse-miettes.
+
+Pendant le jeu, chaque frame alloue beaucoup d'objets de courte durée
+(tuples de collision, listes, particules). Le GC générationnel de Python
+peut alors déclencher une collecte complète en plein combat. Cette
+politique gèle les objets durables après chaque chargement, espace les
+collectes pendant le jeu et les force aux moments où une pause ne se voit
+pas (transitions de niveau, pause, game over).
+"""
+
+import gc
+import time
+from collections import deque
+from .config import Config
+
+
+class GCPolicy:
+    """Pilote le ramasse-miettes selon l'état du jeu et mesure ses pauses."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.enabled = self.config.GC_POLICY_ENABLED
+        self.default_thresholds = gc.get_threshold()
+        self.playing = False
+        self.installed = False
+
+        # Télémétrie: (génération, durée en ms, objets collectés)
+        self.pauses: deque = deque(maxlen=self.config.GC_PAUSE_HISTORY)
+        self.collections = [0, 0, 0]
+        self.total_pause_ms = 0.0
+        self.max_pause_ms = 0.0
+        self._pause_start = 0.0
+
+    def install(self):
+        """Branche la mesure des pauses sur gc.callbacks."""
+        if not self.installed:
+            gc.callbacks.append(self._on_gc)
+            self.installed = True
+
+    def uninstall(self):
+        """Retire la mesure et rétablit les seuils d'origine."""
+        if self.installed:
+            gc.callbacks.remove(self._on_gc)
+            self.installed = False
+        gc.set_threshold(*self.default_thresholds)
+
+    def _on_gc(self, phase: str, info: dict):
+        """Callback du GC: chronomètre chaque collecte."""
+        if phase == 'start':
+            self._pause_start = time.perf_counter()
+            return
+
+        duration_ms = (time.perf_counter() - self._pause_start) * 1000
+        generation = info['generation']
+        self.collections[generation] += 1
+        self.total_pause_ms += duration_ms
+        self.max_pause_ms = max(self.max_pause_ms, duration_ms)
+        self.pauses.append((generation, duration_ms, info['collected']))
+
+    def level_loaded(self):
+        """
+        Après un chargement: collecte puis gèle les objets survivants.
+
+        Les objets gelés (niveau, sprites, sons) ne sont plus parcourus par
+        les collectes suivantes. On dégèle d'abord pour libérer ce qui
+        restait du niveau précédent.
+        """
+        if not self.enabled:
+            return
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+
+    def on_state_change(self, playing: bool):
+        """
+        Adapte le GC au nouvel état du jeu.
+
+        En jeu, les seuils sont relevés pour espacer les collectes. Hors jeu
+        (pause, menu, game over), on rétablit les seuils et on collecte tout
+        de suite, pendant que l'écran est figé.
+        """
+        if not self.enabled or playing == self.playing:
+            return
+        self.playing = playing
+
+        if playing:
+            gc.set_threshold(*self.config.GC_PLAYING_THRESHOLDS)
+        else:
+            gc.set_threshold(*self.default_thresholds)
+            gc.collect()
+
+    def stats(self) -> dict:
+        """Résumé des pauses GC mesurées."""
+        return {
+            'collections': tuple(self.collections),
+            'total_pause_ms': self.total_pause_ms,
+            'max_pause_ms': self.max_pause_ms,
+            'last_pause_ms': self.pauses[-1][1] if self.pauses else 0.0,
+            'frozen': gc.get_freeze_count(),
+        }
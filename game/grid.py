@@ -0,0 +1,266 @@
+"""
+Grille de distance aux obstacles.
+
+Rasterise les obstacles d'un niveau dans un champ de distance signée à
+cellules carrées : la distance d'un point au plus proche obstacle (négative
+à l'intérieur) devient une lecture de tableau, vectorisable sur des milliers
+de points (bulles ennemies, lignes de vue). Les tests « ce point est-il
+dans un obstacle ? », « à quelle distance ? » et « dans quelle direction en
+sortir ? » coûtent le même prix quel que soit le nombre d'obstacles.
+
+Les obstacles fixes et les plateformes fragiles intactes sont rasterisés :
+quand une fragile casse ou se reforme, seule la zone qu'elle influence est
+recalculée. Les plateformes mobiles ne le sont pas et restent testées une
+par une.
+
+La grille couvre le niveau, ou seulement une zone (écrans simulés en
+détail d'un grand niveau, voir chunks.py) : sa taille ne dépend alors pas
+de celle du niveau.
+"""
+
+import math
+from typing import Optional
+import numpy as np
+from .config import Config
+from .entities import Obstacle, FragilePlatform
+
+
+class ObstacleGrid:
+    """
+    Champ de distance signée des obstacles, précalculé à chaque changement de niveau.
+
+    Chaque cellule garde la distance de son centre au plus proche obstacle
+    rasterisé (positive dehors, profondeur négative dedans), plafonnée à
+    `max_distance`. La cellule (0, 0) a son coin en (origin_x, origin_y).
+    Une lecture vaut la distance du point à une demi-diagonale de cellule
+    près : la distance variant d'au plus un pixel par pixel, la valeur lue
+    moins cette marge est un minorant sûr (voir clearance).
+    """
+
+    def __init__(self, config: Config = None, cell_size: int = None):
+        self.config = config or Config()
+        self.cell_size = cell_size or self.config.GRID_CELL_SIZE
+        self.max_distance = float(self.config.GRID_MAX_DISTANCE)
+        self.margin = self.cell_size * math.sqrt(2) / 2
+        self.origin_x = 0
+        self.origin_y = 0
+        self.cols = 0
+        self.rows = 0
+        self.distance = np.zeros((0, 0), dtype=np.float32)
+        self.dynamic: list[Obstacle] = []  # Obstacles non rasterisés (mobiles)
+        self.fragile: list[FragilePlatform] = []
+        self.repaints = 0  # Zones recalculées après la casse ou le retour d'une fragile
+        self.version = 0  # Change à chaque modification du champ (caches dérivés, voir sight.py)
+        self._rects = np.zeros((0, 4))  # (x, y, largeur, hauteur) des obstacles rasterisés
+        self._solid = np.zeros(0, dtype=bool)
+        self._fragile_rows: list[int] = []  # Ligne de chaque fragile dans _rects
+        self._rect_list: list[tuple] = []  # _rects en tuples (comparaison avec une liste restaurée)
+        self._broken: list[bool] = []
+        self._source = None  # Liste rasterisée (comparée par identité)
+        self._key = None
+
+    def build(self, obstacles: list[Obstacle], bounds: Optional[tuple[float, float, float, float]] = None):
+        """
+        Rasterise les obstacles (sans effet si les obstacles, la zone et les fragiles n'ont pas changé).
+
+        `bounds` (gauche, haut, droite, bas) limite la grille à une zone,
+        le niveau entier par défaut; les points hors de la zone sont libres.
+        """
+        cfg = self.config
+        bounds = bounds or (0, 0, cfg.LEVEL_WIDTH, cfg.LEVEL_HEIGHT)
+        key = (len(obstacles), bounds)
+        if obstacles is self._source and key == self._key:
+            self._refresh_fragile()
+            return
+
+        dynamic = []
+        fragile = []
+        fragile_rows = []
+        rects = []
+        for obs in obstacles:
+            cls = obs.__class__
+            if cls is FragilePlatform:
+                fragile_rows.append(len(rects))
+                fragile.append(obs)
+            elif cls is not Obstacle:
+                dynamic.append(obs)
+                continue
+            rects.append((obs.x, obs.y, obs.width, obs.height))
+        self._source = obstacles
+        self.dynamic = dynamic
+        self.fragile = fragile
+        if key == self._key and fragile_rows == self._fragile_rows and rects == self._rect_list:
+            # Mêmes obstacles dans une autre liste (instantané restauré, rollback): seules les fragiles changent
+            self._refresh_fragile()
+            return
+        self._key = key
+        self._fragile_rows = fragile_rows
+        self._rect_list = rects
+        self.version += 1
+
+        cell = self.cell_size
+        left, top, right, bottom = bounds
+        self.origin_x = int(left // cell) * cell
+        self.origin_y = int(top // cell) * cell
+        self.cols = int(-(-(right - self.origin_x) // cell))
+        self.rows = int(-(-(bottom - self.origin_y) // cell))
+        if (self.rows, self.cols) != self.distance.shape:
+            self.distance = np.empty((self.rows, self.cols), dtype=np.float32)
+
+        self._rects = np.array(rects, dtype=float).reshape(-1, 4)
+        self._solid = np.ones(len(rects), dtype=bool)
+        self._broken = [obs.broken for obs in self.fragile]
+        for row, broken in zip(self._fragile_rows, self._broken):
+            self._solid[row] = not broken
+        self._paint(0, self.rows, 0, self.cols)
+
+    def invalidate(self):
+        """Force la reconstruction au prochain build()."""
+        self._source = None
+        self._key = None
+
+    def _refresh_fragile(self):
+        """Recalcule la zone des plateformes fragiles qui ont cassé ou sont revenues."""
+        broken = [obs.broken for obs in self.fragile]
+        if broken == self._broken:
+            return
+        for i, (now, before) in enumerate(zip(broken, self._broken)):
+            if now == before:
+                continue
+            row = self._fragile_rows[i]
+            self._solid[row] = not now
+            col0, row0, col1, row1 = self._cells(self._rects[row])
+            self._paint(row0, row1, col0, col1)
+            self.repaints += 1
+            self.version += 1
+        self._broken = broken
+
+    def _cells(self, rect) -> tuple[int, int, int, int]:
+        """Cellules (col0, row0, col1, row1) à moins de max_distance d'un rectangle."""
+        cell = self.cell_size
+        reach = self.max_distance
+        x = rect[0] - self.origin_x
+        y = rect[1] - self.origin_y
+        col0 = max(0, int((x - reach) // cell))
+        row0 = max(0, int((y - reach) // cell))
+        col1 = min(self.cols, int(-(-(x + rect[2] + reach) // cell)))
+        row1 = min(self.rows, int(-(-(y + rect[3] + reach) // cell)))
+        return col0, row0, col1, row1
+
+    def _paint(self, row0: int, row1: int, col0: int, col1: int):
+        """Recalcule les cellules [row0:row1, col0:col1] à partir des obstacles solides proches."""
+        if row0 >= row1 or col0 >= col1:
+            return
+        window = self.distance[row0:row1, col0:col1]
+        window[:] = self.max_distance
+        cell = self.cell_size
+        reach = self.max_distance
+        left = self.origin_x + col0 * cell
+        top = self.origin_y + row0 * cell
+        right = self.origin_x + col1 * cell
+        bottom = self.origin_y + row1 * cell
+        rects = self._rects
+        near = self._solid & (rects[:, 0] - reach < right) & (rects[:, 0] + rects[:, 2] + reach > left) & \
+            (rects[:, 1] - reach < bottom) & (rects[:, 1] + rects[:, 3] + reach > top)
+
+        for rect in rects[near]:
+            c0, r0, c1, r1 = self._cells(rect)
+            c0, r0, c1, r1 = max(c0, col0), max(r0, row0), min(c1, col1), min(r1, row1)
+            if c0 >= c1 or r0 >= r1:
+                continue
+            # Distance signée du centre des cellules à la boîte: par axe, positive hors de la bande
+            cx = self.origin_x + (np.arange(c0, c1) + 0.5) * cell
+            cy = self.origin_y + (np.arange(r0, r1) + 0.5) * cell
+            dx = np.maximum(rect[0] - cx, cx - (rect[0] + rect[2]))
+            dy = np.maximum(rect[1] - cy, cy - (rect[1] + rect[3]))
+            outside = np.hypot(np.maximum(dx, 0.0)[None, :], np.maximum(dy, 0.0)[:, None])
+            inside = np.minimum(np.maximum(dx[None, :], dy[:, None]), 0.0)
+            block = window[r0 - row0:r1 - row0, c0 - col0:c1 - col0]
+            np.minimum(block, outside + inside, out=block)
+
+    def _index(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Ligne, colonne et appartenance à la grille de chaque point."""
+        col = np.floor_divide(x - self.origin_x, self.cell_size).astype(np.intp)
+        row = np.floor_divide(y - self.origin_y, self.cell_size).astype(np.intp)
+        inside = (col >= 0) & (col < self.cols) & (row >= 0) & (row < self.rows)
+        return row, col, inside
+
+    def distance_at(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Distance signée de chaque point (x, y) aux obstacles (hors grille: max_distance)."""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        row, col, inside = self._index(x, y)
+        result = np.full(x.shape, self.max_distance)
+        result[inside] = self.distance[row[inside], col[inside]]
+        return result
+
+    def clearance(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Minorant de la distance de chaque point aux obstacles rasterisés."""
+        return self.distance_at(x, y) - self.margin
+
+    def query(self, x: np.ndarray, y: np.ndarray, radius: float = 0.0) -> np.ndarray:
+        """
+        Pour chaque point (x, y), True s'il est peut-être à moins de `radius`
+        d'un obstacle (hors grille: False).
+        """
+        return self.clearance(x, y) < radius
+
+    def normal_at(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Direction (unitaire) qui éloigne chaque point des obstacles.
+
+        Gradient du champ par différences centrées sur les cellules voisines;
+        (0, 0) loin de tout obstacle ou hors de la grille.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        row, col, inside = self._index(x, y)
+        nx = np.zeros(x.shape)
+        ny = np.zeros(x.shape)
+        if not inside.any():
+            return nx, ny
+        row = row[inside]
+        col = col[inside]
+        field = self.distance
+        gx = field[row, np.minimum(col + 1, self.cols - 1)] - field[row, np.maximum(col - 1, 0)]
+        gy = field[np.minimum(row + 1, self.rows - 1), col] - field[np.maximum(row - 1, 0), col]
+        length = np.hypot(gx, gy)
+        length[length == 0] = 1.0
+        nx[inside] = gx / length
+        ny[inside] = gy / length
+        return nx, ny
+
+    def segment_clear(self, x0, y0, x1, y1, radius=0.0) -> np.ndarray:
+        """
+        True pour chaque segment (x0, y0) -> (x1, y1) qui passe à plus de `radius` (un par segment
+        ou commun) des obstacles rasterisés.
+
+        Lancer de rayons par pas de sphère, tous les segments à la fois : chaque
+        pas avance de la distance libre lue (au moins une demi-cellule), ce qui
+        traverse le vide en quelques lectures. Les frôlements à moins d'une
+        marge de cellule comptent comme bloqués.
+        """
+        x0 = np.atleast_1d(np.asarray(x0, dtype=float))
+        y0 = np.atleast_1d(np.asarray(y0, dtype=float))
+        dx = np.atleast_1d(np.asarray(x1, dtype=float)) - x0
+        dy = np.atleast_1d(np.asarray(y1, dtype=float)) - y0
+        length = np.hypot(dx, dy)
+        radius = np.broadcast_to(np.asarray(radius, dtype=float), x0.shape)
+        scale = np.where(length > 0, 1.0 / np.maximum(length, 1e-9), 0.0)
+        dx *= scale
+        dy *= scale
+
+        clear = np.ones(len(x0), dtype=bool)
+        travelled = np.zeros(len(x0))
+        active = np.arange(len(x0))
+        min_step = self.cell_size * 0.5
+        while len(active):
+            t = np.minimum(travelled[active], length[active])
+            free = self.clearance(x0[active] + dx[active] * t, y0[active] + dy[active] * t) - radius[active]
+            blocked = free <= 0
+            clear[active[blocked]] = False
+            # Fin de segment vérifiée: le rayon est dégagé
+            done = blocked | (travelled[active] >= length[active])
+            travelled[active] += np.maximum(free, min_step)
+            active = active[~done]
+        return clear
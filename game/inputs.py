@@ -0,0 +1,95 @@
+"""
+Entrées joueur sous forme de masques de bits.
+
+Les entrées d'une frame tiennent dans un octet : c'est ce que le moteur
+applique à chaque joueur, ce qui circule sur le réseau en netplay et ce que
+produisent les bots. Une frame de simulation ne dépend ainsi que de l'état
+du monde et des masques de chaque joueur.
+"""
+
+from enum import IntFlag
+import pygame
+
+
+class Input(IntFlag):
+    """Boutons d'un joueur pour une frame."""
+    NONE = 0
+    LEFT = 1
+    RIGHT = 2
+    UP = 4  # Viser vers le haut
+    DOWN = 8  # Viser vers le bas
+    JUMP = 16  # Le saut part sur l'appui (front montant)
+    FLOAT = 32
+    FIRE = 64
+    SUPER = 128  # La super attaque part sur l'appui
+
+
+JUMP_KEYS = (pygame.K_UP, pygame.K_w, pygame.K_z, pygame.K_k)
+
+
+def read_keyboard(keys) -> int:
+    """Masque d'entrées à partir de l'état du clavier (pygame.key.get_pressed())."""
+    mask = 0
+    if keys[pygame.K_UP] or keys[pygame.K_w]:
+        mask |= Input.UP
+    elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        mask |= Input.DOWN
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        mask |= Input.LEFT
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        mask |= Input.RIGHT
+    if any(keys[key] for key in JUMP_KEYS):
+        mask |= Input.JUMP
+    if keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]:
+        mask |= Input.FLOAT
+    if keys[pygame.K_SPACE]:
+        mask |= Input.FIRE
+    return mask
+
+
+def read_joystick(joystick) -> int:
+    """Masque d'entrées à partir d'une manette (stick gauche, D-pad et boutons)."""
+    mask = 0
+    joy_up = False
+    joy_down = False
+
+    # Stick analogique gauche (axe 0 = horizontal, axe 1 = vertical)
+    axis_x = joystick.get_axis(0)
+    axis_y = joystick.get_axis(1)
+    if axis_x < -0.3:  # Seuil de déclenchement
+        mask |= Input.LEFT
+    elif axis_x > 0.3:
+        mask |= Input.RIGHT
+    if axis_y < -0.3:  # Stick vers le haut
+        joy_up = True
+    elif axis_y > 0.3:  # Stick vers le bas
+        joy_down = True
+
+    # D-pad (chapeau)
+    if joystick.get_numhats() > 0:
+        hat = joystick.get_hat(0)
+        if hat[0] < 0:
+            mask |= Input.LEFT
+        elif hat[0] > 0:
+            mask |= Input.RIGHT
+        if hat[1] > 0:  # D-pad haut
+            joy_up = True
+        elif hat[1] < 0:  # D-pad bas
+            joy_down = True
+
+    # Visée verticale (mapping historique de la manette: bas = viser en haut)
+    if joy_down:
+        mask |= Input.UP
+    elif joy_up:
+        mask |= Input.DOWN
+
+    # Boutons : A (0) = saut, B (1) = float, X (2) = tir, Y (3) = super attaque
+    if joystick.get_button(0):
+        mask |= Input.JUMP
+    if joystick.get_button(1):
+        mask |= Input.FLOAT
+    if joystick.get_button(2):
+        mask |= Input.FIRE
+    if joystick.get_button(3):
+        mask |= Input.SUPER
+    return mask
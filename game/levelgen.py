@@ -0,0 +1,610 @@
+"""
+Génération et validation des niveaux.
+
+LevelGenerator produit les obstacles de chaque écran d'un niveau à partir
+de la graine du niveau (voir chunks.py), et prépare des niveaux complets :
+graine des tronçons, porte, écrans autour du départ et jusqu'à la porte
+encodés comme des tronçons compactés (voir snapshot.py).
+
+Un niveau préparé est validé : pour chaque personnage, la porte doit être
+accessible en enchaînant des sauts depuis l'endroit où le joueur tombe au
+départ. Les arcs de saut se déduisent de Config.JUMP_FORCE, Config.GRAVITY
+et des multiplicateurs de Config.PLAYER_STATS, sauts en l'air compris. Un
+niveau refusé est retiré avec une graine dérivée, au plus
+Config.LEVELGEN_MAX_ATTEMPTS fois; si aucun essai ne passe, le dernier
+reçoit une passerelle à hauteur de porte, du point de chute à la porte,
+dégagée de tout obstacle au-dessus. La validation ne modélise pas les
+plafonds (obstacles au-dessus d'un saut) et ne couvre que les
+Config.LEVELGEN_VALIDATE_ROWS rangées d'écrans du haut.
+
+LevelPool prépare les niveaux suivants à l'avance dans un processus séparé
+(Config.LEVELGEN_QUEUE niveaux) et les garde en cache sur disque par
+graine : un changement de niveau ne fait plus que décoder un niveau prêt.
+Les fichiers portent l'empreinte du générateur (version du code et
+réglages qui influent sur les niveaux) : un niveau préparé avec d'autres
+réglages est ignoré et reconstruit. Le cache ne garde que les
+Config.LEVELGEN_CACHE_MAX_FILES niveaux utilisés le plus récemment.
+Un niveau ne dépend que de sa graine : préparé à l'avance, relu sur disque
+ou construit sur place, il est identique (replays, netplay).
+"""
+
+import multiprocessing
+import os
+import random
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+import numpy as np
+from .config import Config
+from .entities import Obstacle, FragilePlatform, MovingPlatform, Door
+from .snapshot import WorldSnapshot
+
+MAGIC = b'EDLV'
+VERSION = 2
+GENERATOR_VERSION = 2  # À incrémenter quand la génération ou la validation des niveaux change
+
+# Réglages dont dépendent les niveaux générés et leur validation (empreinte du cache disque)
+_FINGERPRINT_SETTINGS = (
+    'LEVEL_WIDTH', 'LEVEL_HEIGHT', 'PLAY_AREA_WIDTH', 'PLAY_AREA_HEIGHT', 'WALL_THICKNESS',
+    'CHUNK_LOAD_RADIUS', 'ENDLESS_CLIMB_ROWS', 'MOVING_PLATFORM_SPEED_FAST', 'MOVING_PLATFORM_SPEED_SLOW',
+    'LEVELGEN_MAX_ATTEMPTS', 'LEVELGEN_VALIDATE_ROWS', 'LEVELGEN_WALKWAY_OVERLAP',
+    'PLAYER_STATS', 'PLAYER_HITBOX_SIZES', 'BALL_SPEED', 'MAX_SPEED', 'JUMP_FORCE', 'GRAVITY', 'FRICTION',
+    'MAX_JUMPS', 'MAX_ENERGY', 'DOUBLE_JUMP_ENERGY_COST',
+)
+
+_HEADER = struct.Struct('<4s H I Q Q H ? 2i I')  # magic, version, empreinte, graines, essais, validé, porte, écrans
+_SCREEN = struct.Struct('<i I')  # index de l'écran, taille des obstacles encodés
+_DERIVE = struct.Struct('<Q I')
+_NEXT_LEVEL = 0xFFFFFFFF  # Sel de la graine du niveau suivant (les essais utilisent 1, 2, ...)
+
+
+def derive_seed(seed: int, salt: int) -> int:
+    """Graine dérivée d'une autre (essais d'un niveau, niveau suivant)."""
+    return zlib.crc32(_DERIVE.pack(seed, salt))
+
+
+def next_base(seed: int) -> int:
+    """Graine demandée pour le niveau qui suit celui de graine `seed`."""
+    return derive_seed(seed, _NEXT_LEVEL)
+
+
+@dataclass(slots=True)
+class LevelLayout:
+    """Niveau préparé: graine retenue, porte, écrans du départ et du chemin vers la porte (obstacles encodés)."""
+
+    base: int  # Graine demandée
+    seed: int  # Graine retenue (premier essai validé)
+    attempts: int
+    valid: bool  # False si même le dernier essai, passerelle de secours ajoutée, ne passe pas la validation
+    door_x: int
+    door_y: int
+    screens: dict[int, bytes] = field(default_factory=dict)
+    fingerprint: int = 0  # Empreinte du générateur qui l'a construit (LevelGenerator.fingerprint)
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(MAGIC, VERSION, self.fingerprint, self.base, self.seed, self.attempts, self.valid,
+                              self.door_x, self.door_y, len(self.screens))]
+        for index, body in self.screens.items():
+            parts.append(_SCREEN.pack(index, len(body)))
+            parts.append(body)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'LevelLayout':
+        magic, version, fingerprint, base, seed, attempts, valid, door_x, door_y, count = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Niveau invalide (magic={magic!r}, version={version})")
+        offset = _HEADER.size
+        screens = {}
+        for _ in range(count):
+            index, size = _SCREEN.unpack_from(data, offset)
+            offset += _SCREEN.size
+            screens[index] = data[offset:offset + size]
+            offset += size
+        return cls(base, seed, attempts, valid, door_x, door_y, screens, fingerprint)
+
+
+class JumpArc:
+    """
+    Portée des sauts d'un personnage ou d'un archétype d'ennemi.
+
+    Hauteur des pieds frame par frame pendant un saut de vitesse initiale
+    `force` (négative vers le haut, comme Config.JUMP_FORCE), avec
+    `air_jumps` sauts en l'air enchaînés au sommet, puis chute jusqu'à
+    `max_drop` sous le point de départ, à la vitesse horizontale `speed`.
+    """
+
+    def __init__(self, config: Config, force: float, speed: float, air_jumps: int, max_drop: float):
+        heights = []
+        height = 0.0
+        vy = force
+        while height > -max_drop:
+            vy += config.GRAVITY
+            height -= vy
+            heights.append(height)
+            if vy >= 0 and air_jumps:
+                air_jumps -= 1
+                vy = force
+
+        self.max_rise = max(heights)
+        apex = heights.index(self.max_rise)
+        # Descente finale, en hauteurs croissantes pour np.interp: frame où l'on repasse sous chaque hauteur
+        self._fall_heights = np.array(heights[apex:][::-1])
+        self._fall_frames = np.arange(len(heights), apex, -1, dtype=float)
+        self.speed = speed
+
+    @classmethod
+    def for_player(cls, config: Config, speed_multiplier: float, jump_multiplier: float, max_drop: float) -> 'JumpArc':
+        """Arc d'un personnage: sauts en l'air permis par l'énergie, vitesse de course établie."""
+        air_jumps = min(config.MAX_JUMPS - 1, int(config.MAX_ENERGY // config.DOUBLE_JUMP_ENERGY_COST))
+        # Vitesse de course au sol (accélération contre frottement), bornée par MAX_SPEED
+        run = config.BALL_SPEED * 0.3 * speed_multiplier * config.FRICTION / (1 - config.FRICTION)
+        return cls(config, config.JUMP_FORCE * jump_multiplier, min(config.MAX_SPEED, run), air_jumps, max_drop)
+
+    def reaches(self, rise: np.ndarray, gap: np.ndarray) -> np.ndarray:
+        """True où un saut monte de `rise` (négatif: descend) en franchissant `gap` horizontalement."""
+        frames = np.interp(rise, self._fall_heights, self._fall_frames)
+        return (rise <= self.max_rise) & (gap <= frames * self.speed)
+
+
+class LevelGenerator:
+    """
+    Obstacles des écrans et niveaux validés.
+
+    Ne dépend que de la configuration et du mode sans fin (`endless`) :
+    l'objet est envoyé tel quel au processus de préparation (LevelPool).
+    """
+
+    def __init__(self, config: Config = None, endless: Optional[str] = None):
+        self.config = config or Config()
+        self.endless = endless
+        self._arcs = None  # Arcs de saut des personnages (calculés à la première validation)
+
+    def __getstate__(self):
+        return {'config': self.config, 'endless': self.endless}
+
+    def __setstate__(self, state):
+        self.config = state['config']
+        self.endless = state['endless']
+        self._arcs = None
+
+    def fingerprint(self) -> int:
+        """Empreinte des niveaux produits: versions du format et du générateur, mode et réglages utiles."""
+        settings = tuple(getattr(self.config, name) for name in _FINGERPRINT_SETTINGS)
+        return zlib.crc32(repr((VERSION, GENERATOR_VERSION, self.endless, settings)).encode())
+
+    # --- Géométrie du niveau ---
+
+    def screens(self) -> tuple[int, int]:
+        """Taille du niveau en écrans (aires de jeu) horizontalement et verticalement."""
+        cfg = self.config
+        return max(1, cfg.LEVEL_WIDTH // cfg.PLAY_AREA_WIDTH), max(1, cfg.LEVEL_HEIGHT // cfg.PLAY_AREA_HEIGHT)
+
+    def spawn_corner(self) -> tuple[int, int]:
+        """Coin haut-gauche de l'écran de départ: en haut au milieu, au début de la piste en mode sans fin."""
+        cfg = self.config
+        screens_x, screens_y = self.screens()
+        x = 0 if self.endless == 'horizontal' else screens_x // 2 * cfg.PLAY_AREA_WIDTH
+        y = (screens_y - 1) * cfg.PLAY_AREA_HEIGHT if self.endless == 'vertical' else 0
+        return x, y
+
+    def spawn_platform(self) -> Obstacle:
+        """Plateforme toujours présente en bas au centre de l'écran de départ (spawn safe)."""
+        x, y = self.spawn_corner()
+        return Obstacle.create_platform(x + 250, y + 450, 300)
+
+    def door(self, seed: int) -> tuple[int, int]:
+        """Position de la porte d'un niveau (en haut, n'importe où sur la largeur)."""
+        cfg = self.config
+        rng = random.Random(seed)
+        x = rng.randint(cfg.WALL_THICKNESS + 20, cfg.LEVEL_WIDTH - cfg.WALL_THICKNESS - 100)
+        y = rng.randint(cfg.WALL_THICKNESS + 20, cfg.WALL_THICKNESS + 150)  # Dans le tiers supérieur de l'écran
+        return x, y
+
+    # --- Écrans ---
+
+    def screen(self, seed: int, index: int) -> Iterator[Obstacle]:
+        """Obstacles d'un écran (ne dépendent que de la graine du niveau et de l'index de l'écran)."""
+        cfg = self.config
+        row, col = divmod(index, self.screens()[0])
+        rng = random.Random((seed << 32) | index)
+        return self.screen_obstacles(col * cfg.PLAY_AREA_WIDTH, row * cfg.PLAY_AREA_HEIGHT, rng)
+
+    def screen_obstacles(self, left: int, top: int, rng: random.Random) -> Iterator[Obstacle]:
+        """
+        Plateformes et blocs aléatoires d'un écran du niveau (coin haut-gauche en (left, top)).
+
+        Les obstacles sont produits un par un : la génération anticipée des
+        écrans (voir chunks.py) peut s'interrompre entre deux.
+        """
+        if self.endless == 'vertical':
+            yield from self._climb_obstacles(left, top, rng)
+            return
+        cfg = self.config
+
+        # Nombre aléatoire de plateformes statiques (3-6)
+        num_static = rng.randint(3, 6)
+        for _ in range(num_static):
+            x = rng.randint(cfg.WALL_THICKNESS + 50, cfg.PLAY_AREA_WIDTH - cfg.WALL_THICKNESS - 200)
+            y = rng.randint(150, 400)
+            width = rng.randint(80, 180)
+            yield Obstacle.create_platform(left + x, top + y, width)
+
+        # Quelques plateformes fragiles (différentes visuellement et temporaires)
+        num_fragile = rng.randint(1, 2)
+        for _ in range(num_fragile):
+            x = rng.randint(cfg.WALL_THICKNESS + 60, cfg.PLAY_AREA_WIDTH - cfg.WALL_THICKNESS - 220)
+            y = rng.randint(180, 380)
+            width = rng.randint(90, 170)
+            yield FragilePlatform.create(left + x, top + y, width)
+
+        # Plateformes mobiles: moitié lentes, moitié rapides
+        num_moving = rng.randint(2, 4)
+        for i in range(num_moving):
+            x = rng.randint(cfg.WALL_THICKNESS + 50, cfg.PLAY_AREA_WIDTH - cfg.WALL_THICKNESS - 200)
+            y = rng.randint(100, 350)
+            width = rng.randint(100, 160)
+            travel = rng.randint(150, 300)
+            # Alterner entre lent et rapide
+            is_fast = (i % 2 == 1)
+            speed = cfg.MOVING_PLATFORM_SPEED_FAST if is_fast else cfg.MOVING_PLATFORM_SPEED_SLOW
+            yield MovingPlatform.create(left + x, top + y, width, travel, speed, is_fast)
+
+        # Quelques blocs (1-3)
+        num_blocks = rng.randint(1, 3)
+        for _ in range(num_blocks):
+            x = rng.randint(cfg.WALL_THICKNESS + 50, cfg.PLAY_AREA_WIDTH - cfg.WALL_THICKNESS - 100)
+            y = rng.randint(100, 300)
+            size = rng.randint(40, 70)
+            yield Obstacle.create_block(left + x, top + y, size)
+
+    def _climb_obstacles(self, left: int, top: int, rng: random.Random) -> Iterator[Obstacle]:
+        """
+        Rangées de plateformes d'un écran de piste verticale, assez serrées pour grimper.
+
+        Config.ENDLESS_CLIMB_ROWS rangées régulièrement espacées (d'un écran au
+        suivant aussi), avec une plateforme par tiers d'écran : il y a toujours
+        une prise à portée de saut au-dessus.
+        """
+        cfg = self.config
+        rows = cfg.ENDLESS_CLIMB_ROWS
+        step = cfg.PLAY_AREA_HEIGHT / rows
+        slot = (cfg.PLAY_AREA_WIDTH - 2 * cfg.WALL_THICKNESS) // 3
+        for row in range(rows):
+            y = top + int((row + 0.5) * step) + rng.randint(-6, 6)
+            for i in range(3):
+                slot_left = left + cfg.WALL_THICKNESS + i * slot
+                width = rng.randint(110, 180)
+                roll = rng.random()
+                if roll < 0.15:
+                    # Aller-retour dans son tiers
+                    is_fast = roll < 0.05
+                    speed = cfg.MOVING_PLATFORM_SPEED_FAST if is_fast else cfg.MOVING_PLATFORM_SPEED_SLOW
+                    yield MovingPlatform.create(slot_left + 10, y, width, slot - 20, speed, is_fast)
+                    continue
+                x = slot_left + rng.randint(10, slot - width - 10)
+                if roll < 0.3:
+                    yield FragilePlatform.create(x, y, width)
+                else:
+                    yield Obstacle.create_platform(x, y, width)
+
+    # --- Niveaux validés ---
+
+    def build(self, base: int) -> LevelLayout:
+        """Niveau validé pour la graine `base` (graines dérivées essayées tant que la validation échoue)."""
+        cfg = self.config
+        attempts = max(1, cfg.LEVELGEN_MAX_ATTEMPTS)
+        for attempt in range(attempts):
+            seed = base if attempt == 0 else derive_seed(base, attempt)
+            door_x, door_y = self.door(seed)
+            screens = {index: list(self.screen(seed, index)) for index in self._path_screens(door_x)}
+            valid = self.validate(door_x, door_y, screens)
+            if valid:
+                break
+        else:
+            self._add_walkway(seed, door_x, door_y, screens)
+            valid = self.validate(door_x, door_y, screens)
+        # Écrans chargés dès le départ (voir ChunkMap.update): prêts eux aussi
+        for index in self._start_screens():
+            if index not in screens:
+                screens[index] = list(self.screen(seed, index))
+        encoded = {index: WorldSnapshot.capture_bodies(obstacles, []) for index, obstacles in screens.items()}
+        return LevelLayout(base, seed, attempt + 1, valid, door_x, door_y, encoded, self.fingerprint())
+
+    def _add_walkway(self, seed: int, door_x: int, door_y: int, screens: dict[int, list[Obstacle]]):
+        """
+        Passerelle de secours d'un niveau refusé: du point de chute à la porte, à hauteur de porte.
+
+        Le joueur apparaît au-dessus et tombe dessus (les obstacles au-dessus
+        sont retirés), puis la suit jusqu'à la porte : debout dessus, même le
+        plus petit personnage la touche, sans avoir à sauter. Elle est
+        découpée par écran, pour être chargée avec eux.
+        """
+        cfg = self.config
+        door = Door(x=door_x, y=door_y)
+        shortest = min(height for _, height in cfg.PLAYER_HITBOX_SIZES)
+        widest = max(width for width, _ in cfg.PLAYER_HITBOX_SIZES)
+        spawn_x = self.spawn_corner()[0] + cfg.PLAY_AREA_WIDTH // 2
+        top = door.y + door.height + shortest - cfg.LEVELGEN_WALKWAY_OVERLAP
+        left = max(cfg.WALL_THICKNESS, min(spawn_x, door.x) - widest)
+        right = min(cfg.LEVEL_WIDTH - cfg.WALL_THICKNESS, max(spawn_x, door.x + door.width) + widest)
+
+        cols = self.screens()[0]
+        row = int(top // cfg.PLAY_AREA_HEIGHT)
+        first = int(left // cfg.PLAY_AREA_WIDTH)
+        last = int((right - 1) // cfg.PLAY_AREA_WIDTH)
+        for col in range(first, last + 1):
+            index = row * cols + col
+            if index not in screens:
+                screens[index] = list(self.screen(seed, index))
+
+        segments = {}
+        for col in range(first, last + 1):
+            segment_left = max(left, col * cfg.PLAY_AREA_WIDTH)
+            segment_right = min(right, (col + 1) * cfg.PLAY_AREA_WIDTH)
+            segments[row * cols + col] = Obstacle.create_platform(segment_left, top, segment_right - segment_left)
+        bottom = top + next(iter(segments.values())).height
+
+        # Rien au-dessus de la passerelle ni dedans (toute la course des plateformes mobiles comptée)
+        for index, obstacles in screens.items():
+            kept = []
+            for obs in obstacles:
+                low, high = (obs.min_x, obs.max_x + obs.width) if obs.__class__ is MovingPlatform \
+                    else (obs.x, obs.x + obs.width)
+                if obs.y < bottom and low < right and high > left:
+                    continue
+                kept.append(obs)
+            screens[index] = kept
+        for index, segment in segments.items():
+            screens[index].append(segment)
+
+    def _path_screens(self, door_x: float) -> list[int]:
+        """Écrans couverts par la validation: colonnes du départ à la porte, rangées du haut."""
+        cfg = self.config
+        cols, rows = self.screens()
+        spawn_col = self.spawn_corner()[0] // cfg.PLAY_AREA_WIDTH
+        door_col = min(int(door_x // cfg.PLAY_AREA_WIDTH), cols - 1)
+        first, last = min(spawn_col, door_col), max(spawn_col, door_col)
+        return [row * cols + col for row in range(min(rows, cfg.LEVELGEN_VALIDATE_ROWS))
+                for col in range(first, last + 1)]
+
+    def _start_screens(self) -> list[int]:
+        """Écrans à Config.CHUNK_LOAD_RADIUS écrans ou moins de l'écran de départ."""
+        cfg = self.config
+        cols, rows = self.screens()
+        spawn_col = self.spawn_corner()[0] // cfg.PLAY_AREA_WIDTH
+        radius = cfg.CHUNK_LOAD_RADIUS
+        return [row * cols + col for row in range(min(rows, radius + 1))
+                for col in range(max(0, spawn_col - radius), min(cols, spawn_col + radius + 1))]
+
+    def _jump_arcs(self) -> list[JumpArc]:
+        if self._arcs is None:
+            cfg = self.config
+            max_drop = cfg.PLAY_AREA_HEIGHT * cfg.LEVELGEN_VALIDATE_ROWS
+            self._arcs = [JumpArc.for_player(cfg, speed, jump, max_drop) for _, speed, jump in cfg.PLAYER_STATS]
+        return self._arcs
+
+    def validate(self, door_x: float, door_y: float, screens: dict[int, list[Obstacle]]) -> bool:
+        """
+        True si chaque personnage peut atteindre la porte depuis son point de chute au départ.
+
+        Les surfaces sont les dessus des obstacles (toute la course d'une
+        plateforme mobile) et le sol s'il est couvert : un saut relie deux
+        surfaces si l'arc monte assez haut et franchit l'écart horizontal
+        avant de redescendre à leur hauteur.
+        """
+        cfg = self.config
+        obstacles = [self.spawn_platform()]
+        for screen in screens.values():
+            obstacles.extend(screen)
+        tops = []
+        lefts = []
+        rights = []
+        for obs in obstacles:
+            tops.append(obs.y)
+            if obs.__class__ is MovingPlatform:
+                lefts.append(obs.min_x)
+                rights.append(obs.max_x)
+            else:
+                lefts.append(obs.x)
+                rights.append(obs.x + obs.width)
+        if self.screens()[1] <= cfg.LEVELGEN_VALIDATE_ROWS:
+            tops.append(cfg.LEVEL_HEIGHT - cfg.WALL_THICKNESS)
+            lefts.append(cfg.WALL_THICKNESS)
+            rights.append(cfg.LEVEL_WIDTH - cfg.WALL_THICKNESS)
+        tops = np.array(tops, dtype=float)
+        lefts = np.array(lefts, dtype=float)
+        rights = np.array(rights, dtype=float)
+
+        # Saut de la surface i (ligne) vers la surface j (colonne)
+        rise = tops[:, None] - tops[None, :]
+        gap = np.maximum(0.0, np.maximum(lefts[None, :] - rights[:, None], lefts[:, None] - rights[None, :]))
+        door = Door(x=door_x, y=door_y)
+        spawn_x = self.spawn_corner()[0] + cfg.PLAY_AREA_WIDTH // 2
+
+        for arc, (hitbox_w, hitbox_h) in zip(self._jump_arcs(), cfg.PLAYER_HITBOX_SIZES):
+            half_w = hitbox_w / 2
+            # Point de chute: la plus haute surface sous le joueur (il apparaît tout en haut)
+            feet = cfg.WALL_THICKNESS + hitbox_h + 5
+            below = np.flatnonzero((tops >= feet) & (lefts - half_w <= spawn_x) & (spawn_x <= rights + half_w))
+            if not len(below):
+                return False
+            reached = np.zeros(len(tops), dtype=bool)
+            reached[below[np.argmin(tops[below])]] = True
+
+            edges = arc.reaches(rise, gap)
+            frontier = reached.copy()
+            while frontier.any():
+                frontier = edges[frontier].any(axis=0) & ~reached
+                reached |= frontier
+
+            # Porte: la tête du joueur doit monter jusqu'à son bas, le corps chevaucher sa largeur
+            door_rise = tops - hitbox_h - (door.y + door.height)
+            door_gap = np.maximum(0.0, np.maximum(door.x - half_w - rights, lefts - (door.x + door.width + half_w)))
+            if not (reached & arc.reaches(door_rise, door_gap)).any():
+                return False
+        return True
+
+
+def _cache_path(generator: LevelGenerator, cache_dir: str, base: int) -> str:
+    return os.path.join(cache_dir, f"{base:08x}-{generator.fingerprint():08x}.lvl")
+
+
+def load_or_build(generator: LevelGenerator, base: int, cache_dir: Optional[str] = None) -> LevelLayout:
+    """Niveau validé de graine `base`, relu depuis le cache disque s'il y est (ajouté sinon)."""
+    if cache_dir is None:
+        return generator.build(base)
+    path = _cache_path(generator, cache_dir, base)
+    try:
+        with open(path, 'rb') as f:
+            layout = LevelLayout.from_bytes(f.read())
+        # Nom de fichier et en-tête doivent s'accorder (fichier renommé, collision d'empreinte)
+        if layout.fingerprint == generator.fingerprint() and layout.base == base:
+            try:
+                os.utime(path)  # Utilisé récemment: gardé par prune_cache
+            except OSError:
+                pass
+            return layout
+    except (OSError, ValueError, struct.error):
+        pass
+    layout = generator.build(base)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Écriture atomique: le jeu et le processus de préparation peuvent viser le même fichier
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(layout.to_bytes())
+        os.replace(temporary, path)
+    except OSError:
+        pass
+    return layout
+
+
+def prune_cache(cache_dir: str, keep: int):
+    """Supprime du cache disque les niveaux au-delà des `keep` utilisés le plus récemment."""
+    try:
+        entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith('.lvl')]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for entry in entries[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass  # Déjà supprimé par l'autre processus
+
+
+def build_chain(generator: LevelGenerator, base: int, count: int, cache_dir: Optional[str] = None) -> list[LevelLayout]:
+    """`count` niveaux consécutifs à partir de la graine `base` (tâche du processus de préparation)."""
+    layouts = []
+    for _ in range(count):
+        layout = load_or_build(generator, base, cache_dir)
+        layouts.append(layout)
+        base = next_base(layout.seed)
+    if cache_dir is not None:
+        prune_cache(cache_dir, generator.config.LEVELGEN_CACHE_MAX_FILES)
+    return layouts
+
+
+class LevelPool:
+    """
+    Niveaux validés prêts à jouer, dans l'ordre où ils viendront.
+
+    Le niveau suivant se déduit de la graine du niveau courant (next_base) :
+    dès qu'un niveau est pris, les Config.LEVELGEN_QUEUE suivants sont
+    préparés par un processus de fond (`worker`), puis pris en temps
+    constant. Sans processus de fond, ou si la file ne contient pas la
+    graine demandée (nouvelle partie), le niveau est construit sur place.
+    """
+
+    def __init__(self, generator: LevelGenerator, worker: bool = True, cache_dir: Optional[str] = None):
+        self.generator = generator
+        self.worker = worker
+        self.cache_dir = cache_dir
+        self.size = generator.config.LEVELGEN_QUEUE
+        self.queue: deque[LevelLayout] = deque()
+        self._recent: dict[int, LevelLayout] = {}  # Derniers niveaux pris, par graine demandée (rollbacks)
+        self._tail: Optional[int] = None  # Graine du dernier niveau pris ou mis en file
+        self._future: Optional[Future] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+        if cache_dir is not None:
+            prune_cache(cache_dir, generator.config.LEVELGEN_CACHE_MAX_FILES)
+
+    def take(self, base: int) -> LevelLayout:
+        """Niveau validé de graine `base`: tiré de la file si possible, construit sur place sinon."""
+        layout = self._recent.get(base)
+        if layout is not None:
+            return layout  # Même niveau repris (frames rejouées après un rollback)
+
+        self._collect(wait=self._future is not None and not self.queue and base == self._next())
+        if self.queue and self.queue[0].base == base:
+            layout = self.queue.popleft()
+            self.hits += 1
+        else:
+            layout = load_or_build(self.generator, base, self.cache_dir)
+            self.misses += 1
+            self.queue.clear()
+            self._future = None  # Chaîne d'une autre partie: résultat ignoré
+            self._tail = layout.seed
+
+        self._recent[base] = layout
+        if len(self._recent) > self.size:
+            del self._recent[next(iter(self._recent))]
+        self._refill()
+        return layout
+
+    def _next(self) -> Optional[int]:
+        """Graine demandée du prochain niveau à mettre en file."""
+        return None if self._tail is None else next_base(self._tail)
+
+    def _collect(self, wait: bool = False):
+        """Ajoute à la file les niveaux préparés (en attendant la préparation si `wait`)."""
+        future = self._future
+        if future is None or not (wait or future.done()):
+            return
+        self._future = None
+        try:
+            layouts = future.result()
+        except Exception:
+            # Processus de préparation perdu: les niveaux suivants sont construits sur place
+            self.worker = False
+            return
+        for layout in layouts:
+            if layout.base != self._next():
+                break
+            self.queue.append(layout)
+            self._tail = layout.seed
+
+    def _refill(self):
+        """Lance la préparation des niveaux qui manquent à la file."""
+        self._collect()
+        missing = self.size - len(self.queue)
+        if not self.worker or self._future is not None or missing <= 0 or self._tail is None:
+            return
+        if self._executor is None:
+            # spawn: le processus ne reprend pas l'état de Pygame (fenêtre, son)
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        self._future = self._executor.submit(build_chain, self.generator, self._next(), missing, self.cache_dir)
+
+    def poll(self):
+        """Récupère les niveaux préparés entre deux frames et relance la préparation."""
+        if self._future is not None:
+            self._refill()
+
+    def wait(self):
+        """Attend la fin de la préparation en cours (benchmarks)."""
+        self._collect(wait=True)
+        self._refill()
+
+    def close(self):
+        """Arrête le processus de préparation."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._future = None
+
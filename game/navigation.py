@@ -0,0 +1,163 @@
+"""
+Graphe de navigation des ennemis.
+
+Les noeuds sont les dessus des obstacles (le noeud i est l'obstacle i de la
+liste, comme les index de support d'EnemyStore) et le sol, en dernier. Une
+arête relie deux surfaces qu'un archétype d'ennemi enchaîne en marchant,
+en se laissant tomber ou en sautant, d'après l'arc de sa force de saut et
+de sa vitesse maximale (voir levelgen.JumpArc).
+
+Le graphe est construit une fois par liste d'obstacles (changement de
+niveau, écrans chargés ou déchargés ; une liste restaurée aux mêmes
+surfaces le réutilise) : une plateforme mobile y compte pour
+toute sa course, une fragile comme intacte. La validité au moment du
+passage (position courante de la plateforme, fragile cassée) est vérifiée
+par l'ennemi quand il emprunte l'arête.
+
+Les chemins sont mis en cache par surface cible : un parcours en largeur
+depuis la cible donne d'un coup, pour toutes les surfaces de départ et tous
+les archétypes, la prochaine surface à viser et la distance en arêtes. Le
+cache n'est vidé qu'à la reconstruction du graphe.
+"""
+
+import numpy as np
+from .config import Config
+from .entities import MovingPlatform, Obstacle
+from .levelgen import JumpArc
+
+# Types d'arêtes
+NO_EDGE = 0
+WALK = 1
+FALL = 2
+JUMP = 3
+
+UNREACHABLE = -1  # Prochaine surface / distance quand la cible est hors d'atteinte
+
+
+class NavGraph:
+    """
+    Surfaces et arêtes praticables par archétype d'ennemi.
+
+    `kind[a, i, j]` est le type d'arête de la surface i vers la surface j
+    pour l'archétype a (ligne des tables d'EnemyStore).
+    """
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.top = np.zeros(0)
+        self.left = np.zeros(0)
+        self.right = np.zeros(0)
+        self.kind = np.zeros((0, 0, 0), dtype=np.int8)
+        self.jump_arcs: list[JumpArc] = []
+        self.builds = 0
+        self._source = None  # Liste d'obstacles du graphe (comparée par identité)
+        self._key = None
+        self._paths: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def floor(self) -> int:
+        """Index du noeud du sol."""
+        return len(self.top) - 1
+
+    def build(self, obstacles: list[Obstacle], archetypes: list[tuple[float, float]]):
+        """
+        Construit le graphe (sans effet si les surfaces et les archétypes n'ont pas changé).
+
+        Args:
+            obstacles: obstacles du niveau (ou des écrans simulés)
+            archetypes: (force de saut, vitesse maximale) par ligne d'archétype
+        """
+        key = (len(obstacles), tuple(archetypes))
+        if obstacles is self._source and key == self._key:
+            return
+
+        cfg = self.config
+        count = len(obstacles) + 1
+        top = np.empty(count)
+        left = np.empty(count)
+        right = np.empty(count)
+        for i, obs in enumerate(obstacles):
+            top[i] = obs.y
+            if obs.__class__ is MovingPlatform:
+                left[i] = obs.min_x
+                right[i] = obs.max_x
+            else:
+                left[i] = obs.x
+                right[i] = obs.x + obs.width
+        top[-1] = cfg.LEVEL_HEIGHT - cfg.WALL_THICKNESS
+        left[-1] = cfg.WALL_THICKNESS
+        right[-1] = cfg.LEVEL_WIDTH - cfg.WALL_THICKNESS
+        # Mêmes surfaces dans une autre liste (instantané restauré, rollback): graphe et chemins restent valides
+        same = key == self._key and np.array_equal(top, self.top) and \
+            np.array_equal(left, self.left) and np.array_equal(right, self.right)
+        self._source = obstacles
+        self._key = key
+        if same:
+            return
+        self._paths = {}
+        self.builds += 1
+        self.top = top
+        self.left = left
+        self.right = right
+
+        # De la surface i (ligne) vers la surface j (colonne)
+        rise = top[:, None] - top[None, :]
+        gap = np.maximum(0.0, np.maximum(left[None, :] - right[:, None], left[:, None] - right[None, :]))
+        walk = (np.abs(rise) <= cfg.NAV_WALK_STEP) & (gap <= cfg.NAV_WALK_STEP)
+
+        # Chutes et sauts au plus de quelques écrans: au-delà, la portée est celle de la chute la plus longue
+        max_drop = cfg.PLAY_AREA_HEIGHT * (2 * cfg.CHUNK_NEAR_RADIUS + 1)
+        self.jump_arcs = []
+        self.kind = np.zeros((len(archetypes), count, count), dtype=np.int8)
+        for row, (force, speed) in enumerate(archetypes):
+            jump = JumpArc(cfg, force, speed, 0, max_drop)
+            fall = JumpArc(cfg, 0.0, speed, 0, max_drop)
+            self.jump_arcs.append(jump)
+            kind = self.kind[row]
+            kind[jump.reaches(rise, gap)] = JUMP
+            kind[fall.reaches(rise, gap)] = FALL
+            kind[walk] = WALK
+            np.fill_diagonal(kind, NO_EDGE)
+
+    def paths(self, target: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Chemins vers la surface `target`, pour toutes les surfaces de départ.
+
+        Returns:
+            (prochaine surface, distance en arêtes), deux tableaux
+            (archétype, surface de départ); UNREACHABLE hors d'atteinte
+        """
+        cached = self._paths.get(target)
+        if cached is not None:
+            return cached
+
+        rows, count = self.kind.shape[:2]
+        hops = np.full((rows, count), UNREACHABLE, dtype=np.intp)
+        distance = np.full((rows, count), UNREACHABLE, dtype=np.intp)
+        for row in range(rows):
+            edges = self.kind[row] != NO_EDGE
+            hop = hops[row]
+            dist = distance[row]
+            hop[target] = target
+            dist[target] = 0
+            frontier = np.array([target])
+            steps = 0
+            while len(frontier):
+                steps += 1
+                # Surfaces non atteintes qui ont une arête vers la frontière
+                into = edges[:, frontier]
+                new = np.flatnonzero(into.any(axis=1) & (dist == UNREACHABLE))
+                hop[new] = frontier[np.argmax(into[new], axis=1)]
+                dist[new] = steps
+                frontier = new
+
+        self._paths[target] = (hops, distance)
+        return hops, distance
+
+    def locate(self, x: float, feet: float) -> int:
+        """Surface la plus haute sous le point (x, feet) (le sol par défaut)."""
+        below = (self.top >= feet - self.config.NAV_WALK_STEP) & (self.left <= x) & (x <= self.right)
+        candidates = np.flatnonzero(below)
+        if not len(candidates):
+            return self.floor
+        return int(candidates[np.argmin(self.top[candidates])])
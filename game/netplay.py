@@ -0,0 +1,396 @@
+"""
+Coopération à deux en réseau local, avec rollback.
+
+Chaque pair simule la partie complète. Seules les entrées (un octet par
+frame et par joueur) circulent en UDP. Quand l'entrée du partenaire n'est
+pas encore arrivée, on la prédit (il garde ses boutons) et on avance sans
+attendre. Si la vraie entrée diffère, on restaure l'instantané de la frame
+fautive et on rejoue les frames manquées, sans rendu ni effets
+cosmétiques, avant d'afficher la frame courante (principe de GGPO).
+
+Les pairs échangent aussi l'empreinte d'état (statehash.py) des frames
+définitives : une désynchronisation est signalée avec sa première frame.
+
+Lancer avec:
+    python main.py --host                    # joueur 1, attend sur le port 7777
+    python main.py --join 192.168.1.10       # joueur 2
+"""
+
+import random
+import socket
+import struct
+import time
+from typing import Optional
+import pygame
+from .config import Config
+from .engine import GameEngine, GameState
+
+MAGIC = b'EDNP'
+
+# Paquets: en-tête commun (magic, type), puis le contenu
+_HEADER = struct.Struct('<4s B')
+_HELLO = struct.Struct('<I B ?')  # graine, personnage de l'hôte, accusé de réception
+_INPUTS = struct.Struct('<I B')  # première frame, nombre de masques (suivent, un octet chacun)
+_HASHES = struct.Struct('<I B')  # première frame, nombre d'empreintes (suivent, 8 octets chacune)
+
+PACKET_HELLO = 0
+PACKET_INPUTS = 1
+PACKET_HASHES = 2
+
+
+class UdpTransport:
+    """
+    Socket UDP non bloquante vers un unique partenaire.
+
+    Sans adresse distante (hôte), le partenaire est celui qui envoie le
+    premier paquet.
+    """
+
+    def __init__(self, local_port: int, remote_host: Optional[str] = None, remote_port: int = 0,
+                 bind_host: str = "0.0.0.0"):
+        self.remote = (socket.gethostbyname(remote_host), remote_port) if remote_host else None
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((bind_host, local_port))
+        self.sock.setblocking(False)
+        self.sent = 0
+        self.received = 0
+
+    def send(self, data: bytes):
+        if self.remote is None:
+            return  # Hôte: pas encore de partenaire
+        try:
+            self.sock.sendto(data, self.remote)
+            self.sent += 1
+        except OSError:
+            pass  # Partenaire pas encore à l'écoute: le paquet suivant réessaiera
+
+    def receive(self) -> list[bytes]:
+        """Tous les paquets en attente du partenaire."""
+        packets = []
+        while True:
+            try:
+                data, address = self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            if self.remote is None:
+                self.remote = address
+            if address == self.remote:
+                packets.append(data)
+        self.received += len(packets)
+        return packets
+
+    def close(self):
+        self.sock.close()
+
+
+class RollbackSession:
+    """
+    Synchronise un moteur à deux joueurs avec un pair distant.
+
+    Le moteur doit avoir été créé avec players=2. `local_player` vaut 0 pour
+    l'hôte, 1 pour l'invité.
+    """
+
+    def __init__(self, engine: GameEngine, transport: UdpTransport, local_player: int, config: Config = None):
+        self.engine = engine
+        self.transport = transport
+        self.config = config or engine.config
+        self.local_player = local_player
+        self.remote_player = 1 - local_player
+        self.input_delay = self.config.NETPLAY_INPUT_DELAY
+        self.max_rollback = self.config.NETPLAY_MAX_ROLLBACK
+
+        self.frame = 0  # Prochaine frame à simuler
+        # Les frames couvertes par le délai d'entrée n'ont pas d'entrée: boutons relâchés
+        self.local_inputs: dict[int, int] = {f: 0 for f in range(self.input_delay)}
+        self.remote_inputs: dict[int, int] = {f: 0 for f in range(self.input_delay)}
+        self.confirmed_frame = self.input_delay - 1  # Dernière frame distante connue sans trou
+        self.predicted: dict[int, int] = {}  # Entrées distantes prédites déjà simulées
+        self.snapshots: dict[int, bytes] = {}  # État avant chaque frame non confirmée
+
+        # Empreintes d'état après chaque frame, comparées avec le pair une fois définitives
+        self.hashes: dict[int, int] = {}
+        self.remote_hashes: dict[int, int] = {}
+        self.final_frame = -1  # Dernière frame jouée avec les vraies entrées des deux joueurs
+        self.desync_frame: Optional[int] = None  # Première frame dont l'empreinte diffère du pair
+
+        # Poignée de main
+        self.seed = random.getrandbits(32)
+        self.character = engine.selected_color_index
+        self.peer_hello = False
+        self.peer_acked = False
+
+        # Télémétrie
+        self.rollbacks = 0
+        self.resimulated_frames = 0
+        self.last_rollback_ms = 0.0
+        self.max_rollback_ms = 0.0
+        self.stalls = 0
+
+    # --- Poignée de main ---
+
+    def handshake_step(self) -> bool:
+        """
+        Échange graine et personnage avec le pair (à appeler en boucle).
+
+        L'hôte impose sa graine et son personnage. Retourne True une fois
+        que chacun a reçu le message de l'autre.
+        """
+        self.transport.send(_HEADER.pack(MAGIC, PACKET_HELLO) + _HELLO.pack(self.seed, self.character, self.peer_hello))
+        for packet in self.transport.receive():
+            kind, body = self._parse(packet)
+            if kind == PACKET_HELLO:
+                seed, character, ack = _HELLO.unpack_from(body)
+                if self.local_player == 1:
+                    self.seed = seed
+                    self.character = character
+                self.peer_hello = True
+                self.peer_acked = self.peer_acked or ack
+            elif kind == PACKET_INPUTS:
+                # Le pair a déjà démarré: il a forcément reçu notre message
+                self.peer_acked = True
+                self._store_remote(body)
+        return self.peer_hello and self.peer_acked
+
+    def connect(self, timeout: Optional[float] = None) -> bool:
+        """Attend le pair (bloquant) puis démarre la partie."""
+        timeout = self.config.NETPLAY_HANDSHAKE_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while not self.handshake_step():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        # Quelques accusés de plus si le dernier s'est perdu
+        for _ in range(3):
+            self.transport.send(_HEADER.pack(MAGIC, PACKET_HELLO) + _HELLO.pack(self.seed, self.character, True))
+        self.start()
+        return True
+
+    def start(self):
+        """Démarre la partie commune avec la graine et le personnage de l'hôte."""
+        self.engine.selected_color_index = self.character
+        self.engine.seed(self.seed)
+        self.engine._start_game()
+
+    # --- Boucle ---
+
+    def advance(self, local_mask: int) -> bool:
+        """
+        Avance d'une frame avec l'entrée locale.
+
+        Retourne False si la frame est retenue: trop d'avance sur les entrées
+        confirmées du pair (il faut alors attendre ses paquets).
+        """
+        self.synchronize()
+
+        if self.frame - self.confirmed_frame > self.max_rollback:
+            self.stalls += 1
+            self._send_inputs()  # Au cas où le pair attend nos entrées
+            return False
+
+        self.local_inputs[self.frame + self.input_delay] = local_mask
+        self._send_inputs()
+        self._simulate(self.frame)
+        self.frame += 1
+        self._finalize()
+        self._prune()
+        return True
+
+    def synchronize(self):
+        """Intègre les paquets reçus et rejoue les frames mal prédites."""
+        rollback_from = self._poll()
+        if rollback_from is not None:
+            self._rollback(rollback_from)
+
+    def _simulate(self, frame: int):
+        """Capture l'état puis joue une frame avec les entrées connues ou prédites."""
+        inputs = [0, 0]
+        inputs[self.local_player] = self.local_inputs.get(frame, 0)
+        remote = self.remote_inputs.get(frame)
+        if remote is None:
+            remote = self.remote_inputs[self.confirmed_frame]  # Prédiction: mêmes boutons
+            self.predicted[frame] = remote
+        else:
+            self.predicted.pop(frame, None)
+        inputs[self.remote_player] = remote
+
+        if frame > self.confirmed_frame:
+            self.snapshots[frame] = self.engine.snapshot()
+        self.hashes[frame] = self.engine.tick(inputs)
+
+    def _rollback(self, frame: int):
+        """Revient à `frame` et rejoue jusqu'à la frame courante avec les entrées corrigées."""
+        start = time.perf_counter()
+        self.engine.restore(self.snapshots[frame])
+        self.engine.resimulating = True
+        try:
+            for replayed in range(frame, self.frame):
+                self._simulate(replayed)
+        finally:
+            self.engine.resimulating = False
+
+        self.rollbacks += 1
+        self.resimulated_frames += self.frame - frame
+        self.last_rollback_ms = (time.perf_counter() - start) * 1000
+        self.max_rollback_ms = max(self.max_rollback_ms, self.last_rollback_ms)
+
+    def _poll(self) -> Optional[int]:
+        """Lit les paquets du pair; retourne la première frame mal prédite, s'il y en a."""
+        first_wrong = None
+        for packet in self.transport.receive():
+            kind, body = self._parse(packet)
+            if kind == PACKET_HASHES:
+                self._store_remote_hashes(body)
+                continue
+            if kind != PACKET_INPUTS:
+                continue  # Message de poignée de main en retard
+            for frame in self._store_remote(body):
+                if frame in self.predicted and self.predicted[frame] != self.remote_inputs[frame]:
+                    if first_wrong is None or frame < first_wrong:
+                        first_wrong = frame
+        return first_wrong
+
+    def _store_remote(self, body: bytes) -> list[int]:
+        """Enregistre les entrées d'un paquet; retourne les frames nouvellement connues."""
+        first, count = _INPUTS.unpack_from(body)
+        masks = body[_INPUTS.size:_INPUTS.size + count]
+        new_frames = []
+        for i, mask in enumerate(masks):
+            frame = first + i
+            if frame not in self.remote_inputs and frame > self.confirmed_frame:
+                self.remote_inputs[frame] = mask
+                new_frames.append(frame)
+        while self.confirmed_frame + 1 in self.remote_inputs:
+            self.confirmed_frame += 1
+        return new_frames
+
+    def _send_inputs(self):
+        """Envoie les dernières entrées locales (redondance contre les pertes)."""
+        last = max(self.local_inputs)
+        first = max(min(self.local_inputs), last - self.config.NETPLAY_INPUT_REDUNDANCY + 1)
+        masks = bytes(self.local_inputs[f] for f in range(first, last + 1))
+        self.transport.send(_HEADER.pack(MAGIC, PACKET_INPUTS) + _INPUTS.pack(first, len(masks)) + masks)
+
+    def _finalize(self):
+        """Compare les empreintes des frames devenues définitives et envoie les nôtres."""
+        final = min(self.confirmed_frame, self.frame - 1)
+        if final > self.final_frame:
+            self.final_frame = final
+            self._check_hashes()
+        if self.final_frame >= 0:
+            self._send_hashes()
+
+    def _check_hashes(self):
+        for frame in [f for f in self.remote_hashes if f <= self.final_frame]:
+            remote = self.remote_hashes.pop(frame)
+            local = self.hashes.get(frame)
+            if local is not None and local != remote:
+                if self.desync_frame is None or frame < self.desync_frame:
+                    self.desync_frame = frame
+
+    def _store_remote_hashes(self, body: bytes):
+        first, count = _HASHES.unpack_from(body)
+        hashes = struct.unpack_from(f'<{count}Q', body, _HASHES.size)
+        for i, frame_hash in enumerate(hashes):
+            frame = first + i
+            if frame > self.final_frame - self.config.NETPLAY_HASH_WINDOW:
+                self.remote_hashes[frame] = frame_hash
+        self._check_hashes()
+
+    def _send_hashes(self):
+        """Envoie les empreintes des dernières frames définitives (même redondance que les entrées)."""
+        last = self.final_frame
+        first = max(0, min(self.hashes), last - self.config.NETPLAY_INPUT_REDUNDANCY + 1)
+        hashes = [self.hashes[f] for f in range(first, last + 1)]
+        self.transport.send(
+            _HEADER.pack(MAGIC, PACKET_HASHES) + _HASHES.pack(first, len(hashes))
+            + struct.pack(f'<{len(hashes)}Q', *hashes)
+        )
+
+    def _prune(self):
+        """Oublie instantanés, entrées et empreintes qui ne peuvent plus servir."""
+        for frame in [f for f in self.snapshots if f <= self.confirmed_frame]:
+            del self.snapshots[frame]
+        oldest = min(self.confirmed_frame, self.frame - self.config.NETPLAY_INPUT_REDUNDANCY)
+        for frame in [f for f in self.local_inputs if f < oldest]:
+            del self.local_inputs[frame]
+        # Les entrées distantes peuvent être confirmées avant d'avoir été jouées
+        oldest_remote = min(self.confirmed_frame, self.frame)
+        for frame in [f for f in self.remote_inputs if f < oldest_remote]:
+            del self.remote_inputs[frame]
+        for frame in [f for f in self.predicted if f <= self.confirmed_frame]:
+            del self.predicted[frame]
+        oldest_hash = self.final_frame - self.config.NETPLAY_HASH_WINDOW
+        for frame in [f for f in self.hashes if f < oldest_hash]:
+            del self.hashes[frame]
+
+    @staticmethod
+    def _parse(packet: bytes) -> tuple[Optional[int], bytes]:
+        if len(packet) < _HEADER.size:
+            return None, b''
+        magic, kind = _HEADER.unpack_from(packet)
+        if magic != MAGIC:
+            return None, b''
+        return kind, packet[_HEADER.size:]
+
+    def stats(self) -> dict:
+        """Résumé de la session (rollbacks, frames rejouées, attentes)."""
+        return {
+            'frame': self.frame,
+            'confirmed_frame': self.confirmed_frame,
+            'rollbacks': self.rollbacks,
+            'resimulated_frames': self.resimulated_frames,
+            'last_rollback_ms': self.last_rollback_ms,
+            'max_rollback_ms': self.max_rollback_ms,
+            'stalls': self.stalls,
+            'desync_frame': self.desync_frame,
+        }
+
+
+def run_netplay(peer_host: Optional[str], local_port: int, remote_port: int, config: Config = None):
+    """
+    Lance une partie en coopération (boucle fenêtrée).
+
+    Sans `peer_host`, on héberge (joueur 1) et on attend le premier paquet;
+    sinon on rejoint l'hôte (joueur 2).
+    """
+    engine = GameEngine(config, players=2)
+    engine.init()
+    transport = UdpTransport(local_port, peer_host, remote_port)
+    session = RollbackSession(engine, transport, 0 if peer_host is None else 1)
+
+    print("En attente du partenaire...")
+    if not session.connect():
+        print("Partenaire introuvable.")
+        transport.close()
+        engine.gc_policy.uninstall()
+        pygame.quit()
+        return
+    engine.gc_policy.on_state_change(True)
+
+    engine.running = True
+    desync_reported = False
+    while engine.running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                engine.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                engine.running = False  # Pas de pause en réseau: Échap quitte
+
+        # En fin de partie, on continue d'avancer pour l'animation de game over
+        playing = engine.state == GameState.PLAYING
+        session.advance(engine.read_input() if playing else 0)
+        if session.desync_frame is not None and not desync_reported:
+            desync_reported = True
+            print(f"Désynchronisation avec le partenaire à la frame {session.desync_frame}")
+
+        if engine.state == GameState.GAME_OVER:
+            engine.render_game_over()
+        else:
+            engine.render()
+        engine.clock.tick(engine.config.FPS)
+
+    print(session.stats())
+    transport.close()
+    engine.gc_policy.uninstall()
+    pygame.quit()
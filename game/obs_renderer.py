@@ -0,0 +1,100 @@
+"""
+Rendu basse résolution pour les observations en pixels.
+
+Les agents qui apprennent sur des pixels n'ont besoin ni des sprites ni de
+la fenêtre 1520x940 : ObservationRenderer dessine le niveau entier dans une
+petite surface hors écran (120x80 par défaut), chaque classe d'entité en
+aplat d'une couleur fixe (Config.OBS_COLORS). La surface est exposée comme
+tableau NumPy (largeur, hauteur, 3) par pygame.surfarray.pixels3d, sans
+copie : le tableau reflète chaque nouveau rendu.
+
+La surface reste verrouillée tant que la vue existe : on peut la remplir et
+y dessiner, mais pas la blitter ailleurs (copier `pixels` pour l'afficher).
+"""
+
+import pygame
+from .config import Config
+from .entities import FragilePlatform, MovingPlatform
+
+
+class ObservationRenderer:
+    """Rasterise l'état du moteur en aplats de couleurs par classe."""
+
+    def __init__(self, config: Config = None, size: tuple[int, int] = None):
+        self.config = config or Config()
+        self.size = size or self.config.OBS_RENDER_SIZE
+        width, height = self.size
+        self.scale_x = width / self.config.LEVEL_WIDTH
+        self.scale_y = height / self.config.LEVEL_HEIGHT
+        self.colors = self.config.OBS_COLORS
+
+        self.surface = pygame.Surface(self.size, depth=24)
+        self.pixels = pygame.surfarray.pixels3d(self.surface)  # Vue sans copie, (largeur, hauteur, 3)
+
+        # Fond et murs: dessinés une fois, recopiés à chaque frame
+        self._background = pygame.Surface(self.size, depth=24)
+        self._background.fill(self.colors['background'])
+        wall_x = max(1, round(self.config.WALL_THICKNESS * self.scale_x))
+        wall_y = max(1, round(self.config.WALL_THICKNESS * self.scale_y))
+        wall = self.colors['wall']
+        self._background.fill(wall, (0, 0, width, wall_y))
+        self._background.fill(wall, (0, height - wall_y, width, wall_y))
+        self._background.fill(wall, (0, 0, wall_x, height))
+        self._background.fill(wall, (width - wall_x, 0, wall_x, height))
+        self._background_pixels = pygame.surfarray.pixels3d(self._background)
+
+    def render(self, engine):
+        """Dessine la frame courante du moteur; retourne la vue `pixels`."""
+        colors = self.colors
+        surface = self.surface
+        fill = surface.fill
+        self.pixels[...] = self._background_pixels
+
+        for obs in engine.obstacles:
+            if not obs.is_solid():
+                continue
+            if obs.__class__ is MovingPlatform:
+                color = colors['moving_platform']
+            elif obs.__class__ is FragilePlatform:
+                color = colors['fragile_platform']
+            else:
+                color = colors['platform']
+            fill(color, self._rect(obs.x, obs.y, obs.width, obs.height))
+
+        door = engine.door
+        if door is not None and door.active:
+            fill(colors['door'], self._rect(door.x, door.y, door.width, door.height))
+
+        for heart in engine.heart_pickups:
+            if heart.active:
+                size = heart.size
+                fill(colors['heart'], self._rect(heart.x - size, heart.y - size, 2 * size, 2 * size))
+
+        ellipse = pygame.draw.ellipse
+        enemy_colors = colors['enemy']
+        for enemy in engine.ai_balls:
+            color = enemy_colors[min(enemy.hp, len(enemy_colors)) - 1]
+            ellipse(surface, color, self._rect(enemy.x - enemy.half_w, enemy.y - enemy.half_h,
+                                               enemy.hitbox_width, enemy.hitbox_height))
+
+        for i, ball in enumerate(engine.players):
+            color = colors['player'] if i == 0 else colors['partner']
+            ellipse(surface, color, self._rect(ball.x - ball.half_w, ball.y - ball.half_h,
+                                               ball.hitbox_width, ball.hitbox_height))
+
+        for missile in engine.missiles:
+            if missile.active:
+                fill(colors['missile'], self._rect(missile.x, missile.y, missile.width, missile.height))
+
+        bullets = engine.enemy_bullets
+        r = bullets.radius
+        for x, y in zip(bullets.x.tolist(), bullets.y.tolist()):
+            fill(colors['bullet'], self._rect(x - r, y - r, 2 * r, 2 * r))
+
+        return self.pixels
+
+    def _rect(self, x: float, y: float, width: float, height: float) -> tuple[int, int, int, int]:
+        """Rectangle du niveau en pixels de l'observation (au moins 1x1)."""
+        sx = self.scale_x
+        sy = self.scale_y
+        return int(x * sx), int(y * sy), max(1, round(width * sx)), max(1, round(height * sy))
@@ -10,7 +10,7 @@ from dataclasses import dataclass, field
 from .config import Config
 
 
-@dataclass
+@dataclass(slots=True)
 class Particle:
     """Une particule individuelle."""
 
@@ -51,9 +51,16 @@ class Particle:
 class ParticleSystem:
     """Gestionnaire de toutes les particules."""
 
-    def __init__(self, config: Config = None):
+    def __init__(self, config: Config = None, seed: int = None):
         self.config = config or Config()
         self.particles: list[Particle] = []
+        self.rng = random.Random(seed)  # Aléa propre: n'influence pas la simulation
+        self.enabled = True  # False en mode headless: aucune particule créée
+        self.budget = self.config.PARTICLE_BUDGET  # Particules vivantes au maximum
+
+    def _room(self, count: int) -> int:
+        """Nombre de particules créables sur `count` demandées sans dépasser le budget."""
+        return max(0, min(count, self.budget - len(self.particles)))
 
     def spawn_explosion(self, x: float, y: float, intensity: float = 1.0):
         """
@@ -64,13 +71,15 @@ class ParticleSystem:
             y: Position Y de l'explosion
             intensity: Multiplicateur d'intensité (vitesse des impacts)
         """
+        if not self.enabled:
+            return
         cfg = self.config
         count = int(cfg.PARTICLE_COUNT * min(intensity, 2.0))
 
-        for _ in range(count):
+        for _ in range(self._room(count)):
             # Angle aléatoire
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(
                 cfg.PARTICLE_SPEED_MIN,
                 cfg.PARTICLE_SPEED_MAX
             ) * intensity
@@ -80,16 +89,16 @@ class ParticleSystem:
                 y=y,
                 vx=math.cos(angle) * speed,
                 vy=math.sin(angle) * speed,
-                lifetime=random.randint(
+                lifetime=self.rng.randint(
                     cfg.PARTICLE_LIFETIME // 2,
                     cfg.PARTICLE_LIFETIME
                 ),
                 max_lifetime=cfg.PARTICLE_LIFETIME,
-                size=random.uniform(
+                size=self.rng.uniform(
                     cfg.PARTICLE_SIZE_MIN,
                     cfg.PARTICLE_SIZE_MAX
                 ),
-                color=random.choice(cfg.PARTICLE_COLORS)
+                color=self.rng.choice(cfg.PARTICLE_COLORS)
             )
             self.particles.append(particle)
 
@@ -109,14 +118,16 @@ class ParticleSystem:
             direction_x, direction_y: Direction normale de l'impact
             intensity: Force de l'impact
         """
+        if not self.enabled:
+            return
         cfg = self.config
         count = int(cfg.PARTICLE_COUNT * min(intensity, 2.0))
 
-        for _ in range(count):
+        for _ in range(self._room(count)):
             # Angle basé sur la direction avec dispersion
             base_angle = math.atan2(direction_y, direction_x)
-            angle = base_angle + random.uniform(-0.8, 0.8)
-            speed = random.uniform(
+            angle = base_angle + self.rng.uniform(-0.8, 0.8)
+            speed = self.rng.uniform(
                 cfg.PARTICLE_SPEED_MIN,
                 cfg.PARTICLE_SPEED_MAX
             ) * intensity
@@ -126,16 +137,16 @@ class ParticleSystem:
                 y=y,
                 vx=math.cos(angle) * speed,
                 vy=math.sin(angle) * speed,
-                lifetime=random.randint(
+                lifetime=self.rng.randint(
                     cfg.PARTICLE_LIFETIME // 2,
                     cfg.PARTICLE_LIFETIME
                 ),
                 max_lifetime=cfg.PARTICLE_LIFETIME,
-                size=random.uniform(
+                size=self.rng.uniform(
                     cfg.PARTICLE_SIZE_MIN,
                     cfg.PARTICLE_SIZE_MAX
                 ),
-                color=random.choice(cfg.PARTICLE_COLORS)
+                color=self.rng.choice(cfg.PARTICLE_COLORS)
             )
             self.particles.append(particle)
 
@@ -155,24 +166,26 @@ class ParticleSystem:
             x, y: Position de la boule
             radius: Rayon de la boule
         """
+        if not self.enabled:
+            return
         cfg = self.config
         count = cfg.DOUBLE_JUMP_PARTICLE_COUNT
 
-        for i in range(count):
+        for i in range(self._room(count)):
             # Répartition uniforme en cercle
             angle = (2 * math.pi * i) / count
             # Les particules partent vers l'extérieur et légèrement vers le bas
-            speed = random.uniform(3, 5)
+            speed = self.rng.uniform(3, 5)
 
             particle = Particle(
                 x=x + math.cos(angle) * radius,
                 y=y + math.sin(angle) * radius,
                 vx=math.cos(angle) * speed,
                 vy=math.sin(angle) * speed * 0.5 + 1,  # Légère tendance vers le bas
-                lifetime=random.randint(15, 25),
+                lifetime=self.rng.randint(15, 25),
                 max_lifetime=25,
-                size=random.uniform(3, 5),
-                color=random.choice(cfg.DOUBLE_JUMP_PARTICLE_COLORS)
+                size=self.rng.uniform(3, 5),
+                color=self.rng.choice(cfg.DOUBLE_JUMP_PARTICLE_COLORS)
             )
             self.particles.append(particle)
 
@@ -184,22 +197,24 @@ class ParticleSystem:
             x, y: Point de collision
             intensity: Force de l'impact
         """
+        if not self.enabled:
+            return
         cfg = self.config
         count = int(8 * min(intensity, 2.0))
 
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 4) * intensity
+        for _ in range(self._room(count)):
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(2, 4) * intensity
 
             particle = Particle(
                 x=x,
                 y=y,
                 vx=math.cos(angle) * speed,
                 vy=math.sin(angle) * speed,
-                lifetime=random.randint(10, 20),
+                lifetime=self.rng.randint(10, 20),
                 max_lifetime=20,
-                size=random.uniform(2, 4),
-                color=random.choice([
+                size=self.rng.uniform(2, 4),
+                color=self.rng.choice([
                     (255, 255, 255),
                     (200, 220, 255),
                     (255, 220, 200),
@@ -214,17 +229,19 @@ class ParticleSystem:
         Args:
             x, y: Position du missile
         """
+        if not self.enabled:
+            return
         # Petite trainée de fumée jaune
-        for _ in range(2):
+        for _ in range(self._room(2)):
             particle = Particle(
                 x=x,
                 y=y,
-                vx=random.uniform(-0.5, 0.5),
-                vy=random.uniform(-0.5, 0.5),
-                lifetime=random.randint(8, 15),
+                vx=self.rng.uniform(-0.5, 0.5),
+                vy=self.rng.uniform(-0.5, 0.5),
+                lifetime=self.rng.randint(8, 15),
                 max_lifetime=15,
-                size=random.uniform(2, 3),
-                color=random.choice([
+                size=self.rng.uniform(2, 3),
+                color=self.rng.choice([
                     (255, 255, 100),
                     (255, 200, 50),
                     (255, 150, 0),
@@ -240,14 +257,16 @@ class ParticleSystem:
             x, y: Position de l'ennemi détruit
             color: Couleur de l'ennemi pour les particules
         """
+        if not self.enabled:
+            return
         count = 20
 
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(3, 8)
+        for _ in range(self._room(count)):
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(3, 8)
 
             # Mélanger la couleur de l'ennemi avec du blanc/jaune
-            particle_color = random.choice([
+            particle_color = self.rng.choice([
                 color,
                 (255, 255, 255),
                 (255, 255, 100),
@@ -259,9 +278,9 @@ class ParticleSystem:
                 y=y,
                 vx=math.cos(angle) * speed,
                 vy=math.sin(angle) * speed,
-                lifetime=random.randint(15, 30),
+                lifetime=self.rng.randint(15, 30),
                 max_lifetime=30,
-                size=random.uniform(2, 5),
+                size=self.rng.uniform(2, 5),
                 color=particle_color
             )
             self.particles.append(particle)
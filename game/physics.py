@@ -5,10 +5,12 @@ Gère la gravité, les collisions et les rebonds.
 """
 
 from dataclasses import dataclass
+from typing import Optional
+import numpy as np
 from .config import Config
 
 
-@dataclass
+@dataclass(slots=True)
 class Vector2:
     """Vecteur 2D pour positions et vélocités."""
     x: float
@@ -59,8 +61,8 @@ class PhysicsEngine:
             vx = -vx * bounce
             on_wall = -1
 
-        if x + half_w > cfg.PLAY_AREA_WIDTH - wall:
-            x = cfg.PLAY_AREA_WIDTH - wall - half_w
+        if x + half_w > cfg.LEVEL_WIDTH - wall:
+            x = cfg.LEVEL_WIDTH - wall - half_w
             vx = -vx * bounce
             on_wall = 1
 
@@ -68,8 +70,8 @@ class PhysicsEngine:
             y = wall + half_h
             vy = -vy * bounce
 
-        if y + half_h > cfg.PLAY_AREA_HEIGHT - wall:
-            y = cfg.PLAY_AREA_HEIGHT - wall - half_h
+        if y + half_h > cfg.LEVEL_HEIGHT - wall:
+            y = cfg.LEVEL_HEIGHT - wall - half_h
             vy = 0
             on_ground = True
 
@@ -122,6 +124,120 @@ class PhysicsEngine:
 
         return x, y, vx, vy, False, False
 
+    def check_wall_collision_ellipse_batch(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        half_w: np.ndarray,
+        half_h: np.ndarray,
+        vx: np.ndarray,
+        vy: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Version par lots de check_wall_collision_ellipse.
+
+        Returns:
+            (x, y, vx, vy, on_ground, on_wall) sous forme de tableaux
+        """
+        cfg = self.config
+        bounce = cfg.BOUNCE_FACTOR
+        wall = cfg.WALL_THICKNESS
+
+        left = x - half_w < wall
+        x = np.where(left, wall + half_w, x)
+        vx = np.where(left, -vx * bounce, vx)
+
+        right = x + half_w > cfg.LEVEL_WIDTH - wall
+        x = np.where(right, cfg.LEVEL_WIDTH - wall - half_w, x)
+        vx = np.where(right, -vx * bounce, vx)
+
+        top = y - half_h < wall
+        y = np.where(top, wall + half_h, y)
+        vy = np.where(top, -vy * bounce, vy)
+
+        bottom = y + half_h > cfg.LEVEL_HEIGHT - wall
+        y = np.where(bottom, cfg.LEVEL_HEIGHT - wall - half_h, y)
+        vy = np.where(bottom, 0.0, vy)
+
+        on_wall = np.where(right, 1, np.where(left, -1, 0))
+        return x, y, vx, vy, bottom, on_wall
+
+    def check_rect_collision_ellipse_batch(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        half_w: np.ndarray,
+        half_h: np.ndarray,
+        vx: np.ndarray,
+        vy: np.ndarray,
+        rect_x,
+        rect_y,
+        rect_w,
+        rect_h,
+        mask: Optional[np.ndarray] = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Version par lots de check_rect_collision_ellipse.
+
+        Le rectangle peut être commun (scalaires) ou propre à chaque ellipse
+        (tableaux). Si `mask` est donné, seules les ellipses du masque sont résolues.
+
+        Returns:
+            (x, y, vx, vy, hit, on_top) sous forme de tableaux
+        """
+        closest_x = np.clip(x, rect_x, rect_x + rect_w)
+        closest_y = np.clip(y, rect_y, rect_y + rect_h)
+        ndx = (x - closest_x) / np.maximum(half_w, 1e-6)
+        ndy = (y - closest_y) / np.maximum(half_h, 1e-6)
+        distance_sq = ndx * ndx + ndy * ndy
+
+        hit = distance_sq < 1.0
+        if mask is not None:
+            hit &= mask
+        if not hit.any():
+            return x, y, vx, vy, hit, hit
+
+        distance = np.where(distance_sq > 0, np.sqrt(distance_sq), 1e-6)
+        nx = ndx / distance
+        ny = ndy / distance
+        overlap = 1.0 - distance
+
+        x = np.where(hit, x + nx * overlap * half_w, x)
+        y = np.where(hit, y + ny * overlap * half_h, y)
+
+        horizontal = np.abs(nx * half_w) > np.abs(ny * half_h)
+        vx = np.where(hit & horizontal, -vx * self.config.BOUNCE_FACTOR, vx)
+        vy = np.where(hit & ~horizontal, 0.0, vy)
+        return x, y, vx, vy, hit, hit & (ny < -0.5)
+
+    def check_rects_collision_ellipse_batch(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        half_w: np.ndarray,
+        half_h: np.ndarray,
+        vx: np.ndarray,
+        vy: np.ndarray,
+        rects: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Résout toutes les ellipses contre une liste de rectangles (x, y, w, h).
+
+        Les rectangles sont traités dans l'ordre, comme une boucle d'appels scalaires.
+
+        Returns:
+            (x, y, vx, vy, hit, on_top) où hit/on_top cumulent tous les rectangles
+        """
+        hit_any = np.zeros(len(x), dtype=bool)
+        on_top_any = np.zeros(len(x), dtype=bool)
+        for rect_x, rect_y, rect_w, rect_h in np.asarray(rects, dtype=float).reshape(-1, 4).tolist():
+            x, y, vx, vy, hit, on_top = self.check_rect_collision_ellipse_batch(
+                x, y, half_w, half_h, vx, vy, rect_x, rect_y, rect_w, rect_h
+            )
+            hit_any |= hit
+            on_top_any |= on_top
+        return x, y, vx, vy, hit_any, on_top_any
+
     def check_ellipse_collision(
         self,
         x1: float, y1: float, hw1: float, hh1: float, vx1: float, vy1: float, m1: float,
@@ -229,3 +345,123 @@ class PhysicsEngine:
             x1, y1, r1, r1, vx1, vy1, m1,
             x2, y2, r2, r2, vx2, vy2, m2
         )
+
+    @staticmethod
+    def sweep_rect(
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        dx: float,
+        dy: float,
+        rect_x: float,
+        rect_y: float,
+        rect_w: float,
+        rect_h: float
+    ) -> Optional[float]:
+        """
+        Collision continue d'un rectangle mobile contre un rectangle fixe (swept AABB).
+
+        Le rectangle (x, y, width, height) se déplace de (dx, dy) pendant la frame.
+
+        Returns:
+            Temps d'impact dans [0, 1] (0 si déjà en contact), None si aucun contact.
+        """
+        # Rayon depuis le coin du rectangle mobile contre le rectangle fixe élargi
+        t_enter = 0.0
+        t_exit = 1.0
+        for start, delta, low, high in (
+            (x, dx, rect_x - width, rect_x + rect_w),
+            (y, dy, rect_y - height, rect_y + rect_h),
+        ):
+            if delta == 0:
+                if start <= low or start >= high:
+                    return None
+                continue
+
+            t0 = (low - start) / delta
+            t1 = (high - start) / delta
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_enter = max(t_enter, t0)
+            t_exit = min(t_exit, t1)
+            if t_enter >= t_exit:
+                return None
+
+        return t_enter
+
+    @staticmethod
+    def sweep_ellipse(
+        x: float,
+        y: float,
+        dx: float,
+        dy: float,
+        center_x: float,
+        center_y: float,
+        half_w: float,
+        half_h: float
+    ) -> Optional[float]:
+        """
+        Collision continue d'un point mobile (rayon) contre une ellipse.
+
+        Le point part de (x, y) et se déplace de (dx, dy) pendant la frame.
+
+        Returns:
+            Temps d'impact dans [0, 1] (0 si déjà dedans), None si aucun contact.
+        """
+        # Dans l'espace normalisé de l'ellipse, l'ellipse devient le cercle unité
+        px = (x - center_x) / max(half_w, 1e-6)
+        py = (y - center_y) / max(half_h, 1e-6)
+        qx = dx / max(half_w, 1e-6)
+        qy = dy / max(half_h, 1e-6)
+
+        c = px * px + py * py - 1.0
+        if c < 0:
+            return 0.0
+
+        a = qx * qx + qy * qy
+        if a == 0:
+            return None
+
+        b = 2.0 * (px * qx + py * qy)
+        discriminant = b * b - 4.0 * a * c
+        if discriminant < 0:
+            return None
+
+        t = (-b - discriminant ** 0.5) / (2.0 * a)
+        if 0.0 <= t <= 1.0:
+            return t
+        return None
+
+    @staticmethod
+    def sweep_ellipse_batch(
+        x: np.ndarray,
+        y: np.ndarray,
+        dx: np.ndarray,
+        dy: np.ndarray,
+        center_x: float,
+        center_y: float,
+        half_w: float,
+        half_h: float
+    ) -> np.ndarray:
+        """
+        Version vectorisée de sweep_ellipse pour des milliers de points.
+
+        Returns:
+            Pour chaque point, True si son trajet de la frame touche l'ellipse.
+        """
+        inv_w = 1.0 / max(half_w, 1e-6)
+        inv_h = 1.0 / max(half_h, 1e-6)
+        px = (x - center_x) * inv_w
+        py = (y - center_y) * inv_h
+        qx = dx * inv_w
+        qy = dy * inv_h
+
+        c = px * px + py * py - 1.0
+        a = qx * qx + qy * qy
+        b = 2.0 * (px * qx + py * qy)
+        discriminant = b * b - 4.0 * a * c
+        moving = (a > 0) & (discriminant >= 0)
+        t = np.full(len(px), -1.0)
+        t[moving] = (-b[moving] - np.sqrt(discriminant[moving])) / (2.0 * a[moving])
+        return (c < 0) | ((t >= 0.0) & (t <= 1.0))
@@ -0,0 +1,177 @@
+"""
+Moteur de projectiles ennemis.
+
+Toutes les bulles ennemies d'un monde vivent dans un BulletField : des
+tableaux NumPy (positions, vitesses, positions de début de frame) mis à jour
+d'un bloc. Déplacement, sortie de l'arène, impacts sur les obstacles (grille
+de distance précalculée, voir grid.py) et touches sur les joueurs sont
+vectorisés, ce qui tient des milliers de bulles par frame.
+
+Les motifs de tir (Config.FIRE_PATTERNS) décrivent les salves :
+    single : une bulle, vers la cible (droit devant sans cible)
+    fan    : éventail de `count` bulles centré sur la cible
+    (`aimed` : la salve vise le joueur le plus proche, s'il est en vue)
+    radial : couronne de `count` bulles
+    spiral : couronne qui tourne de `spin` radians par frame, tirée en
+             rafale de `burst` salves espacées de `burst_interval` frames
+"""
+
+import math
+from typing import Optional
+import numpy as np
+from .config import Config
+from .entities import Obstacle
+from .grid import ObstacleGrid
+from .physics import PhysicsEngine
+
+_COLUMNS = ('x', 'y', 'vx', 'vy', 'prev_x', 'prev_y')
+
+
+class BulletField:
+    """
+    Bulles ennemies stockées en colonnes (une ligne par bulle, ordre de tir).
+
+    Les tableaux sont toujours à la taille exacte : une bulle retirée est
+    supprimée de toutes les colonnes, l'ordre des survivantes est conservé.
+    """
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.radius = self.config.ENEMY_BULLET_RADIUS
+        self.grid = ObstacleGrid(self.config)
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def clear(self):
+        """Retire toutes les bulles."""
+        for name in _COLUMNS:
+            setattr(self, name, np.zeros(0))
+
+    def spawn(self, x: float, y: float, vx, vy):
+        """Ajoute des bulles parties de (x, y), une par vitesse (scalaires ou tableaux)."""
+        vx = np.atleast_1d(np.asarray(vx, dtype=float))
+        vy = np.atleast_1d(np.asarray(vy, dtype=float))
+        x = np.full(len(vx), float(x))
+        y = np.full(len(vx), float(y))
+        self.x = np.concatenate((self.x, x))
+        self.y = np.concatenate((self.y, y))
+        self.vx = np.concatenate((self.vx, vx))
+        self.vy = np.concatenate((self.vy, vy))
+        self.prev_x = np.concatenate((self.prev_x, x))
+        self.prev_y = np.concatenate((self.prev_y, y))
+
+    def keep(self, mask: np.ndarray):
+        """Ne garde que les bulles où `mask` est vrai."""
+        for name in _COLUMNS:
+            setattr(self, name, getattr(self, name)[mask])
+
+    def remove(self, index):
+        """Retire les bulles d'index donnés."""
+        mask = np.ones(len(self.x), dtype=bool)
+        mask[index] = False
+        self.keep(mask)
+
+    def update(self, obstacles: list[Obstacle], bounds: Optional[tuple[float, float, float, float]] = None,
+               grid: Optional[ObstacleGrid] = None):
+        """
+        Déplace toutes les bulles et retire celles sorties de l'arène ou entrées dans un obstacle.
+
+        `bounds` (gauche, haut, droite, bas) restreint la zone où les bulles
+        survivent (écrans simulés en détail, voir chunks.py). `grid` est la
+        grille partagée du moteur, la grille propre du champ par défaut.
+        """
+        if not len(self.x):
+            return
+        cfg = self.config
+        r = self.radius
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.x = self.x + self.vx
+        self.y = self.y + self.vy
+        x = self.x
+        y = self.y
+
+        wall = cfg.WALL_THICKNESS
+        left, top, right, bottom = bounds or (0, 0, cfg.LEVEL_WIDTH, cfg.LEVEL_HEIGHT)
+        dead = (x < max(left, wall) - r) | (x > min(right, cfg.LEVEL_WIDTH - wall) + r) | \
+            (y < max(top, wall) - r) | (y > min(bottom, cfg.LEVEL_HEIGHT - wall) + r)
+
+        # Obstacles fixes et fragiles: une lecture de grille; mobiles: test de boîte direct
+        grid = grid or self.grid
+        grid.build(obstacles, bounds)
+        dead |= grid.query(x, y, r)
+        for obs in grid.dynamic:
+            if not obs.is_solid():
+                continue
+            dead |= (x > obs.x - r) & (x < obs.x + obs.width + r) & \
+                (y > obs.y - r) & (y < obs.y + obs.height + r)
+
+        if dead.any():
+            self.keep(~dead)
+
+    def sweep_hits(self, center_x: float, center_y: float, half_w: float, half_h: float) -> np.ndarray:
+        """Index des bulles dont le trajet de la frame touche une hitbox elliptique."""
+        if not len(self.x):
+            return np.zeros(0, dtype=np.intp)
+        r = self.radius
+        hit = PhysicsEngine.sweep_ellipse_batch(
+            self.prev_x, self.prev_y, self.x - self.prev_x, self.y - self.prev_y,
+            center_x, center_y, half_w + r, half_h + r
+        )
+        return np.flatnonzero(hit)
+
+    def first_within(self, x: float, y: float, reach: float) -> Optional[int]:
+        """Index de la première bulle (ordre de tir) à moins de `reach` + rayon de (x, y), None sinon."""
+        if not len(self.x):
+            return None
+        limit = self.radius + reach
+        dx = self.x - x
+        dy = self.y - y
+        close = np.flatnonzero(dx * dx + dy * dy < limit * limit)
+        return int(close[0]) if len(close) else None
+
+    def quantized(self, quantum: int) -> list[int]:
+        """Positions quantifiées, x puis y (empreinte d'état)."""
+        if not len(self.x):
+            return []
+        return (np.concatenate((self.x, self.y)) * quantum).astype(np.int64).tolist()
+
+    def columns(self) -> tuple[np.ndarray, ...]:
+        """Colonnes d'état, dans l'ordre de _COLUMNS (instantanés)."""
+        return tuple(getattr(self, name) for name in _COLUMNS)
+
+    def set_columns(self, columns):
+        """Remplace l'état par des colonnes capturées par columns()."""
+        for name, values in zip(_COLUMNS, columns):
+            setattr(self, name, np.asarray(values, dtype=float))
+
+
+def pattern_velocities(pattern: dict, facing: int, aim: Optional[float], frame: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vitesses des bulles d'une salve.
+
+    Args:
+        pattern: motif de Config.FIRE_PATTERNS
+        facing: sens du regard du tireur (1 ou -1)
+        aim: angle vers la cible (radians), None sans cible
+        frame: frame courante (rotation des spirales)
+    """
+    speed = pattern['speed']
+    kind = pattern['kind']
+    if kind == 'single':
+        if aim is None:
+            return np.array([speed * facing]), np.zeros(1)
+        return np.array([speed * math.cos(aim)]), np.array([speed * math.sin(aim)])
+
+    count = pattern.get('count', 1)
+    if kind == 'fan':
+        base = aim if aim is not None else (0.0 if facing > 0 else math.pi)
+        angles = base + pattern['spread'] * (np.arange(count) - (count - 1) / 2)
+    elif kind in ('radial', 'spiral'):
+        phase = frame * pattern.get('spin', 0.0) if kind == 'spiral' else 0.0
+        angles = phase + (2 * math.pi / count) * np.arange(count)
+    else:
+        raise ValueError(f"Motif de tir inconnu: {kind}")
+    return speed * np.cos(angles), speed * np.sin(angles)
@@ -6,9 +6,11 @@ Gère l'affichage de tous les éléments visuels.
 
 import pygame
 from pathlib import Path
+from .camera import Camera
 from .config import Config
-from .entities import Ball, Obstacle, FragilePlatform, AIBall, Missile
+from .entities import Ball, Obstacle, FragilePlatform, MovingPlatform, AIBall, Missile
 from .particles import ParticleSystem
+from .spatial import SpatialHash
 
 
 class Renderer:
@@ -26,8 +28,39 @@ class Renderer:
         self.bullet_sprite = None
         self.bullet_super_sprite = None
         self.enemy_bullet_sprite = None
+        self._scaled_sprites = {}  # (image, largeur, hauteur, retournée, prémultipliée) -> sprite prêt à blitter
+        self._fonts = {}  # Taille -> police
+        self._texts = {}  # (taille, texte, couleur) -> texte rendu (le HUD change rarement)
+        self.camera = Camera(self.config)
+        self._ox = 0  # Translation monde -> écran de la frame (voir begin_world)
+        self._oy = 0
+        self._view = (0.0, 0.0, 0.0, 0.0)  # Vue en coordonnées du niveau: gauche, haut, droite, bas
+        self._obstacle_index = SpatialHash(self.config.SPATIAL_CELL_SIZE)
+        self._indexed_obstacles = None  # Liste d'obstacles rangée dans l'index
+        self._indexed_count = 0
         self._load_assets()
 
+    def _scaled(self, image: pygame.Surface, width: int, height: int, flipped: bool,
+                premultiplied: bool = False) -> pygame.Surface:
+        """
+        Sprite redimensionné (et retourné) une seule fois, puis réutilisé à chaque frame.
+
+        Un sprite prémultiplié se blitte avec BLEND_PREMULTIPLIED, plus rapide
+        que le mélange alpha classique pour les grands lots.
+        """
+        key = (id(image), width, height, flipped, premultiplied)
+        sprite = self._scaled_sprites.get(key)
+        if sprite is None:
+            sprite = image
+            if sprite.get_size() != (width, height):
+                sprite = pygame.transform.smoothscale(sprite, (width, height))
+            if flipped:
+                sprite = pygame.transform.flip(sprite, True, False)
+            if premultiplied:
+                sprite = sprite.premul_alpha()
+            self._scaled_sprites[key] = sprite
+        return sprite
+
     def _safe_load_scaled(self, path: Path, size: tuple[int, int]):
         """Charge et redimensionne une image PNG avec alpha."""
         try:
@@ -36,6 +69,19 @@ class Renderer:
         except Exception:
             return None
 
+    def _text(self, size: int, text: str, color: tuple) -> pygame.Surface:
+        """Texte rendu avec la police par défaut, gardé en cache d'une frame à l'autre."""
+        key = (size, text, color)
+        surface = self._texts.get(key)
+        if surface is None:
+            font = self._fonts.get(size)
+            if font is None:
+                font = self._fonts[size] = pygame.font.Font(None, size)
+            if len(self._texts) >= 512:
+                self._texts.clear()  # Textes qui varient (vitesse, énergie): repartir de zéro
+            surface = self._texts[key] = font.render(text, True, color)
+        return surface
+
     def _load_assets(self):
         """Charge les images (fond, persos, ennemis)."""
         cfg = self.config
@@ -108,25 +154,50 @@ class Renderer:
         if self.background_image:
             self.screen.blit(self.background_image, (0, 0))
 
+    def begin_world(self):
+        """
+        Prépare le dessin du niveau: translation de la caméra et découpe sur l'aire de jeu.
+
+        Les fonctions draw_* suivantes prennent des coordonnées du niveau et
+        écartent ce qui sort de la vue; end_world() rend l'écran entier au HUD.
+        """
+        cfg = self.config
+        self._ox, self._oy = self.camera.offset
+        self._view = (self._ox, self._oy, self._ox + cfg.PLAY_AREA_WIDTH, self._oy + cfg.PLAY_AREA_HEIGHT)
+        self.screen.set_clip((0, 0, cfg.PLAY_AREA_WIDTH, cfg.PLAY_AREA_HEIGHT))
+
+    def end_world(self):
+        """Fin du dessin du niveau (plus de translation ni de découpe)."""
+        self._ox = 0
+        self._oy = 0
+        self.screen.set_clip(None)
+
+    def _in_view(self, x: float, y: float, half_w: float, half_h: float) -> bool:
+        """True si la boîte centrée en (x, y) touche la vue."""
+        left, top, right, bottom = self._view
+        return left - half_w < x < right + half_w and top - half_h < y < bottom + half_h
+
     def draw_walls(self):
-        """Dessine les murs de la pièce."""
+        """Dessine les murs de la pièce (bords du niveau)."""
         cfg = self.config
         color = cfg.COLOR_WALL
         w = cfg.WALL_THICKNESS
+        ox = self._ox
+        oy = self._oy
 
         # Mur haut
-        pygame.draw.rect(self.screen, color, (0, 0, cfg.PLAY_AREA_WIDTH, w))
+        pygame.draw.rect(self.screen, color, (-ox, -oy, cfg.LEVEL_WIDTH, w))
         # Mur bas
         pygame.draw.rect(
             self.screen, color,
-            (0, cfg.PLAY_AREA_HEIGHT - w, cfg.PLAY_AREA_WIDTH, w)
+            (-ox, cfg.LEVEL_HEIGHT - w - oy, cfg.LEVEL_WIDTH, w)
         )
         # Mur gauche
-        pygame.draw.rect(self.screen, color, (0, 0, w, cfg.PLAY_AREA_HEIGHT))
+        pygame.draw.rect(self.screen, color, (-ox, -oy, w, cfg.LEVEL_HEIGHT))
         # Mur droit
         pygame.draw.rect(
             self.screen, color,
-            (cfg.PLAY_AREA_WIDTH - w, 0, w, cfg.PLAY_AREA_HEIGHT)
+            (cfg.LEVEL_WIDTH - w - ox, -oy, w, cfg.LEVEL_HEIGHT)
         )
 
     def draw_secret_hole(self, side: int, y: float, is_open: bool):
@@ -137,8 +208,8 @@ class Renderer:
         cfg = self.config
         hole_w = 12
         hole_h = cfg.SECRET_HOLE_HALF_HEIGHT * 2
-        x = cfg.WALL_THICKNESS - hole_w // 2 if side == -1 else cfg.PLAY_AREA_WIDTH - cfg.WALL_THICKNESS - hole_w // 2
-        rect = pygame.Rect(int(x), int(y - hole_h / 2), hole_w, hole_h)
+        x = cfg.WALL_THICKNESS - hole_w // 2 if side == -1 else cfg.LEVEL_WIDTH - cfg.WALL_THICKNESS - hole_w // 2
+        rect = pygame.Rect(int(x) - self._ox, int(y - hole_h / 2) - self._oy, hole_w, hole_h)
         pygame.draw.rect(self.screen, (10, 10, 14), rect, border_radius=4)
         pygame.draw.rect(self.screen, (120, 170, 210), rect, 2, border_radius=4)
 
@@ -151,15 +222,15 @@ class Renderer:
         if sprite is not None:
             if ball.facing_direction < 0:
                 sprite = pygame.transform.flip(sprite, True, False)
-            sprite_rect = sprite.get_rect(center=(int(ball.x), int(ball.y)))
+            sprite_rect = sprite.get_rect(center=(int(ball.x) - self._ox, int(ball.y) - self._oy))
             self.screen.blit(sprite, sprite_rect)
         else:
             pygame.draw.ellipse(
                 self.screen,
                 ball.color,
                 (
-                    int(ball.x - ball.half_w),
-                    int(ball.y - ball.half_h),
+                    int(ball.x - ball.half_w) - self._ox,
+                    int(ball.y - ball.half_h) - self._oy,
                     int(ball.hitbox_width),
                     int(ball.hitbox_height)
                 )
@@ -176,7 +247,7 @@ class Renderer:
                 pygame.draw.circle(
                     self.screen,
                     (brightness, brightness, brightness),
-                    (int(ball.x), int(ball.y)),
+                    (int(ball.x) - self._ox, int(ball.y) - self._oy),
                     alpha_radius,
                     2
                 )
@@ -186,7 +257,7 @@ class Renderer:
         if not obstacle.is_solid():
             return
 
-        x, y, w, h = int(obstacle.x), int(obstacle.y), obstacle.width, obstacle.height
+        x, y, w, h = int(obstacle.x) - self._ox, int(obstacle.y) - self._oy, obstacle.width, obstacle.height
 
         # Remplir avec la couleur de base (marron selon le type)
         pygame.draw.rect(self.screen, obstacle.color, (x, y, w, h))
@@ -204,83 +275,123 @@ class Renderer:
             pygame.draw.line(self.screen, crack_color, (x + w - 25, y + 5), (x + w - 10, y + h - 4), 2)
 
     def draw_obstacles(self, obstacles: list[Obstacle]):
-        """Dessine tous les obstacles."""
-        for obs in obstacles:
+        """Dessine les obstacles visibles, trouvés par l'index spatial du niveau."""
+        if obstacles is not self._indexed_obstacles or len(obstacles) != self._indexed_count:
+            # Nouveau niveau: ranger chaque obstacle (une plateforme mobile sur toute sa course)
+            index = self._obstacle_index
+            index.clear()
+            for obs in obstacles:
+                if isinstance(obs, MovingPlatform):
+                    index.insert(obs, obs.min_x, obs.y, obs.max_x - obs.min_x, obs.height)
+                else:
+                    index.insert(obs, obs.x, obs.y, obs.width, obs.height)
+            self._indexed_obstacles = obstacles
+            self._indexed_count = len(obstacles)
+
+        left, top, right, bottom = self._view
+        for obs in self._obstacle_index.query(left, top, right - left, bottom - top):
             self.draw_obstacle(obs)
 
     def draw_ai_ball(self, ball: AIBall):
         """Dessine une boule IA."""
         sprite = self.enemy_sprites.get(ball.enemy_type)
         if sprite is not None:
-            sprite = pygame.transform.smoothscale(sprite, (int(ball.sprite_width), int(ball.sprite_height)))
-            if ball.facing_direction < 0:
-                sprite = pygame.transform.flip(sprite, True, False)
-            rect = sprite.get_rect(center=(int(ball.x), int(ball.y)))
+            sprite = self._scaled(sprite, int(ball.sprite_width), int(ball.sprite_height), ball.facing_direction < 0)
+            rect = sprite.get_rect(center=(int(ball.x) - self._ox, int(ball.y) - self._oy))
             self.screen.blit(sprite, rect)
         else:
             pygame.draw.ellipse(
                 self.screen,
                 ball.color,
                 (
-                    int(ball.x - ball.half_w),
-                    int(ball.y - ball.half_h),
+                    int(ball.x - ball.half_w) - self._ox,
+                    int(ball.y - ball.half_h) - self._oy,
                     int(ball.hitbox_width),
                     int(ball.hitbox_height)
                 )
             )
 
     def draw_ai_balls(self, ai_balls: list[AIBall]):
-        """Dessine toutes les boules IA."""
+        """Dessine les boules IA visibles (sprites en cache envoyés en un seul appel blits)."""
+        batch = []
+        scaled = self._scaled
+        in_view = self._in_view
+        blend = pygame.BLEND_PREMULTIPLIED
+        ox = self._ox
+        oy = self._oy
         for ball in ai_balls:
-            self.draw_ai_ball(ball)
+            if not in_view(ball.x, ball.y, ball.sprite_width, ball.sprite_height):
+                continue
+            sprite = self.enemy_sprites.get(ball.enemy_type)
+            if sprite is None:
+                self.draw_ai_ball(ball)
+                continue
+            width = int(ball.sprite_width)
+            height = int(ball.sprite_height)
+            sprite = scaled(sprite, width, height, ball.facing_direction < 0, True)
+            batch.append((sprite, (int(ball.x) - width // 2 - ox, int(ball.y) - height // 2 - oy), None, blend))
+        self.screen.blits(batch, doreturn=False)
 
     def draw_missile(self, missile: Missile):
         """Dessine un missile avec sprite."""
         sprite_base = self.bullet_super_sprite if missile.charged else self.bullet_sprite
         if sprite_base is not None:
-            sprite = pygame.transform.smoothscale(sprite_base, (int(missile.width), int(missile.height)))
-            if missile.direction < 0:
-                sprite = pygame.transform.flip(sprite, True, False)
-            self.screen.blit(sprite, (int(missile.x), int(missile.y)))
+            sprite = self._scaled(sprite_base, int(missile.width), int(missile.height), missile.direction < 0)
+            self.screen.blit(sprite, (int(missile.x) - self._ox, int(missile.y) - self._oy))
             return
 
         # Fallback simple
         color = (180, 220, 255) if missile.charged else (255, 80, 80)
-        pygame.draw.ellipse(self.screen, color, (int(missile.x), int(missile.y), int(missile.width), int(missile.height)))
+        pygame.draw.ellipse(
+            self.screen, color,
+            (int(missile.x) - self._ox, int(missile.y) - self._oy, int(missile.width), int(missile.height))
+        )
 
     def draw_missiles(self, missiles: list[Missile]):
-        """Dessine tous les missiles."""
+        """Dessine les missiles visibles."""
+        in_view = self._in_view
         for missile in missiles:
-            self.draw_missile(missile)
-
-    def draw_enemy_bullet(self, bullet):
-        """Dessine une bulle ennemie."""
-        if self.enemy_bullet_sprite is not None:
-            rect = self.enemy_bullet_sprite.get_rect(center=(int(bullet.x), int(bullet.y)))
-            self.screen.blit(self.enemy_bullet_sprite, rect)
+            half_w = missile.width / 2
+            half_h = missile.height / 2
+            if in_view(missile.x + half_w, missile.y + half_h, half_w, half_h):
+                self.draw_missile(missile)
+
+    def draw_enemy_bullets(self, bullets):
+        """Dessine les bulles ennemies visibles d'un BulletField (un seul appel blits avec le sprite)."""
+        sprite = self.enemy_bullet_sprite
+        reach = max(sprite.get_size()) if sprite is not None else bullets.radius
+        left, top, right, bottom = self._view
+        x = bullets.x
+        y = bullets.y
+        visible = (x > left - reach) & (x < right + reach) & (y > top - reach) & (y < bottom + reach)
+        xs = (x[visible].astype(int) - self._ox).tolist()
+        ys = (y[visible].astype(int) - self._oy).tolist()
+        if sprite is None:
+            color = self.config.ENEMY_BULLET_COLOR
+            for x, y in zip(xs, ys):
+                pygame.draw.circle(self.screen, color, (x, y), bullets.radius)
             return
-
-        pygame.draw.circle(self.screen, bullet.color, (int(bullet.x), int(bullet.y)), bullet.radius)
-
-    def draw_enemy_bullets(self, bullets: list):
-        """Dessine toutes les bulles ennemies."""
-        for bullet in bullets:
-            self.draw_enemy_bullet(bullet)
+        half_w = sprite.get_width() // 2
+        half_h = sprite.get_height() // 2
+        self.screen.blits([(sprite, (x - half_w, y - half_h)) for x, y in zip(xs, ys)], doreturn=False)
 
     def draw_heart_pickup(self, heart):
         """Dessine un coeur power-up."""
         if self.heart_pickup_sprite is not None:
-            rect = self.heart_pickup_sprite.get_rect(center=(int(heart.x), int(heart.y)))
+            rect = self.heart_pickup_sprite.get_rect(center=(int(heart.x) - self._ox, int(heart.y) - self._oy))
             self.screen.blit(self.heart_pickup_sprite, rect)
             return
 
         # Fallback simple si l'image n'est pas dispo
-        pygame.draw.circle(self.screen, (255, 100, 100), (int(heart.x), int(heart.y)), int(heart.size))
+        center = (int(heart.x) - self._ox, int(heart.y) - self._oy)
+        pygame.draw.circle(self.screen, (255, 100, 100), center, int(heart.size))
 
     def draw_heart_pickups(self, hearts: list):
-        """Dessine tous les coeurs power-up."""
+        """Dessine les coeurs power-up visibles."""
+        in_view = self._in_view
         for heart in hearts:
-            self.draw_heart_pickup(heart)
+            if in_view(heart.x, heart.y, 2 * heart.size, 2 * heart.size):
+                self.draw_heart_pickup(heart)
 
     def draw_door(self, door):
         """Dessine la porte vers le prochain niveau."""
@@ -298,7 +409,7 @@ class Renderer:
         pygame.draw.rect(
             self.screen,
             door_color,
-            (int(door.x), int(door.y), door.width, door.height)
+            (int(door.x) - self._ox, int(door.y) - self._oy, door.width, door.height)
         )
 
         # Bordure
@@ -306,13 +417,13 @@ class Renderer:
         pygame.draw.rect(
             self.screen,
             border_color,
-            (int(door.x), int(door.y), door.width, door.height),
+            (int(door.x) - self._ox, int(door.y) - self._oy, door.width, door.height),
             3
         )
 
         # Poignée
-        handle_x = int(door.x + door.width * 0.75)
-        handle_y = int(door.y + door.height * 0.5)
+        handle_x = int(door.x + door.width * 0.75) - self._ox
+        handle_y = int(door.y + door.height * 0.5) - self._oy
         pygame.draw.circle(
             self.screen,
             border_color,
@@ -321,8 +432,13 @@ class Renderer:
         )
 
     def draw_particles(self, particle_system: ParticleSystem):
-        """Dessine toutes les particules."""
+        """Dessine les particules visibles."""
+        left, top, right, bottom = self._view
+        ox = self._ox
+        oy = self._oy
         for p in particle_system.particles:
+            if not (left - p.size < p.x < right + p.size and top - p.size < p.y < bottom + p.size):
+                continue
             # Couleur avec fondu basé sur l'alpha
             alpha = p.alpha
             color = (
@@ -330,36 +446,33 @@ class Renderer:
                 int(p.color[1] * alpha),
                 int(p.color[2] * alpha)
             )
-            size = max(1, int(p.current_size))
+            size = max(1, int(p.size * alpha))  # current_size sans recalculer l'alpha
             pygame.draw.circle(
                 self.screen,
                 color,
-                (int(p.x), int(p.y)),
+                (int(p.x) - ox, int(p.y) - oy),
                 size
             )
 
     def draw_hud(self, ball: Ball, enemy_count: int = 0, enemies_defeated: int = 0, current_level: int = 1, rage: float = 0.0):
         """Affiche les informations à l'écran."""
-        font = pygame.font.Font(None, 22)
-
         # Instructions en bas (hors aire de jeu)
         cmd_y_1 = self.config.PLAY_AREA_HEIGHT + 22
         cmd_y_2 = self.config.PLAY_AREA_HEIGHT + 50
-        text1 = font.render(
-            "Fleches/WASD: Bouger | Haut/Z/K: Sauter | Shift: Flotter | Espace: Tirer",
-            True, (200, 200, 200)
+        text1 = self._text(
+            22, "Fleches/WASD: Bouger | Haut/Z/K: Sauter | Shift: Flotter | Espace: Tirer",
+            (200, 200, 200)
         )
         self.screen.blit(text1, (16, cmd_y_1))
 
-        text2 = font.render(
-            "Super Orage: touche Y (rage 100%) | Manette: Stick, A saut, B float, X tir, Start pause",
-            True, (170, 210, 255)
+        text2 = self._text(
+            22, "Super Orage: touche Y (rage 100%) | Manette: Stick, A saut, B float, X tir, Start pause",
+            (170, 210, 255)
         )
         self.screen.blit(text2, (16, cmd_y_2))
 
         info_x = self.config.PLAY_AREA_WIDTH + 38
-        title_font = pygame.font.Font(None, 30)
-        info_title = title_font.render("Infos Joueur", True, (235, 235, 235))
+        info_title = self._text(30, "Infos Joueur", (235, 235, 235))
         self.screen.blit(info_title, (info_x, 16))
 
         energy_bar_width = 160
@@ -380,7 +493,7 @@ class Renderer:
 
         pygame.draw.rect(self.screen, energy_color, (energy_x, energy_y, current_width, energy_bar_height))
         pygame.draw.rect(self.screen, (200, 200, 200), (energy_x, energy_y, energy_bar_width, energy_bar_height), 2)
-        energy_text = font.render(f"Energie: {int(ball.displayed_energy)}", True, (180, 180, 180))
+        energy_text = self._text(22, f"Energie: {int(ball.displayed_energy)}", (180, 180, 180))
         self.screen.blit(energy_text, (energy_x, energy_y - 20))
 
         # Rage bar
@@ -408,10 +521,10 @@ class Renderer:
 
         pygame.draw.rect(self.screen, rage_color, (rage_x, rage_y, rage_fill, rage_bar_height))
         pygame.draw.rect(self.screen, (220, 220, 220), (rage_x, rage_y, rage_bar_width, rage_bar_height), 2)
-        rage_text = font.render(f"Rage: {int(rage)}%", True, (200, 200, 200))
+        rage_text = self._text(22, f"Rage: {int(rage)}%", (200, 200, 200))
         self.screen.blit(rage_text, (rage_x, rage_y - 20))
 
-        jumps_text = font.render(f"Sauts: {ball.jumps_remaining}/{self.config.MAX_JUMPS}", True, (180, 180, 180))
+        jumps_text = self._text(22, f"Sauts: {ball.jumps_remaining}/{self.config.MAX_JUMPS}", (180, 180, 180))
         self.screen.blit(jumps_text, (energy_x, rage_y + 34))
 
         # Speed bar (s'agrandit à 100% rage)
@@ -424,24 +537,24 @@ class Renderer:
         pygame.draw.rect(self.screen, (60, 60, 60), (speed_x, speed_y, speed_bar_width, speed_bar_height))
         pygame.draw.rect(self.screen, (120, 240, 140), (speed_x, speed_y, int(speed_bar_width * speed_ratio), speed_bar_height))
         pygame.draw.rect(self.screen, (200, 200, 200), (speed_x, speed_y, speed_bar_width, speed_bar_height), 2)
-        speed_text = font.render(f"Vitesse: {abs(ball.vx):.1f}/{active_max_speed}", True, (180, 180, 180))
+        speed_text = self._text(22, f"Vitesse: {abs(ball.vx):.1f}/{active_max_speed}", (180, 180, 180))
         self.screen.blit(speed_text, (speed_x, speed_y + 20))
 
-        enemies_text = font.render(f"Ennemis: {enemy_count}", True, (180, 180, 180))
+        enemies_text = self._text(22, f"Ennemis: {enemy_count}", (180, 180, 180))
         self.screen.blit(enemies_text, (energy_x, speed_y + 50))
 
-        defeated_text = font.render(f"Vaincus: {enemies_defeated}/{self.config.ENEMIES_TO_WIN}", True, (255, 215, 0))
+        defeated_text = self._text(22, f"Vaincus: {enemies_defeated}/{self.config.ENEMIES_TO_WIN}", (255, 215, 0))
         self.screen.blit(defeated_text, (energy_x, speed_y + 76))
 
-        level_text = font.render(f"Niveau: {current_level}", True, (150, 255, 150))
+        level_text = self._text(22, f"Niveau: {current_level}", (150, 255, 150))
         self.screen.blit(level_text, (energy_x, speed_y + 102))
 
         if ball.rage_boost_active:
-            immune_text = font.render("Rage max: Immunite collision", True, (255, 220, 120))
+            immune_text = self._text(22, "Rage max: Immunite collision", (255, 220, 120))
             self.screen.blit(immune_text, (energy_x, speed_y + 128))
 
         if ball.floating:
-            float_text = font.render("FLOTTE", True, (150, 150, 255))
+            float_text = self._text(22, "FLOTTE", (150, 150, 255))
             self.screen.blit(float_text, (energy_x, speed_y + 154))
 
         heart_size = self.config.HEART_HUD_SPRITE_SIZE[0]
@@ -449,7 +562,7 @@ class Renderer:
         start_x = energy_x + 15
         start_y = speed_y + 206
 
-        hearts_label = font.render("Vies:", True, (220, 220, 220))
+        hearts_label = self._text(22, "Vies:", (220, 220, 220))
         self.screen.blit(hearts_label, (energy_x, start_y - 26))
 
         for i in range(ball.max_lives):
@@ -0,0 +1,163 @@
+"""
+Replays : graine, entrées et empreintes d'état de chaque frame.
+
+Un replay suffit à rejouer une partie à l'identique (la simulation ne dépend
+que de la graine et des masques d'entrées). Les empreintes enregistrées
+avec (voir statehash.py) permettent, en relecture, de trouver la première
+frame qui diverge au lieu de constater seulement que la fin diffère.
+
+Lancer avec:
+    python -m game.replay record partie.rpl --frames 3600 --seed 42
+    python -m game.replay check partie.rpl
+"""
+
+import argparse
+import random
+import struct
+from array import array
+from dataclasses import dataclass, field
+from typing import Optional
+from .config import Config
+from .engine import GameEngine, GameState
+from .inputs import Input
+from .statehash import first_divergence
+
+MAGIC = b'EDRP'
+VERSION = 2  # 2: empreintes BLAKE2b (voir statehash.py)
+
+_HEADER = struct.Struct('<4s H I B B I')  # magic, version, graine, personnage, joueurs, frames
+
+
+@dataclass(slots=True)
+class Replay:
+    """Partie enregistrée: un octet d'entrées par joueur et par frame, une empreinte par frame."""
+
+    seed: int
+    character: int = 0
+    players: int = 1
+    inputs: bytearray = field(default_factory=bytearray)
+    hashes: array = field(default_factory=lambda: array('Q'))
+
+    @property
+    def frames(self) -> int:
+        return len(self.hashes)
+
+    def frame_inputs(self, frame: int) -> bytes:
+        """Masques d'entrées des joueurs pour une frame."""
+        start = frame * self.players
+        return self.inputs[start:start + self.players]
+
+    def append(self, inputs, frame_hash: int):
+        self.inputs.extend(inputs)
+        self.hashes.append(frame_hash)
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(MAGIC, VERSION, self.seed, self.character, self.players, self.frames)
+        return header + bytes(self.inputs) + self.hashes.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        magic, version, seed, character, players, frames = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Replay invalide (magic={magic!r}, version={version})")
+        offset = _HEADER.size
+        inputs = bytearray(data[offset:offset + frames * players])
+        offset += len(inputs)
+        hashes = array('Q')
+        hashes.frombytes(data[offset:offset + frames * hashes.itemsize])
+        return cls(seed, character, players, inputs, hashes)
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """Démarre une partie avec une graine et enregistre chaque tick joué."""
+
+    def __init__(self, engine: GameEngine, seed: Optional[int] = None):
+        self.engine = engine
+        self.replay = Replay(random.getrandbits(32) if seed is None else seed,
+                             engine.selected_color_index, engine.player_count)
+        engine.seed(self.replay.seed)
+        engine._start_game()
+
+    def tick(self, inputs) -> int:
+        frame_hash = self.engine.tick(inputs)
+        self.replay.append(inputs, frame_hash)
+        return frame_hash
+
+
+def play(replay: Replay, engine: Optional[GameEngine] = None, stop_at_divergence: bool = True) -> Optional[int]:
+    """
+    Rejoue un replay et compare les empreintes frame par frame.
+
+    Retourne la première frame dont l'empreinte diffère de l'enregistrement,
+    None si la partie se rejoue à l'identique. Sans moteur fourni, un moteur
+    headless est créé.
+    """
+    if engine is None:
+        engine = GameEngine(headless=True, players=replay.players)
+        engine.init()
+    engine.selected_color_index = replay.character
+    engine.seed(replay.seed)
+    engine._start_game()
+
+    hashes = array('Q')
+    for frame in range(replay.frames):
+        hashes.append(engine.tick(replay.frame_inputs(frame)))
+        if stop_at_divergence and hashes[frame] != replay.hashes[frame]:
+            return frame
+    return first_divergence(replay.hashes, hashes)
+
+
+def record_random(frames: int, seed: int, players: int = 1, config: Config = None) -> Replay:
+    """Enregistre une partie headless jouée avec des entrées aléatoires (tests de déterminisme)."""
+    engine = GameEngine(config, headless=True, players=players)
+    engine.init()
+    recorder = ReplayRecorder(engine, seed)
+    rng = random.Random(seed)
+    choices = [0, Input.LEFT, Input.RIGHT, Input.LEFT | Input.FIRE, Input.RIGHT | Input.JUMP,
+               Input.FIRE | Input.UP, Input.JUMP | Input.FLOAT, Input.SUPER]
+    masks = [0] * players
+    for frame in range(frames):
+        if engine.state != GameState.PLAYING:
+            break
+        if frame % 15 == 0:  # Boutons tenus un quart de seconde
+            masks = [int(rng.choice(choices)) for _ in range(players)]
+        recorder.tick(masks)
+    return recorder.replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enregistrement et vérification de replays")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="Enregistrer une partie aux entrées aléatoires")
+    record.add_argument("path")
+    record.add_argument("--frames", type=int, default=3600)
+    record.add_argument("--seed", type=int, default=0)
+    record.add_argument("--players", type=int, choices=(1, 2), default=1)
+    check = commands.add_parser("check", help="Rejouer et chercher la première frame divergente")
+    check.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        replay = record_random(args.frames, args.seed, args.players)
+        replay.save(args.path)
+        print(f"{replay.frames} frames enregistrées dans {args.path}")
+    else:
+        replay = Replay.load(args.path)
+        frame = play(replay)
+        if frame is None:
+            print(f"{replay.frames} frames rejouées à l'identique")
+        else:
+            print(f"Divergence à la frame {frame}")
+
+
+if __name__ == "__main__":
+    main()
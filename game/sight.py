@@ -0,0 +1,115 @@
+"""
+Lignes de vue des ennemis.
+
+Un ennemi ne tire que s'il voit le joueur qu'il vise : le segment qui les
+relie ne doit traverser aucun obstacle. Les rayons sont lancés dans la
+grille de distance (voir grid.py), ceux de tous les tireurs d'une frame en
+un seul lot.
+
+Contre les obstacles rasterisés (fixes et fragiles), les résultats sont
+mis en cache par paire de cellules (cellule de l'ennemi, cellule du
+joueur). Le rayon va du centre d'une cellule au centre de l'autre : le
+résultat ne dépend que de la géométrie, jamais de l'ordre des requêtes
+(déterminisme, rollbacks). Le cache est vidé quand la grille change
+(niveau, écrans proches, plateforme fragile cassée ou reformée). Les
+plateformes mobiles bougent à chaque frame : elles sont testées à chaque
+requête, directement contre les segments.
+"""
+
+import numpy as np
+from .config import Config
+from .grid import ObstacleGrid
+
+
+def segments_cross_rects(x0, y0, x1, y1, rects: np.ndarray) -> np.ndarray:
+    """
+    True pour chaque segment qui traverse au moins un rectangle (x, y, largeur, hauteur).
+
+    Méthode des dalles, tous les segments contre tous les rectangles à la fois.
+    """
+    if not len(rects):
+        return np.zeros(len(x0), dtype=bool)
+    x0 = x0[:, None]
+    y0 = y0[:, None]
+    dx = (x1 - x0[:, 0])[:, None]
+    dy = (y1 - y0[:, 0])[:, None]
+    left, top = rects[:, 0], rects[:, 1]
+    right, bottom = left + rects[:, 2], top + rects[:, 3]
+
+    def slab(origin, delta, low, high):
+        # Intervalle de paramètre t où le segment est entre low et high sur un axe
+        flat = delta == 0
+        step = np.where(flat, 1.0, delta)
+        t0 = (low - origin) / step
+        t1 = (high - origin) / step
+        inside = (origin > low) & (origin < high)
+        enter = np.where(flat, np.where(inside, -np.inf, np.inf), np.minimum(t0, t1))
+        leave = np.where(flat, np.where(inside, np.inf, -np.inf), np.maximum(t0, t1))
+        return enter, leave
+
+    enter_x, leave_x = slab(x0, dx, left, right)
+    enter_y, leave_y = slab(y0, dy, top, bottom)
+    enter = np.maximum(np.maximum(enter_x, enter_y), 0.0)
+    leave = np.minimum(np.minimum(leave_x, leave_y), 1.0)
+    return (enter < leave).any(axis=1)
+
+
+class SightCache:
+    """Visibilité entre cellules, gardée tant que la grille des obstacles ne change pas."""
+
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.cell_size = self.config.SIGHT_CELL_SIZE
+        self.hits = 0
+        self.misses = 0
+        self._visible: dict[tuple[int, int, int, int], bool] = {}
+        self._version = None  # Version de la grille des résultats en cache
+
+    def clear(self):
+        """Vide le cache."""
+        self._visible = {}
+        self._version = None
+
+    def visible(self, grid: ObstacleGrid, x0, y0, x1, y1) -> np.ndarray:
+        """Pour chaque paire de points (x0, y0) -> (x1, y1), True si aucun obstacle ne coupe la ligne de vue."""
+        if grid.version != self._version or len(self._visible) > self.config.SIGHT_CACHE_SIZE:
+            self._visible = {}
+            self._version = grid.version
+
+        cell = self.cell_size
+        col0 = np.floor_divide(np.asarray(x0, dtype=float), cell).astype(np.int64)
+        row0 = np.floor_divide(np.asarray(y0, dtype=float), cell).astype(np.int64)
+        col1 = np.floor_divide(np.asarray(x1, dtype=float), cell).astype(np.int64)
+        row1 = np.floor_divide(np.asarray(y1, dtype=float), cell).astype(np.int64)
+        keys = list(zip(col0.tolist(), row0.tolist(), col1.tolist(), row1.tolist()))
+
+        result = np.empty(len(keys), dtype=bool)
+        missing = []
+        for i, key in enumerate(keys):
+            seen = self._visible.get(key)
+            if seen is None:
+                missing.append(i)
+            else:
+                result[i] = seen
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        # Extrémités: centres des cellules
+        sx = (col0 + 0.5) * cell
+        sy = (row0 + 0.5) * cell
+        ex = (col1 + 0.5) * cell
+        ey = (row1 + 0.5) * cell
+        if missing:
+            index = np.array(missing)
+            clear = grid.segment_clear(sx[index], sy[index], ex[index], ey[index])
+            result[index] = clear
+            for i, seen in zip(missing, clear.tolist()):
+                self._visible[keys[i]] = seen
+
+        # Plateformes mobiles: elles bougent à chaque frame, testées hors cache
+        if grid.dynamic and result.any():
+            rects = np.array([(obs.x, obs.y, obs.width, obs.height) for obs in grid.dynamic if obs.is_solid()],
+                             dtype=float).reshape(-1, 4)
+            open_ = np.flatnonzero(result)
+            result[open_] = ~segments_cross_rects(sx[open_], sy[open_], ex[open_], ey[open_], rects)
+        return result
@@ -0,0 +1,482 @@
+"""
+Instantanés binaires du monde.
+
+Capture l'état complet de la simulation (joueurs, ennemis, projectiles,
+bonus, obstacles et leurs timers, compteurs du moteur, tronçons des grands
+niveaux, générateurs aléatoires) dans un buffer compact, et le restaure à
+l'identique : les frames jouées après une restauration sont exactement
+celles qui avaient suivi la capture. C'est la base du rollback, du rembobinage et des
+simulations en branches.
+
+Les particules et les sons sont cosmétiques et ne sont pas capturés.
+"""
+
+import random
+import struct
+from array import array
+from typing import Optional
+from .entities import Ball, Obstacle, FragilePlatform, MovingPlatform, AIBall, Missile, HeartPickup, Door
+from .projectiles import BulletField
+from .timers import Timer
+
+MAGIC = b'EDSN'
+VERSION = 5
+
+NO_TIMER = (-1, -1)  # (échéance, ordre) d'un timer absent ou échu
+NO_SUPPORT = -1
+LOST_SUPPORT = -2  # Support qui n'est plus dans la liste d'obstacles
+
+# Types d'obstacles
+OBSTACLE = 0
+FRAGILE = 1
+MOVING = 2
+
+# Disposition binaire (petit-boutiste, sans alignement)
+_HEADER = struct.Struct('<4s H B')  # magic, version, état du jeu
+_ENGINE = struct.Struct(
+    '<q q q'  # frame de la roue, ordre du prochain timer, frame de l'ordonnanceur
+    ' i i i i'  # game_over_timer, niveau, ennemis vaincus, score
+    ' B b i B d'  # personnage, côté secret, hauteur du trou, drapeaux, rage
+    ' 4i'  # statistiques de partie
+    ' 2q 2q'  # timers du moteur: spawn ennemi, spawn coeur
+)
+_COUNT = struct.Struct('<I')
+_DOOR = struct.Struct('<? 4d ?')  # présente, x, y, largeur, hauteur, active
+_BALL = struct.Struct(
+    '<5d B 2d ? b b ? 2d b 3B'
+    ' i i i 2q i 2d b ?'
+    ' B 2q 2q'  # entrées précédentes, cooldowns de tir et de super attaque
+)
+_OBSTACLE = struct.Struct('<B 4d 3B')
+_FRAGILE = struct.Struct('<3i ? ? 2q')
+_MOVING = struct.Struct('<3d b')
+_AI_BALL = struct.Struct('<9d 3B b i i ? 2q b ? i i 2d i')
+_MISSILE = struct.Struct('<5d b b 3B ? ? 2d')
+_HEART = struct.Struct('<4d ?')
+_PARKED = struct.Struct('<? i 2d')  # porte active, ennemis vaincus, position du joueur
+_CHUNKS = struct.Struct('<Q I I')  # graine du niveau, tronçons chargés, tronçons compactés
+_CHUNK_RECORD = struct.Struct('<i I')  # index du tronçon, taille de l'enregistrement
+_RANDOM = struct.Struct('<B ? d')  # version, gauss en attente ?, valeur
+_PCG64 = struct.Struct('<16s 16s ? I')  # état, incrément, uint32 en attente ?, valeur
+
+# Drapeaux du moteur
+_HOLE_OPEN = 1
+_REWARD_CLAIMED = 2
+_IN_SECRET_ROOM = 4
+_HAS_PARKED_WORLD = 8
+
+
+def _timer_fields(timer: Optional[Timer]) -> tuple[int, int]:
+    """(échéance, ordre) d'un timer en attente, NO_TIMER sinon."""
+    if timer is None or not timer.pending:
+        return NO_TIMER
+    return timer.fire_at, timer.seq
+
+
+class _Reader:
+    """Lecture séquentielle d'un instantané."""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def read(self, layout: struct.Struct) -> tuple:
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def count(self) -> int:
+        return self.read(_COUNT)[0]
+
+    def array(self, typecode: str, length: int) -> array:
+        values = array(typecode)
+        end = self.offset + length * values.itemsize
+        values.frombytes(self.data[self.offset:end])
+        self.offset = end
+        return values
+
+
+class WorldSnapshot:
+    """Capture et restauration de l'état de simulation d'un GameEngine."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._timers: list[Timer] = []  # Timers recréés pendant une restauration
+
+    # --- Capture ---
+
+    def capture(self) -> bytes:
+        """Encode l'état courant du monde (entre deux frames)."""
+        engine = self.engine
+        if engine.ball is None:
+            raise ValueError("Aucune partie en cours: rien à capturer")
+
+        parked = engine._main_world_snapshot
+        flags = (
+            (_HOLE_OPEN if engine.secret_hole_open else 0)
+            | (_REWARD_CLAIMED if engine.secret_reward_claimed else 0)
+            | (_IN_SECRET_ROOM if engine.in_secret_room else 0)
+            | (_HAS_PARKED_WORLD if parked is not None else 0)
+        )
+        stats = engine.score_stats
+
+        parts = [
+            _HEADER.pack(MAGIC, VERSION, engine.state.value),
+            _ENGINE.pack(
+                engine.timers.now, engine.timers.next_seq, engine.systems.frame,
+                engine.game_over_timer, engine.current_level, engine.enemies_defeated, engine.current_score,
+                engine.selected_color_index, engine.secret_side, engine.secret_hole_y, flags, engine.rage,
+                stats.total_kills, stats.lives_lost, stats.pickups, stats.levels_completed,
+                *_timer_fields(engine.spawn_timer), *_timer_fields(engine.heart_spawn_timer)
+            ),
+            _COUNT.pack(len(engine.systems.systems)),
+            array('q', engine.systems.last_frames()).tobytes(),
+            self._pack_door(engine.door),
+            _COUNT.pack(len(engine.players)),
+        ]
+        parts.extend(self._pack_ball(ball) for ball in engine.players)
+        self._pack_world(
+            parts, engine.obstacles, engine.ai_balls, engine.missiles, engine.enemy_bullets, engine.heart_pickups
+        )
+
+        # Ordre du broadphase, en index dans la liste des ennemis
+        index = {id(ball): i for i, ball in enumerate(engine.ai_balls)}
+        order = array('i', (index[id(body)] for body in engine.broadphase.order() if id(body) in index))
+        parts.append(_COUNT.pack(len(order)))
+        parts.append(order.tobytes())
+
+        if parked is not None:
+            self._pack_world(
+                parts, parked["obstacles"], parked["ai_balls"], parked["missiles"],
+                parked["enemy_bullets"], parked["heart_pickups"]
+            )
+            parts.append(_PARKED.pack(
+                parked["door_active"], parked["enemies_defeated"], parked["ball_x"], parked["ball_y"]
+            ))
+
+        # Tronçons des grands niveaux: chargés (par index) et compactés (leurs enregistrements)
+        chunks = engine.chunks
+        parts.append(_CHUNKS.pack(chunks.level_seed, len(chunks.live), len(chunks.evicted)))
+        parts.append(array('i', sorted(chunks.live)).tobytes())
+        for index, record in sorted(chunks.evicted.items()):
+            parts.append(_CHUNK_RECORD.pack(index, len(record)))
+            parts.append(record)
+
+        parts.append(self._pack_random(random.getstate()))
+        parts.append(self._pack_random(engine.particles.rng.getstate()))
+        parts.append(self._pack_pcg64(engine.enemy_store.rng.bit_generator.state))
+        return b''.join(parts)
+
+    def _pack_door(self, door: Optional[Door]) -> bytes:
+        if door is None:
+            return _DOOR.pack(False, 0.0, 0.0, 0.0, 0.0, False)
+        return _DOOR.pack(True, door.x, door.y, door.width, door.height, door.active)
+
+    def _pack_ball(self, ball: Ball) -> bytes:
+        return _BALL.pack(
+            ball.x, ball.y, ball.radius, ball.hitbox_width, ball.hitbox_height, ball.character_index,
+            ball.vx, ball.vy, ball.on_ground, ball.jumps_remaining, ball.on_wall, ball.floating,
+            ball.energy, ball.displayed_energy, ball.facing_direction, *ball.color,
+            ball.walk_particle_timer, ball.lives, ball.max_lives, *_timer_fields(ball.invincible_timer),
+            ball.energy_usage_timer, ball.speed_multiplier, ball.jump_multiplier,
+            ball.aim_direction_y, ball.rage_boost_active, ball.input_mask,
+            *_timer_fields(ball.fire_cooldown), *_timer_fields(ball.super_cooldown)
+        )
+
+    def _pack_world(self, parts: list, obstacles, ai_balls, missiles, bullets, hearts):
+        """Encode les listes d'entités d'un monde (principal ou salle secrète)."""
+        self._pack_bodies(parts, obstacles, ai_balls)
+
+        parts.append(_COUNT.pack(len(missiles)))
+        for m in missiles:
+            parts.append(_MISSILE.pack(
+                m.x, m.y, m.width, m.height, m.speed, m.direction, m.direction_y, *m.color,
+                m.active, m.charged, m.prev_x, m.prev_y
+            ))
+
+        # Bulles: une colonne de float64 par attribut
+        parts.append(_COUNT.pack(len(bullets)))
+        parts.extend(column.tobytes() for column in bullets.columns())
+
+        parts.append(_COUNT.pack(len(hearts)))
+        for h in hearts:
+            parts.append(_HEART.pack(h.x, h.y, h.size, h.vy, h.active))
+
+    @staticmethod
+    def _pack_bodies(parts: list, obstacles, ai_balls):
+        """Encode les obstacles et les ennemis d'un monde (ou d'un tronçon compacté)."""
+        parts.append(_COUNT.pack(len(obstacles)))
+        for obs in obstacles:
+            if isinstance(obs, FragilePlatform):
+                kind = FRAGILE
+            elif isinstance(obs, MovingPlatform):
+                kind = MOVING
+            else:
+                kind = OBSTACLE
+            parts.append(_OBSTACLE.pack(kind, obs.x, obs.y, obs.width, obs.height, *obs.color))
+            if kind == FRAGILE:
+                parts.append(_FRAGILE.pack(
+                    obs.break_delay, obs.respawn_time, obs.step_timer, obs.broken,
+                    obs.stepped_this_frame, *_timer_fields(obs.respawn_timer)
+                ))
+            elif kind == MOVING:
+                parts.append(_MOVING.pack(obs.min_x, obs.max_x, obs.speed, obs.direction))
+
+        # Le support d'un ennemi est un obstacle du même monde, encodé par index
+        obstacle_index = {id(obs): i for i, obs in enumerate(obstacles)}
+        parts.append(_COUNT.pack(len(ai_balls)))
+        for ball in ai_balls:
+            if ball.support is None:
+                support = NO_SUPPORT
+            else:
+                support = obstacle_index.get(id(ball.support), LOST_SUPPORT)
+            parts.append(_AI_BALL.pack(
+                ball.x, ball.y, ball.radius, ball.hitbox_width, ball.hitbox_height,
+                ball.sprite_width, ball.sprite_height, ball.vx, ball.vy, *ball.color,
+                ball.enemy_type, ball.hp, ball.max_hp, ball.on_ground, *_timer_fields(ball.shoot_timer),
+                ball.facing_direction, ball.sleeping, ball.rest_frames, support,
+                ball.support_x, ball.support_y, ball.volleys_left
+            ))
+
+    @staticmethod
+    def _pack_random(state: tuple) -> bytes:
+        """Encode l'état d'un random.Random (Mersenne Twister)."""
+        version, internal, gauss = state
+        return _RANDOM.pack(version, gauss is not None, gauss or 0.0) + array('I', internal).tobytes()
+
+    @staticmethod
+    def _pack_pcg64(state: dict) -> bytes:
+        """Encode l'état du générateur NumPy des ennemis (PCG64)."""
+        if state['bit_generator'] != 'PCG64':
+            raise ValueError(f"Générateur non supporté: {state['bit_generator']}")
+        return _PCG64.pack(
+            state['state']['state'].to_bytes(16, 'little'),
+            state['state']['inc'].to_bytes(16, 'little'),
+            bool(state['has_uint32']),
+            state['uinteger']
+        )
+
+    @staticmethod
+    def capture_bodies(obstacles, ai_balls) -> bytes:
+        """
+        Encode des obstacles et des ennemis seuls (tronçon compacté, niveau
+        préparé: voir chunks.py, levelgen.py).
+        """
+        parts = []
+        WorldSnapshot._pack_bodies(parts, obstacles, ai_balls)
+        return b''.join(parts)
+
+    # --- Restauration ---
+
+    def restore(self, data: bytes):
+        """Remplace l'état du monde par celui d'un instantané."""
+        # Import local: engine importe ce module
+        from .engine import GameState
+
+        engine = self.engine
+        reader = _Reader(data)
+        magic, version, state = reader.read(_HEADER)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Instantané invalide (magic={magic!r}, version={version})")
+
+        values = reader.read(_ENGINE)
+        (now, seq, systems_frame,
+         engine.game_over_timer, engine.current_level, engine.enemies_defeated, engine.current_score,
+         engine.selected_color_index, engine.secret_side, engine.secret_hole_y, flags, engine.rage) = values[:12]
+        stats = values[12:16]
+        engine_timers = values[16:]
+
+        engine.state = GameState(state)
+        engine.systems.restore(systems_frame, reader.array('q', reader.count()).tolist())
+        engine.secret_hole_open = bool(flags & _HOLE_OPEN)
+        engine.secret_reward_claimed = bool(flags & _REWARD_CLAIMED)
+        engine.in_secret_room = bool(flags & _IN_SECRET_ROOM)
+        score = engine.score_stats
+        score.total_kills, score.lives_lost, score.pickups, score.levels_completed = stats
+
+        self._timers = []
+        engine.spawn_timer = self._timer(engine_timers[0], engine_timers[1], engine._spawn_enemy)
+        engine.heart_spawn_timer = self._timer(engine_timers[2], engine_timers[3], engine._spawn_heart)
+
+        engine.door = self._read_door(reader)
+        engine.players = [self._read_ball(reader) for _ in range(reader.count())]
+        engine.ball = engine.players[0]
+        (engine.obstacles, engine.ai_balls, engine.missiles,
+         engine.enemy_bullets, engine.heart_pickups) = self._read_world(reader)
+
+        order = reader.array('i', reader.count())
+        engine.broadphase.restore_order([engine.ai_balls[i] for i in order])
+
+        engine._main_world_snapshot = None
+        if flags & _HAS_PARKED_WORLD:
+            obstacles, ai_balls, missiles, bullets, hearts = self._read_world(reader)
+            door_active, enemies_defeated, ball_x, ball_y = reader.read(_PARKED)
+            engine._main_world_snapshot = {
+                "obstacles": obstacles,
+                "ai_balls": ai_balls,
+                "missiles": missiles,
+                "enemy_bullets": bullets,
+                "heart_pickups": hearts,
+                "door_active": door_active,
+                "enemies_defeated": enemies_defeated,
+                "ball_x": ball_x,
+                "ball_y": ball_y,
+            }
+
+        level_seed, live_count, evicted_count = reader.read(_CHUNKS)
+        live = reader.array('i', live_count)
+        evicted = {}
+        for _ in range(evicted_count):
+            index, length = reader.read(_CHUNK_RECORD)
+            evicted[index] = bytes(reader.data[reader.offset:reader.offset + length])
+            reader.offset += length
+        engine.chunks.restore_state(level_seed, live, evicted)
+
+        random.setstate(self._read_random(reader))
+        engine.particles.rng.setstate(self._read_random(reader))
+        engine.enemy_store.rng.bit_generator.state = self._read_pcg64(reader)
+
+        # Replacer les timers dans une roue remise à la frame capturée
+        engine.timers.reset(now, seq)
+        for timer in self._timers:
+            engine.timers.reinsert(timer)
+        self._timers = []
+
+        # Effets cosmétiques et événements en cours ne survivent pas au saut
+        engine.particles.clear()
+        engine.events.clear()
+
+    def _timer(self, fire_at: int, seq: int, callback=None, *args) -> Optional[Timer]:
+        """Recrée un timer capturé (None s'il n'était pas en attente)."""
+        if (fire_at, seq) == NO_TIMER:
+            return None
+        timer = Timer(fire_at, seq, callback, args)
+        self._timers.append(timer)
+        return timer
+
+    def _read_door(self, reader: _Reader) -> Optional[Door]:
+        present, x, y, width, height, active = reader.read(_DOOR)
+        if not present:
+            return None
+        return Door(x=x, y=y, width=width, height=height, active=active)
+
+    def _read_ball(self, reader: _Reader) -> Ball:
+        (x, y, radius, hitbox_width, hitbox_height, character_index,
+         vx, vy, on_ground, jumps_remaining, on_wall, floating,
+         energy, displayed_energy, facing_direction, r, g, b,
+         walk_particle_timer, lives, max_lives, invincible_at, invincible_seq,
+         energy_usage_timer, speed_multiplier, jump_multiplier,
+         aim_direction_y, rage_boost_active, input_mask,
+         fire_at, fire_seq, super_at, super_seq) = reader.read(_BALL)
+        return Ball(
+            x=x, y=y, radius=radius, hitbox_width=hitbox_width, hitbox_height=hitbox_height,
+            character_index=character_index, vx=vx, vy=vy, on_ground=on_ground,
+            jumps_remaining=jumps_remaining, on_wall=on_wall, floating=floating,
+            energy=energy, displayed_energy=displayed_energy, facing_direction=facing_direction,
+            color=(r, g, b), walk_particle_timer=walk_particle_timer, lives=lives, max_lives=max_lives,
+            invincible_timer=self._timer(invincible_at, invincible_seq), energy_usage_timer=energy_usage_timer,
+            speed_multiplier=speed_multiplier, jump_multiplier=jump_multiplier,
+            aim_direction_y=aim_direction_y, rage_boost_active=rage_boost_active, input_mask=input_mask,
+            fire_cooldown=self._timer(fire_at, fire_seq), super_cooldown=self._timer(super_at, super_seq)
+        )
+
+    def _read_world(self, reader: _Reader) -> tuple[list, list, list, BulletField, list]:
+        """Décode les listes d'entités d'un monde."""
+        obstacles, ai_balls = self._read_bodies(reader)
+
+        missiles = []
+        for _ in range(reader.count()):
+            (x, y, width, height, speed, direction, direction_y, r, g, b,
+             active, charged, prev_x, prev_y) = reader.read(_MISSILE)
+            missiles.append(Missile(
+                x=x, y=y, width=width, height=height, speed=speed, direction=direction,
+                direction_y=direction_y, color=(r, g, b), active=active, charged=charged,
+                prev_x=prev_x, prev_y=prev_y
+            ))
+
+        bullets = BulletField(self.engine.config)
+        count = reader.count()
+        bullets.set_columns([reader.array('d', count) for _ in bullets.columns()])
+
+        hearts = []
+        for _ in range(reader.count()):
+            x, y, size, vy, active = reader.read(_HEART)
+            hearts.append(HeartPickup(x=x, y=y, size=size, vy=vy, active=active))
+
+        return obstacles, ai_balls, missiles, bullets, hearts
+
+    def restore_bodies(self, data: bytes) -> tuple[list, list]:
+        """
+        Décode des obstacles et des ennemis encodés par capture_bodies.
+
+        Les timers doivent avoir été annulés avant la capture : ceux qui
+        restent en attente ne sont pas replacés dans la roue.
+        """
+        obstacles, ai_balls = self._read_bodies(_Reader(data))
+        self._timers = []
+        return obstacles, ai_balls
+
+    def _read_bodies(self, reader: _Reader) -> tuple[list, list]:
+        """Décode les obstacles et les ennemis encodés par _pack_bodies."""
+        obstacles = []
+        for _ in range(reader.count()):
+            kind, x, y, width, height, r, g, b = reader.read(_OBSTACLE)
+            if kind == FRAGILE:
+                break_delay, respawn_time, step_timer, broken, stepped, fire_at, seq = reader.read(_FRAGILE)
+                obs = FragilePlatform(
+                    x=x, y=y, width=width, height=height, color=(r, g, b),
+                    break_delay=break_delay, respawn_time=respawn_time, step_timer=step_timer,
+                    broken=broken, stepped_this_frame=stepped
+                )
+                obs.respawn_timer = self._timer(fire_at, seq, obs.respawn)
+            elif kind == MOVING:
+                min_x, max_x, speed, direction = reader.read(_MOVING)
+                obs = MovingPlatform(
+                    x=x, y=y, width=width, height=height, color=(r, g, b),
+                    min_x=min_x, max_x=max_x, speed=speed, direction=direction
+                )
+            else:
+                obs = Obstacle(x=x, y=y, width=width, height=height, color=(r, g, b))
+            obstacles.append(obs)
+
+        engine = self.engine
+        ai_balls = []
+        for _ in range(reader.count()):
+            (x, y, radius, hitbox_width, hitbox_height, sprite_width, sprite_height,
+             vx, vy, r, g, b, enemy_type, hp, max_hp, on_ground, fire_at, seq,
+             facing_direction, sleeping, rest_frames, support, support_x, support_y,
+             volleys_left) = reader.read(_AI_BALL)
+            ball = AIBall(
+                x=x, y=y, radius=radius, hitbox_width=hitbox_width, hitbox_height=hitbox_height,
+                sprite_width=sprite_width, sprite_height=sprite_height, vx=vx, vy=vy,
+                color=(r, g, b), enemy_type=enemy_type, hp=hp, max_hp=max_hp, on_ground=on_ground,
+                facing_direction=facing_direction, sleeping=sleeping, rest_frames=rest_frames,
+                support_x=support_x, support_y=support_y, volleys_left=volleys_left
+            )
+            if support >= 0:
+                ball.support = obstacles[support]
+            elif support == LOST_SUPPORT:
+                # Obstacle retiré du niveau: un support détaché réveille la boule comme avant
+                ball.support = Obstacle(x=support_x, y=support_y, width=0, height=0)
+            ball.shoot_timer = self._timer(fire_at, seq, engine._enemy_shoot, ball)
+            ai_balls.append(ball)
+        return obstacles, ai_balls
+
+    @staticmethod
+    def _read_random(reader: _Reader) -> tuple:
+        version, has_gauss, gauss = reader.read(_RANDOM)
+        internal = reader.array('I', 625)  # 624 mots d'état + position
+        return version, tuple(internal), gauss if has_gauss else None
+
+    @staticmethod
+    def _read_pcg64(reader: _Reader) -> dict:
+        state, inc, has_uint32, uinteger = reader.read(_PCG64)
+        return {
+            'bit_generator': 'PCG64',
+            'state': {
+                'state': int.from_bytes(state, 'little'),
+                'inc': int.from_bytes(inc, 'little'),
+            },
+            'has_uint32': int(has_uint32),
+            'uinteger': uinteger,
+        }
@@ -0,0 +1,65 @@
+"""
+Index spatial à grille uniforme.
+
+Range des éléments rectangulaires dans des seaux par cellule : une requête
+ne parcourt que les cellules du rectangle demandé. Le rendu s'en sert pour
+ne toucher que la géométrie proche de la vue, quelle que soit la taille du
+niveau.
+"""
+
+from typing import Any
+
+
+class SpatialHash:
+    """
+    Seaux par cellule carrée de `cell_size` pixels.
+
+    Un élément est rangé dans toutes les cellules que couvre sa boîte. Les
+    requêtes rendent les éléments dans leur ordre d'insertion (ordre de
+    dessin conservé), sans doublon.
+    """
+
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        self._items: list[Any] = []
+        self._cells: dict[tuple[int, int], list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self):
+        """Vide l'index."""
+        self._items = []
+        self._cells = {}
+
+    def _span(self, x: float, y: float, width: float, height: float) -> tuple[range, range]:
+        cell = self.cell_size
+        return (range(int(x // cell), int((x + width) // cell) + 1),
+                range(int(y // cell), int((y + height) // cell) + 1))
+
+    def insert(self, item: Any, x: float, y: float, width: float, height: float):
+        """Range un élément couvrant le rectangle donné."""
+        index = len(self._items)
+        self._items.append(item)
+        cols, rows = self._span(x, y, width, height)
+        cells = self._cells
+        for row in rows:
+            for col in cols:
+                bucket = cells.get((col, row))
+                if bucket is None:
+                    cells[(col, row)] = [index]
+                else:
+                    bucket.append(index)
+
+    def query(self, x: float, y: float, width: float, height: float) -> list:
+        """Éléments rangés dans les cellules qui touchent le rectangle (candidats, à l'ordre d'insertion)."""
+        cols, rows = self._span(x, y, width, height)
+        cells = self._cells
+        found = set()
+        for row in rows:
+            for col in cols:
+                bucket = cells.get((col, row))
+                if bucket is not None:
+                    found.update(bucket)
+        items = self._items
+        return [items[i] for i in sorted(found)]
@@ -0,0 +1,161 @@
+"""
+Empreinte de l'état de simulation, frame par frame.
+
+À chaque tick, StateHasher réduit l'état du monde à un entier de 64 bits :
+positions et vitesses quantifiées, PV, timers, compteurs du moteur et état
+des générateurs aléatoires. Deux simulations qui divergent (désynchro en
+netplay, replay non déterministe) ont des empreintes différentes dès la
+première frame fautive.
+
+L'empreinte est incrémentale : la partie statique du niveau (obstacles
+fixes, géométrie de la porte, personnages) n'est recalculée que quand le
+monde change (GameEngine.world_version, incrémenté à la création d'un
+niveau, dans la salle secrète et à chaque chargement d'écrans), et l'état
+des générateurs aléatoires, coûteux à lire, n'entre dans l'empreinte que
+toutes les Config.STATE_HASH_RNG_INTERVAL frames.
+
+Les valeurs sont des entiers, rassemblés dans une seule liste, empaquetés
+d'un coup en 64 bits petit-boutiste et passés à BLAKE2b : l'empreinte est
+la même d'une machine, d'une version de Python et d'un processus à l'autre
+(hash() ne garantit rien de tel). Chaque liste d'entités est précédée de
+sa longueur.
+"""
+
+import hashlib
+import random
+import sys
+from array import array
+from typing import Optional
+from .config import Config
+from .entities import FragilePlatform, MovingPlatform
+from .timers import Timer
+
+HASH_MASK = (1 << 64) - 1
+SIGN_BIT = 1 << 63
+QUANTUM = 256.0  # Positions et vitesses quantifiées au 1/256e de pixel
+
+
+def _due(timer: Optional[Timer]) -> int:
+    """Échéance d'un timer en attente, -1 sinon."""
+    return timer.fire_at if timer is not None and timer.pending else -1
+
+
+def _signed64(value: int) -> int:
+    """Mot de 64 bits non signé relu comme signé (mêmes octets)."""
+    return (value ^ SIGN_BIT) - SIGN_BIT
+
+
+def _pack(values: list) -> bytes:
+    """Entiers (ou booléens) en 64 bits signés petit-boutiste, en un seul paquet."""
+    packed = array('q', values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+class StateHasher:
+    """Empreinte 64 bits de l'état de simulation d'un GameEngine."""
+
+    def __init__(self, engine, config: Config = None):
+        self.engine = engine
+        self.config = config or engine.config
+        self.rng_interval = max(1, self.config.STATE_HASH_RNG_INTERVAL)
+        self._static_key = None  # Version du monde dont la partie statique est en cache
+        self._static_digest = b''
+        self._dynamic_obstacles: list = []  # Plateformes mobiles et fragiles du niveau
+
+    def update(self) -> int:
+        """Empreinte de l'état courant (à appeler une fois par tick, après la mise à jour)."""
+        engine = self.engine
+        q = QUANTUM
+
+        # Partie statique: recalculée seulement quand le monde change
+        door = engine.door
+        static_key = (engine.world_version, len(engine.players))
+        if static_key != self._static_key:
+            self._hash_static(static_key)
+
+        # Générateurs aléatoires: leur état est coûteux à lire (625 mots pour le
+        # Mersenne Twister), il n'entre dans l'empreinte qu'à intervalle régulier.
+        # Un tirage de plus ou de moins se voit de toute façon vite sur les entités.
+        frame = engine.timers.now
+        values = []
+        if frame % self.rng_interval == 0:
+            internal = random.getstate()[1]
+            pcg = engine.enemy_store.rng.bit_generator.state['state']['state'] if engine.enemy_store else 0
+            # État PCG64 sur 128 bits: deux mots de 64 bits
+            values += (internal[-1], internal[0], internal[internal[-1] % 624],
+                       _signed64(pcg & HASH_MASK), _signed64(pcg >> 64))
+
+        values += (
+            engine.state.value, frame, engine.timers.next_seq, engine.systems.frame, *engine.systems.last_frames(),
+            engine.game_over_timer, engine.current_level, engine.enemies_defeated, engine.current_score,
+            int(engine.rage * q), engine.secret_hole_open, engine.secret_reward_claimed, engine.in_secret_room,
+            door is not None and door.active, _due(engine.spawn_timer), _due(engine.heart_spawn_timer),
+        )
+        values.append(len(engine.players))
+        for b in engine.players:
+            values += (int(b.x * q), int(b.y * q), int(b.vx * q), int(b.vy * q), b.on_ground, b.jumps_remaining,
+                       b.on_wall, b.floating, int(b.energy * q), b.facing_direction, b.lives, b.energy_usage_timer,
+                       b.aim_direction_y, b.input_mask, _due(b.invincible_timer), _due(b.fire_cooldown),
+                       _due(b.super_cooldown))
+        values.append(len(engine.ai_balls))
+        for a in engine.ai_balls:
+            values += (int(a.x * q), int(a.y * q), int(a.vx * q), int(a.vy * q), a.hp, a.on_ground,
+                       a.facing_direction, a.sleeping, a.rest_frames, _due(a.shoot_timer), a.volleys_left)
+        values.append(len(self._dynamic_obstacles))
+        for obs in self._dynamic_obstacles:
+            if obs.__class__ is MovingPlatform:
+                values += (int(obs.x * q), obs.direction)
+            else:
+                values += (obs.step_timer, obs.broken, _due(obs.respawn_timer))
+        values.append(len(engine.missiles))
+        for m in engine.missiles:
+            values += (int(m.x * q), int(m.y * q), m.active)
+        values.append(len(engine.heart_pickups))
+        for h in engine.heart_pickups:
+            values += (int(h.x * q), int(h.y * q), h.active)
+        bullets = engine.enemy_bullets.quantized(q)
+        values.append(len(bullets))
+        values += bullets
+        level_seed, live, evicted = engine.chunks.state_key()
+        values += (level_seed, len(live), *live, len(evicted))
+        for index, crc in evicted:
+            values += (index, crc)
+
+        digest = hashlib.blake2b(self._static_digest + _pack(values), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') & HASH_MASK
+
+    def _hash_static(self, key: tuple):
+        """Empreinte de ce qui ne bouge pas pendant un niveau."""
+        engine = self.engine
+        q = QUANTUM
+        values = [len(engine.obstacles)]
+        self._dynamic_obstacles = []
+        for obs in engine.obstacles:
+            if isinstance(obs, MovingPlatform):
+                # La position x bouge: seuls la course et la vitesse sont fixes
+                self._dynamic_obstacles.append(obs)
+                values += (int(obs.min_x * q), int(obs.max_x * q), int(obs.y * q), int(obs.speed * q))
+                continue
+            if isinstance(obs, FragilePlatform):
+                self._dynamic_obstacles.append(obs)
+            values += (int(obs.x * q), int(obs.y * q), int(obs.width * q), int(obs.height * q))
+        door = engine.door
+        door_geometry = () if door is None else (int(door.x * q), int(door.y * q))
+        values += (len(door_geometry), *door_geometry, len(engine.players))
+        for b in engine.players:
+            values += (b.character_index, b.max_lives)
+        values += (engine.secret_side, int(engine.secret_hole_y * q))
+        self._static_digest = hashlib.blake2b(_pack(values), digest_size=8).digest()
+        self._static_key = key
+
+
+def first_divergence(expected, actual) -> Optional[int]:
+    """Première frame où deux suites d'empreintes diffèrent (None si identiques)."""
+    for frame, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return frame
+    if len(expected) != len(actual):
+        return min(len(expected), len(actual))
+    return None
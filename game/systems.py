@@ -0,0 +1,126 @@
+"""
+Ordonnanceur de systèmes.
+
+Découpe la mise à jour du jeu en systèmes enregistrés (obstacles, joueur,
+projectiles, IA...) exécutés dans l'ordre déclaré, chacun à sa propre
+cadence et désactivable séparément.
+
+Un système qui ne tourne qu'une frame sur N reçoit le nombre de frames
+écoulées depuis son dernier passage et avance d'autant : la cadence
+regroupe le travail sans ralentir la simulation.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(slots=True)
+class System:
+    """Un système de mise à jour et ses mesures de temps."""
+
+    name: str
+    update: Callable[[int], Optional[bool]]  # Reçoit les frames à simuler; True interrompt la frame
+    every: int = 1  # Exécuté une frame sur `every` (1 = chaque frame)
+    enabled: bool = True
+    last_frame: int = -1  # Dernière frame simulée (-1: aucune)
+    calls: int = 0
+    total_ms: float = 0.0
+    last_ms: float = 0.0
+
+    @property
+    def average_ms(self) -> float:
+        """Durée moyenne d'un appel en millisecondes."""
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class SystemScheduler:
+    """Exécute les systèmes dans l'ordre d'enregistrement, chacun à sa cadence."""
+
+    def __init__(self):
+        self.systems: list[System] = []
+        self._by_name: dict[str, System] = {}
+        self.frame = 0
+
+    def __getitem__(self, name: str) -> System:
+        return self._by_name[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def register(
+        self,
+        name: str,
+        update: Callable[[int], Optional[bool]],
+        every: int = 1,
+        enabled: bool = True
+    ) -> System:
+        """Ajoute un système à la fin de l'ordre d'exécution."""
+        if name in self._by_name:
+            raise ValueError(f"Système déjà enregistré: {name}")
+        system = System(name, update, max(1, every), enabled)
+        self.systems.append(system)
+        self._by_name[name] = system
+        return system
+
+    def set_enabled(self, name: str, enabled: bool):
+        """Active ou désactive un système (les frames passées désactivé ne sont pas rattrapées)."""
+        system = self._by_name[name]
+        if enabled and not system.enabled:
+            system.last_frame = self.frame - 1
+        system.enabled = enabled
+
+    def set_rate(self, name: str, every: int):
+        """Fait tourner un système une frame sur `every`."""
+        self._by_name[name].every = max(1, every)
+
+    def reset(self, frame: int = 0):
+        """Repart de `frame`, sans frame à rattraper pour aucun système."""
+        self.frame = frame
+        for system in self.systems:
+            system.last_frame = frame - 1
+
+    def last_frames(self) -> list[int]:
+        """Dernière frame simulée par chaque système, dans l'ordre (instantanés)."""
+        return [system.last_frame for system in self.systems]
+
+    def restore(self, frame: int, last_frames: list[int]):
+        """Restaure la frame courante et la dernière frame simulée de chaque système."""
+        self.frame = frame
+        for system, last_frame in zip(self.systems, last_frames):
+            system.last_frame = last_frame
+
+    def run(self):
+        """
+        Exécute une frame: chaque système actif dont c'est le tour.
+
+        Chaque système reçoit les frames écoulées depuis la dernière qu'il a
+        simulée et les simule toutes : `every` en régime établi, mais aussi
+        le bon compte après set_rate() ou une frame interrompue.
+        Un système qui retourne True (mort du joueur, changement d'état)
+        interrompt la frame: les suivants la rattrapent à leur prochain tour.
+        """
+        frame = self.frame
+        self.frame += 1
+        for system in self.systems:
+            if not system.enabled or frame % system.every:
+                continue
+            start = time.perf_counter()
+            stop = system.update(frame - system.last_frame)
+            system.last_frame = frame
+            system.last_ms = (time.perf_counter() - start) * 1000
+            system.total_ms += system.last_ms
+            system.calls += 1
+            if stop:
+                break
+
+    def timings(self) -> dict[str, tuple[int, float, float]]:
+        """Mesures par système: (appels, moyenne ms, dernier ms)."""
+        return {s.name: (s.calls, s.average_ms, s.last_ms) for s in self.systems}
+
+    def reset_timings(self):
+        """Remet les mesures à zéro."""
+        for system in self.systems:
+            system.calls = 0
+            system.total_ms = 0.0
+            system.last_ms = 0.0
@@ -0,0 +1,171 @@
+"""
+Roue de timers hiérarchique.
+
+Remplace les compteurs décrémentés à chaque frame (cooldowns, réapparitions,
+tirs ennemis) par des échéances absolues : une entité programme la frame où
+elle doit être rappelée et ne coûte plus rien d'ici là. Les rappels d'une
+même frame sont exécutés dans l'ordre de programmation, ce qui garde la
+simulation déterministe.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS  # 64 cases par niveau
+SLOT_MASK = SLOTS - 1
+LEVELS = 4  # Horizon de 64^4 frames (~77 heures à 60 FPS)
+
+
+@dataclass(slots=True, eq=False)
+class Timer:
+    """Une échéance programmée dans la roue."""
+
+    fire_at: int  # Frame absolue de déclenchement
+    seq: int  # Ordre de programmation (départage les échéances d'une même frame)
+    callback: Optional[Callable]
+    args: tuple
+    pending: bool = True  # False une fois déclenché ou annulé
+
+
+class TimerWheel:
+    """
+    Roue de timers à plusieurs niveaux.
+
+    Le niveau 0 a une case par frame pour les 64 prochaines frames, chaque
+    niveau supérieur couvre 64 fois plus de temps avec des cases 64 fois plus
+    larges. Quand un niveau fait un tour complet, la case suivante du niveau
+    au-dessus est redescendue : programmer, annuler et avancer d'une frame
+    coûtent O(1) quel que soit le nombre de timers en attente.
+    """
+
+    def __init__(self, start: int = 0):
+        self.now = start
+        self._seq = 0
+        self._count = 0
+        self._wheels: list[list[list[Timer]]] = [[[] for _ in range(SLOTS)] for _ in range(LEVELS)]
+
+    def __len__(self) -> int:
+        """Nombre de timers en attente."""
+        return self._count
+
+    def schedule_at(self, frame: int, callback: Optional[Callable] = None, *args) -> Timer:
+        """
+        Programme un rappel à une frame absolue.
+
+        Une échéance déjà passée est reportée à la frame suivante. Sans
+        callback, le timer sert de simple échéance (cooldown) à tester avec
+        `pending`.
+        """
+        frame = max(frame, self.now + 1)
+        if frame - self.now >= SLOTS ** LEVELS:
+            raise ValueError(f"Échéance hors de l'horizon de la roue: {frame}")
+
+        timer = Timer(frame, self._seq, callback, args)
+        self._seq += 1
+        self._count += 1
+        self._insert(timer)
+        return timer
+
+    def schedule_in(self, delay: int, callback: Optional[Callable] = None, *args) -> Timer:
+        """Programme un rappel dans `delay` frames."""
+        return self.schedule_at(self.now + delay, callback, *args)
+
+    def cancel(self, timer: Optional[Timer]):
+        """Annule un timer (sans effet s'il est déjà déclenché ou annulé)."""
+        if timer is not None and timer.pending:
+            timer.pending = False
+            self._count -= 1
+
+    def pending(self, timer: Optional[Timer]) -> bool:
+        """Retourne True si le timer attend encore son échéance."""
+        return timer is not None and timer.pending
+
+    def remaining(self, timer: Optional[Timer]) -> int:
+        """Nombre de frames avant l'échéance (0 si le timer n'est plus en attente)."""
+        if not self.pending(timer):
+            return 0
+        return timer.fire_at - self.now
+
+    def clear(self):
+        """Annule tous les timers en attente."""
+        for wheel in self._wheels:
+            for bucket in wheel:
+                for timer in bucket:
+                    timer.pending = False
+                bucket.clear()
+        self._count = 0
+
+    def reset(self, now: int, seq: int = 0):
+        """Vide la roue et la replace à la frame `now` (restauration d'instantané)."""
+        self.clear()
+        self.now = now
+        self._seq = seq
+
+    @property
+    def next_seq(self) -> int:
+        """Numéro d'ordre du prochain timer programmé."""
+        return self._seq
+
+    def reinsert(self, timer: Timer) -> Timer:
+        """
+        Replace un timer dans la roue en gardant son échéance et son ordre.
+
+        Sert à restaurer un instantané: les timers recréés se déclenchent
+        dans le même ordre qu'à la capture.
+        """
+        if timer.fire_at <= self.now:
+            raise ValueError(f"Échéance déjà passée: {timer.fire_at}")
+        timer.pending = True
+        self._count += 1
+        self._insert(timer)
+        return timer
+
+    def advance(self, frames: int = 1):
+        """Avance de `frames` frames et déclenche les timers arrivés à échéance."""
+        for _ in range(frames):
+            self.now += 1
+            now = self.now
+
+            # Niveaux qui viennent de finir un tour: redescendre leur case suivante,
+            # du plus haut au plus bas
+            level = 1
+            while level < LEVELS and now & ((1 << (SLOT_BITS * level)) - 1) == 0:
+                level += 1
+            for upper in range(level - 1, 0, -1):
+                self._cascade(upper, (now >> (SLOT_BITS * upper)) & SLOT_MASK)
+
+            slot = now & SLOT_MASK
+            bucket = self._wheels[0][slot]
+            if not bucket:
+                continue
+            self._wheels[0][slot] = []
+
+            # Les timers redescendus ne sont plus dans l'ordre de programmation
+            bucket.sort(key=lambda timer: timer.seq)
+            for timer in bucket:
+                if not timer.pending:
+                    continue
+                timer.pending = False
+                self._count -= 1
+                if timer.callback is not None:
+                    timer.callback(*timer.args)
+
+    def _insert(self, timer: Timer):
+        """Range un timer dans le niveau qui couvre son délai."""
+        delta = timer.fire_at - self.now
+        for level in range(LEVELS):
+            if delta < SLOTS << (SLOT_BITS * level):
+                slot = (timer.fire_at >> (SLOT_BITS * level)) & SLOT_MASK
+                self._wheels[level][slot].append(timer)
+                return
+
+    def _cascade(self, level: int, slot: int):
+        """Redistribue une case d'un niveau supérieur vers les niveaux inférieurs."""
+        bucket = self._wheels[level][slot]
+        if not bucket:
+            return
+        self._wheels[level][slot] = []
+        for timer in bucket:
+            if timer.pending:
+                self._insert(timer)
@@ -11,15 +11,75 @@ Contrôles:
     - R : Recommencer le niveau
     - Echap : Quitter
 
+Coopération en réseau local (voir game/netplay.py):
+    - python main.py --host [--port 7777]
+    - python main.py --join ADRESSE [--peer-port 7777]
+
+Mode horde (des centaines d'ennemis, voir Config.HORDE_*):
+    - python main.py --horde [--bot]
+
+Niveaux de plusieurs écrans (caméra qui suit le joueur):
+    - python main.py --level-size 3x2
+
+Mode sans fin (écrans générés devant le joueur, retirés derrière lui):
+    - python main.py --endless horizontal
+    - python main.py --endless vertical
+
+Partie jouée par un bot (charge de rendu répétable, voir game/bot.py):
+    - python main.py --bot [--seed 0] [--bot-difficulty 0.7] [--bot-aggression 0.6]
+
 Auteur: Generated with Claude
 """
 
-from game import GameEngine
+import argparse
+from game import GameEngine, Config
+
+
+def level_size(text: str) -> tuple[int, int]:
+    """Taille de niveau en écrans, au format LARGEURxHAUTEUR (par exemple 3x2)."""
+    try:
+        width, height = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"taille invalide: {text} (attendu: 3x2)")
+    if width < 1 or height < 1:
+        raise argparse.ArgumentTypeError(f"taille invalide: {text} (au moins 1x1)")
+    return width, height
 
 
 def main():
     """Point d'entrée principal du jeu."""
-    engine = GameEngine()
+    parser = argparse.ArgumentParser(description="Ededo")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--host", action="store_true", help="Héberger une partie en coopération")
+    mode.add_argument("--join", metavar="ADRESSE", help="Rejoindre une partie en coopération")
+    parser.add_argument("--port", type=int, default=Config.NETPLAY_PORT, help="Port UDP local")
+    parser.add_argument("--peer-port", type=int, default=Config.NETPLAY_PORT, help="Port UDP de l'hôte (pour --join)")
+    parser.add_argument("--horde", action="store_true", help="Mode horde: une arène, des centaines d'ennemis")
+    parser.add_argument("--bot", action="store_true", help="Faire jouer un bot à la place du clavier")
+    parser.add_argument("--bot-difficulty", type=float, help="Difficulté du bot (0 à 1)")
+    parser.add_argument("--bot-aggression", type=float, help="Agressivité du bot (0 à 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de la partie du bot")
+    parser.add_argument("--level-size", type=level_size, default=(1, 1), metavar="LxH",
+                        help="Taille des niveaux en écrans (défaut: 1x1)")
+    parser.add_argument("--endless", choices=("horizontal", "vertical"),
+                        help="Mode sans fin: course vers la droite ou escalade")
+    args = parser.parse_args()
+
+    if args.host or args.join:
+        from game.netplay import run_netplay
+        run_netplay(args.join, args.port, args.peer_port)
+        return
+
+    config = Config()
+    config.LEVEL_WIDTH = config.PLAY_AREA_WIDTH * args.level_size[0]
+    config.LEVEL_HEIGHT = config.PLAY_AREA_HEIGHT * args.level_size[1]
+    engine = GameEngine(config)
+    engine.horde = args.horde
+    if args.endless:
+        engine.set_endless(args.endless)
+    if args.bot:
+        from game.bot import Bot
+        engine.bot = Bot(engine, difficulty=args.bot_difficulty, aggression=args.bot_aggression, seed=args.seed)
     engine.run()
 
 